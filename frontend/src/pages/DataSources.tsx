@@ -18,6 +18,22 @@ interface TestLogItem {
   count: number
 }
 
+// 后端按列返回日志：{ 列名: 各条日志的值 }
+type TestLogColumns = { [K in keyof TestLogItem]: TestLogItem[K][] }
+
+function logsFromColumns(cols?: TestLogColumns): TestLogItem[] {
+  if (!cols?.timestamp) return []
+  return cols.timestamp.map((timestamp, i) => ({
+    timestamp,
+    source_name: cols.source_name[i],
+    source_type: cols.source_type[i],
+    action: cols.action[i],
+    message: cols.message[i],
+    duration_ms: cols.duration_ms[i],
+    count: cols.count[i],
+  }))
+}
+
 interface TestResult {
   success: boolean
   source_name: string
@@ -147,8 +163,11 @@ export default function DataSourcesPage() {
   const testSource = async (id: number) => {
     setTesting(id)
     try {
-      const result = await fetchAPI<TestResult>(`/datasources/${id}/test`, { method: 'POST' })
-      setTestResult(result)
+      const { logs, ...rest } = await fetchAPI<Omit<TestResult, 'logs'> & { logs?: TestLogColumns }>(
+        `/datasources/${id}/test`,
+        { method: 'POST' },
+      )
+      setTestResult({ ...rest, logs: logsFromColumns(logs) })
       setTestResultOpen(true)
     } catch (e) {
       toast(e instanceof Error ? e.message : '测试失败', 'error')
@@ -816,13 +816,15 @@ def reload_scheduler() -> bool:
     global scheduler
     try:
         current = globals().get("scheduler")
+        # 可能在线程池中调用（如导入模板接口），新调度器沿用原事件循环
+        loop = current.loop if current else None
         if current:
             try:
                 current.shutdown()
             except Exception:
                 pass
         scheduler = build_scheduler()
-        scheduler.start()
+        scheduler.start(loop=loop)
         logger.info("Agent 调度器已重载")
         return True
     except Exception as e:
@@ -930,6 +932,8 @@ async def trigger_agent(agent_name: str) -> str:
             duration_ms=int((time.monotonic() - start) * 1000),
         )
         raise
+    finally:
+        await context.aclose()
 
 
 async def trigger_agent_for_stock(
@@ -1004,6 +1008,8 @@ async def trigger_agent_for_stock(
             duration_ms=int((time.monotonic() - start) * 1000),
         )
         raise
+    finally:
+        await context.aclose()
 
     # 返回详细结果
     skipped = bool(result.raw_data.get("skipped", False))
@@ -1078,6 +1084,12 @@ async def lifespan(app):
         price_alert_scheduler.shutdown()
         logger.info("价格提醒调度器已关闭")
 
+    from src.collectors.http_session import close_client
+    from src.core.suggestion_pool import flush_pending_suggestions
+
+    flush_pending_suggestions()
+    close_client()
+
 
 # 模块级 app 实例，供 uvicorn reload 使用
 from src.web.app import app  # noqa: E402
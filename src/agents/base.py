@@ -77,12 +77,30 @@ class PortfolioInfo:
         """获取某只股票在各账户的持仓"""
         return [p for p in self.all_positions if p.symbol == symbol]
 
+    def get_positions_bulk(self, symbols: list[str]) -> dict[str, list[PositionInfo]]:
+        """按股票批量获取各账户持仓（单次遍历所有持仓）"""
+        result: dict[str, list[PositionInfo]] = {s: [] for s in symbols}
+        for p in self.all_positions:
+            if p.symbol in result:
+                result[p.symbol].append(p)
+        return result
+
     def get_aggregated_position(self, symbol: str) -> dict | None:
         """
         获取某只股票的汇总持仓（合并所有账户）
         返回: {"symbol", "name", "total_quantity", "avg_cost", "total_cost", "trading_style", "positions"}
         """
-        positions = self.get_positions_for_stock(symbol)
+        return self._aggregate(symbol, self.get_positions_for_stock(symbol))
+
+    def get_aggregated_positions_bulk(self, symbols: list[str]) -> dict[str, dict | None]:
+        """按股票批量获取汇总持仓，结构同 get_aggregated_position"""
+        return {
+            symbol: self._aggregate(symbol, positions)
+            for symbol, positions in self.get_positions_bulk(symbols).items()
+        }
+
+    @staticmethod
+    def _aggregate(symbol: str, positions: list[PositionInfo]) -> dict | None:
         if not positions:
             return None
 
@@ -127,6 +145,19 @@ class AgentContext:
     def watchlist(self) -> list[StockConfig]:
         return self.config.watchlist
 
+    async def aclose(self) -> None:
+        """运行结束后释放 AI 客户端与通知器持有的 HTTP 连接"""
+        if self.ai_client is not None:
+            try:
+                await self.ai_client.aclose()
+            except Exception as e:
+                logger.warning(f"关闭 AI 客户端失败: {e}")
+        if self.notifier is not None:
+            try:
+                await self.notifier.aclose()
+            except Exception as e:
+                logger.warning(f"关闭通知器失败: {e}")
+
 
 @dataclass
 class AnalysisResult:
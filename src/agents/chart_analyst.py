@@ -31,7 +31,6 @@ class ChartAnalystAgent(BaseAgent):
             period: K线周期 (daily/weekly/monthly)
         """
         self.period = period
-        self._collector: ScreenshotCollector | None = None
 
     async def collect(self, context: AgentContext) -> dict:
         """采集自选股 K 线图截图"""
@@ -49,10 +48,10 @@ class ChartAnalystAgent(BaseAgent):
             for stock in context.watchlist
         ]
 
-        # 截图
-        self._collector = ScreenshotCollector()
+        # 截图（采集器为局部变量：single 模式下多只股票并发执行 collect）
+        collector = ScreenshotCollector()
         try:
-            screenshots = await self._collector.capture_batch(
+            screenshots = await collector.capture_batch(
                 stocks, period=self.period
             )
 
@@ -75,7 +74,7 @@ class ChartAnalystAgent(BaseAgent):
                 logger.warning(f"SignalPack 获取失败（chart_analyst 继续执行）：{e}")
 
             # 清理旧截图
-            self._collector.cleanup_old_screenshots(max_age_hours=24)
+            collector.cleanup_old_screenshots(max_age_hours=24)
 
             return {
                 "screenshots": screenshots,
@@ -85,8 +84,7 @@ class ChartAnalystAgent(BaseAgent):
                 "timestamp": datetime.now().isoformat(),
             }
         finally:
-            await self._collector.close()
-            self._collector = None
+            await collector.close()
 
     def build_prompt(self, data: dict, context: AgentContext) -> tuple[str, str]:
         """构建技术分析 Prompt"""
@@ -183,20 +181,23 @@ class ChartAnalystAgent(BaseAgent):
         """
         system_prompt, user_content = self.build_prompt(data, context)
 
-        # 收集图片路径
+        # 收集图片：优先使用内存中的截图数据，未落盘时不依赖文件
         screenshots: list[ChartScreenshot] = data.get("screenshots", [])
+        image_bytes = [shot.image_bytes for shot in screenshots if shot.image_bytes]
         image_paths = [shot.filepath for shot in screenshots if shot.exists]
 
-        if not image_paths:
+        if not image_bytes and not image_paths:
             logger.warning("没有可用的截图，跳过分析")
             content = "未能获取到 K 线图截图，请检查网络连接或稍后重试。"
         else:
             # 调用多模态 AI
-            logger.info(f"使用 {len(image_paths)} 张截图进行多模态分析")
+            count = len(image_bytes) or len(image_paths)
+            logger.info(f"使用 {count} 张截图进行多模态分析")
             content = await context.ai_client.chat(
                 system_prompt,
                 user_content,
-                images=image_paths,
+                images=None if image_bytes else image_paths,
+                image_bytes=image_bytes or None,
             )
 
         # 构建标题
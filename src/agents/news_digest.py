@@ -9,7 +9,7 @@ from src.agents.base import BaseAgent, AgentContext, AnalysisResult
 from src.collectors.news_collector import NewsCollector, NewsItem
 from src.core.analysis_history import save_analysis
 from src.core.cn_symbol import get_cn_prefix
-from src.core.suggestion_pool import save_suggestion
+from src.core.suggestion_pool import save_suggestions
 from src.core.signals import SignalPackBuilder
 from src.core.signals.structured_output import (
     TAG_START,
@@ -504,42 +504,46 @@ class NewsDigestAgent(BaseAgent):
             suggestions = self._parse_suggestions(result.content, context.watchlist)
         result.raw_data["suggestions"] = suggestions
         stock_map = {s.symbol: s for s in context.watchlist}
+        pool_items: list[dict] = []
         for symbol, sug in suggestions.items():
             stock = stock_map.get(symbol)
             if not stock:
                 continue
-            save_suggestion(
-                stock_symbol=symbol,
-                stock_name=stock.name,
-                action=sug["action"],
-                action_label=sug["action_label"],
-                signal=(sug.get("signal") or "") if isinstance(sug, dict) else "",
-                reason=sug.get("reason", ""),
-                agent_name=self.name,
-                agent_label=self.display_name,
-                expires_hours=12,
-                prompt_context=user_content,
-                ai_response=result.content,
-                meta={
-                    "source": "news_digest",
-                    "since_hours_used": data.get("since_hours_used", self.since_hours),
-                    "related_count": len(data.get("related_news", []) or []),
-                    "important_count": len(data.get("important_news", []) or []),
-                    "plan": {
-                        "triggers": sug.get("triggers")
-                        if isinstance(sug.get("triggers"), list)
-                        else [],
-                        "invalidations": sug.get("invalidations")
-                        if isinstance(sug.get("invalidations"), list)
-                        else [],
-                        "risks": sug.get("risks")
-                        if isinstance(sug.get("risks"), list)
-                        else [],
-                    }
-                    if isinstance(sug, dict)
-                    else {},
-                },
+            pool_items.append(
+                dict(
+                    stock_symbol=symbol,
+                    stock_name=stock.name,
+                    action=sug["action"],
+                    action_label=sug["action_label"],
+                    signal=(sug.get("signal") or "") if isinstance(sug, dict) else "",
+                    reason=sug.get("reason", ""),
+                    agent_name=self.name,
+                    agent_label=self.display_name,
+                    expires_hours=12,
+                    prompt_context=user_content,
+                    ai_response=result.content,
+                    meta={
+                        "source": "news_digest",
+                        "since_hours_used": data.get("since_hours_used", self.since_hours),
+                        "related_count": len(data.get("related_news", []) or []),
+                        "important_count": len(data.get("important_news", []) or []),
+                        "plan": {
+                            "triggers": sug.get("triggers")
+                            if isinstance(sug.get("triggers"), list)
+                            else [],
+                            "invalidations": sug.get("invalidations")
+                            if isinstance(sug.get("invalidations"), list)
+                            else [],
+                            "risks": sug.get("risks")
+                            if isinstance(sug.get("risks"), list)
+                            else [],
+                        }
+                        if isinstance(sug, dict)
+                        else {},
+                    },
+                )
             )
+        save_suggestions(pool_items)
 
         # 保存到历史记录（使用 "*" 表示全局）
         related_news: list[NewsItem] = data.get("related_news", []) or []
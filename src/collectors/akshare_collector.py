@@ -3,8 +3,7 @@ import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
 
-import httpx
-
+from src.collectors.http_session import get_client
 from src.core.cn_symbol import get_cn_prefix
 from src.models.market import MarketCode, StockData, IndexData
 
@@ -130,9 +129,8 @@ def _fetch_tencent_quotes(symbols: list[str]) -> list[dict]:
     if not symbols:
         return []
     url = TENCENT_QUOTE_URL + ",".join(symbols)
-    with httpx.Client() as client:
-        resp = client.get(url, timeout=10)
-        content = resp.content.decode("gbk", errors="ignore")
+    resp = get_client().get(url, timeout=10)
+    content = resp.content.decode("gbk", errors="ignore")
 
     results = []
     for line in content.strip().split(";"):
@@ -2,8 +2,7 @@
 import logging
 from dataclasses import dataclass
 
-import httpx
-
+from src.collectors.http_session import get_client
 from src.core.cn_symbol import is_cn_sh
 from src.models.market import MarketCode
 
@@ -63,9 +62,14 @@ class CapitalFlowCollector:
         }
 
         try:
-            with httpx.Client(follow_redirects=True, timeout=8) as client:
-                resp = client.get(EASTMONEY_FLOW_URL, params=params, headers=headers)
-                data = resp.json()
+            resp = get_client().get(
+                EASTMONEY_FLOW_URL,
+                params=params,
+                headers=headers,
+                timeout=8,
+                follow_redirects=True,
+            )
+            data = resp.json()
 
             if data.get("data") is None:
                 logger.warning(f"获取 {symbol} 资金流向失败: 无数据")
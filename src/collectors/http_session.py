@@ -0,0 +1,36 @@
+"""采集器共享 HTTP 客户端 - 复用连接池，避免每次请求重新握手"""
+import threading
+
+import httpx
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """获取共享的同步 HTTP 客户端（线程安全，懒加载）
+
+    超时、headers 等按请求传入；采集器在线程池中并发调用时共用同一连接池。
+    """
+    global _client
+    client = _client
+    if client is None or client.is_closed:
+        with _client_lock:
+            client = _client
+            if client is None or client.is_closed:
+                client = _client = httpx.Client(
+                    timeout=10,
+                    limits=httpx.Limits(
+                        max_connections=50, max_keepalive_connections=20
+                    ),
+                )
+    return client
+
+
+def close_client() -> None:
+    """关闭共享客户端（下次 get_client 时会重新创建）"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -4,11 +4,10 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-
-import httpx
 import time
+from datetime import datetime, timezone
 
+from src.collectors.http_session import get_client
 from src.core.cn_symbol import get_cn_prefix
 from src.models.market import MarketCode
 
@@ -48,12 +47,15 @@ def _fetch_stooq_us_klines(symbol: str) -> list[KlineData]:
     for attempt in range(3):
         try:
             timeout = 12 + attempt * 6
-            with httpx.Client(
-                follow_redirects=True, timeout=timeout, headers=headers
-            ) as client:
-                resp = client.get(url, params=params)
-                resp.raise_for_status()
-                text = resp.text
+            resp = get_client().get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                follow_redirects=True,
+            )
+            resp.raise_for_status()
+            text = resp.text
             last_err = None
             break
         except Exception as e:
@@ -384,9 +386,10 @@ class KlineCollector:
         }
 
         try:
-            with httpx.Client(follow_redirects=True, timeout=10) as client:
-                resp = client.get(TENCENT_KLINE_URL, params=params)
-                text = resp.text
+            resp = get_client().get(
+                TENCENT_KLINE_URL, params=params, timeout=10, follow_redirects=True
+            )
+            text = resp.text
 
             # 解析 JS 变量格式: kline_dayqfq={...}
             if "=" not in text:
@@ -1,28 +1,65 @@
 """新闻采集器 - 雪球 + 东方财富"""
+import asyncio
+import importlib.util
+import json
 import logging
 import re
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import lru_cache
-import asyncio
 
 import httpx
 
+from src.core import fast_json
 from src.core.cn_symbol import get_cn_prefix
+from src.web.database import SessionLocal
+from src.web.models import DataSource, Stock
 
 logger = logging.getLogger(__name__)
 
-# 简单内存缓存（5分钟过期）
-_news_cache: dict[str, tuple[datetime, list]] = {}
-_cache_ttl = timedelta(minutes=5)
+# 简单内存缓存（5分钟过期，使用单调时钟；LRU 淘汰，最多保留 _CACHE_MAX 个 key）
+_news_cache: OrderedDict[str, tuple[float, list]] = OrderedDict()
+_cache_ttl = 300.0
+_CACHE_MAX = 256
+
+_JSONP_PREFIX = b"jQuery("
+# 响应体超过该大小时放到线程池解析，避免阻塞事件循环
+_THREAD_DECODE_MIN_BYTES = 64 * 1024
+
+# 东方财富接口：校验证书（遵循 SSL_CERT_FILE 企业 CA 配置），安装了 h2 时启用 HTTP/2 多路复用
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_EASTMONEY_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# NewsCollector.fetch_all 期间东方财富各采集器共享的连接池（资讯 + 公告复用同一客户端）
+_shared_eastmoney_client: ContextVar[httpx.AsyncClient | None] = ContextVar(
+    "_shared_eastmoney_client", default=None
+)
+
+
+@asynccontextmanager
+async def _eastmoney_client(verify_ssl: bool):
+    """获取东方财富 HTTP 客户端：优先复用 fetch_all 的共享客户端，否则临时创建"""
+    shared = _shared_eastmoney_client.get()
+    if shared is not None:
+        yield shared
+        return
+    async with httpx.AsyncClient(
+        verify=verify_ssl, http2=_HTTP2_AVAILABLE, limits=_EASTMONEY_LIMITS
+    ) as client:
+        yield client
 
 
 def _get_cached(key: str) -> list | None:
     """获取缓存"""
     if key in _news_cache:
         cached_time, data = _news_cache[key]
-        if datetime.now() - cached_time < _cache_ttl:
+        if time.monotonic() - cached_time < _cache_ttl:
+            _news_cache.move_to_end(key)
             return data
         del _news_cache[key]
     return None
@@ -30,7 +67,45 @@ def _get_cached(key: str) -> list | None:
 
 def _set_cached(key: str, data: list) -> None:
     """设置缓存"""
-    _news_cache[key] = (datetime.now(), data)
+    _news_cache[key] = (time.monotonic(), data)
+    _news_cache.move_to_end(key)
+    if len(_news_cache) > _CACHE_MAX:
+        _news_cache.popitem(last=False)
+
+
+def _fast_parse_dt(s: str) -> datetime | None:
+    """解析 "YYYY-MM-DD HH:MM:SS"（定宽格式直接切片取整，失败时回退 strptime）"""
+    if not s or not isinstance(s, str):
+        return None
+    if len(s) >= 19:
+        try:
+            return datetime(
+                int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            )
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(s, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(s[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _a_share_filter(symbols: tuple[str, ...]) -> tuple[str, ...]:
+    """筛选 A 股代码（6 位纯数字），按请求的代码元组缓存结果"""
+    return tuple(s for s in symbols if len(s) == 6 and s.isdigit())
+
+
+async def _decode_json(body: bytes):
+    """解析 JSON 响应体（大包体在线程池中解析，其它协程的网络 IO 可继续推进）"""
+    if len(body) >= _THREAD_DECODE_MIN_BYTES:
+        return await asyncio.to_thread(fast_json.loads, body)
+    return fast_json.loads(body)
 
 
 @dataclass
@@ -41,7 +116,7 @@ class NewsItem:
     title: str
     content: str
     publish_time: datetime
-    symbols: list[str] = field(default_factory=list)  # 关联股票代码
+    symbols: tuple[str, ...] | list[str] = ()  # 关联股票代码（默认共享空元组，调用方按需传入列表）
     importance: int = 0   # 0-3 重要性
     url: str = ""         # 原文链接
 
@@ -52,13 +127,19 @@ class BaseNewsCollector(ABC):
     source: str = ""
 
     @abstractmethod
-    async def fetch_news(self, symbols: list[str] | None = None, since: datetime | None = None) -> list[NewsItem]:
+    async def fetch_news(
+        self,
+        symbols: list[str] | None = None,
+        since: datetime | None = None,
+        symbol_names: dict[str, str] | None = None,
+    ) -> list[NewsItem]:
         """
         获取新闻列表
 
         Args:
             symbols: 过滤的股票代码列表（可选）
             since: 只获取此时间之后的新闻（可选）
+            symbol_names: 股票代码到名称的映射（可选，由 NewsCollector 统一计算后传入）
 
         Returns:
             NewsItem 列表
@@ -89,15 +170,18 @@ class XueqiuNewsCollector(BaseNewsCollector):
                 return f"{prefix}{symbol}"
         return symbol
 
-    async def fetch_news(self, symbols: list[str] | None = None, since: datetime | None = None) -> list[NewsItem]:
+    async def fetch_news(
+        self,
+        symbols: list[str] | None = None,
+        since: datetime | None = None,
+        symbol_names: dict[str, str] | None = None,
+    ) -> list[NewsItem]:
         """获取雪球个股新闻（并发请求）"""
         if not symbols:
             return []
 
-        import asyncio
-
         # 只处理 A 股代码
-        a_share_symbols = [s for s in symbols if len(s) == 6 and s.isdigit()]
+        a_share_symbols = _a_share_filter(tuple(symbols))
         if not a_share_symbols:
             return []
 
@@ -138,12 +222,18 @@ class XueqiuNewsCollector(BaseNewsCollector):
                 # 需要登录，跳过
                 return []
             resp.raise_for_status()
-            data = resp.json()
+            data = await _decode_json(resp.content)
 
             items = data.get("list", [])
             result = []
+            since_ms = since.timestamp() * 1000 if since else None
 
             for item in items:
+                # 时间线按发布时间倒序，遇到窗口外的条目即可停止，后续无需再解析
+                if since_ms is not None:
+                    created_at = item.get("created_at")
+                    if isinstance(created_at, (int, float)) and created_at < since_ms:
+                        break
                 try:
                     news = self._parse_item(item, symbol)
                     if news:
@@ -213,45 +303,61 @@ class EastMoneyStockNewsCollector(BaseNewsCollector):
 
     source = "eastmoney_news"
     API_URL = "https://search-api-web.eastmoney.com/search/jsonp"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+        "Referer": "https://so.eastmoney.com/",
+        "Accept": "*/*",
+    }
 
-    def __init__(self, symbol_names: dict[str, str] | None = None):
+    def __init__(self, symbol_names: dict[str, str] | None = None, verify_ssl: bool = True):
         """
         初始化采集器
 
         Args:
             symbol_names: 股票代码到名称的映射，如 {"601127": "赛力斯", "600519": "贵州茅台"}
                           如果不提供，会自动从数据库获取
+            verify_ssl: 是否校验 HTTPS 证书
         """
-        self._symbol_names = symbol_names
+        self._symbol_names: dict[str, str] = dict(symbol_names) if symbol_names else {}
+        self.verify_ssl = bool(verify_ssl)
 
     def _get_symbol_names(self, symbols: list[str]) -> dict[str, str]:
-        """获取股票代码到名称的映射（优先使用预设值，否则从数据库查询）"""
-        if self._symbol_names:
-            # 过滤出请求的 symbols 对应的名称
-            return {sym: self._symbol_names[sym] for sym in symbols if sym in self._symbol_names}
-
-        # 从数据库获取
-        try:
-            from src.web.database import SessionLocal
-            from src.web.models import Stock
+        """获取股票代码到名称的映射（优先使用预设/已缓存值，仅对缺失部分查询数据库）"""
+        if not symbols:
+            return {}
 
-            db = SessionLocal()
+        known = self._symbol_names
+        missing = [sym for sym in symbols if sym not in known]
+        if missing:
+            # 从数据库获取缺失的名称，并合并进缓存
             try:
-                stocks = db.query(Stock).filter(Stock.symbol.in_(symbols)).all()
-                return {s.symbol: s.name for s in stocks}
-            finally:
-                db.close()
-        except Exception as e:
-            logger.warning(f"获取股票名称失败: {e}")
-            return {}
+                db = SessionLocal()
+                try:
+                    rows = db.query(Stock.symbol, Stock.name).filter(Stock.symbol.in_(missing)).all()
+                    known.update({sym: name for sym, name in rows if name})
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.warning(f"获取股票名称失败: {e}")
+
+        # 过滤出请求的 symbols 对应的名称
+        return {sym: known[sym] for sym in symbols if sym in known}
 
-    async def fetch_news(self, symbols: list[str] | None = None, since: datetime | None = None) -> list[NewsItem]:
+    async def fetch_news(
+        self,
+        symbols: list[str] | None = None,
+        since: datetime | None = None,
+        symbol_names: dict[str, str] | None = None,
+    ) -> list[NewsItem]:
         """获取个股新闻（并发请求 + 缓存）- 支持 A股/港股/美股"""
         if not symbols:
             return []
 
-        # 获取股票名称映射（支持所有市场，因为我们用名称搜索）
-        symbol_names = self._get_symbol_names(symbols)
+        # 获取股票名称映射（支持所有市场，因为我们用名称搜索）；调用方已传入时直接复用
+        if symbol_names is not None:
+            symbol_names = {sym: symbol_names[sym] for sym in symbols if symbol_names.get(sym)}
+        else:
+            symbol_names = self._get_symbol_names(symbols)
 
         # 对于没有名称的股票，使用代码作为 fallback
         for sym in symbols:
@@ -279,12 +385,7 @@ class EastMoneyStockNewsCollector(BaseNewsCollector):
                 # 缓存维度不包含 since，为避免“空结果污染缓存”，这里不做时间过滤
                 return await self._fetch_for_symbol(client, symbol, stock_name, None)
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Referer": "https://so.eastmoney.com/",
-            "Accept": "*/*",
-        }
-        async with httpx.AsyncClient(timeout=8, verify=False, headers=headers) as client:
+        async with _eastmoney_client(self.verify_ssl) as client:
             tasks = [
                 fetch_with_limit(client, symbol, symbol_names.get(symbol, symbol))
                 for symbol in symbols
@@ -312,14 +413,11 @@ class EastMoneyStockNewsCollector(BaseNewsCollector):
             return [n for n in unique_news if n.publish_time >= since]
         return unique_news
 
-    async def _fetch_for_symbol(self, client: httpx.AsyncClient, symbol: str, stock_name: str, since: datetime | None) -> list[NewsItem]:
-        """获取单只股票的新闻（使用搜索 API，用股票名称搜索）"""
-        import json as json_module
-
-        # 构建搜索参数 - 使用股票名称搜索
-        search_param = {
+    # 搜索参数模板：除 keyword 外均为固定值，预先序列化，请求时只替换关键字
+    _PARAM_TEMPLATE = json.dumps(
+        {
             "uid": "",
-            "keyword": stock_name,  # 用股票名称搜索，效果更好
+            "keyword": "__KW__",  # 用股票名称搜索，效果更好
             "type": ["cmsArticleWebOld"],
             "client": "web",
             "clientType": "web",
@@ -334,22 +432,25 @@ class EastMoneyStockNewsCollector(BaseNewsCollector):
                     "postTag": ""
                 }
             }
-        }
+        },
+        separators=(',', ':'),
+    )
 
+    async def _fetch_for_symbol(self, client: httpx.AsyncClient, symbol: str, stock_name: str, since: datetime | None) -> list[NewsItem]:
+        """获取单只股票的新闻（使用搜索 API，用股票名称搜索）"""
         params = {
             "cb": "jQuery",
-            "param": json_module.dumps(search_param, separators=(',', ':'))
+            "param": self._PARAM_TEMPLATE.replace('"__KW__"', json.dumps(stock_name), 1),
         }
 
         try:
-            resp = await client.get(self.API_URL, params=params)
+            resp = await client.get(self.API_URL, params=params, headers=self.HEADERS, timeout=8)
             resp.raise_for_status()
-            text = resp.text
+            body = resp.content
 
-            # 解析 JSONP: jQuery({...})
-            if text.startswith("jQuery(") and text.endswith(")"):
-                json_str = text[7:-1]
-                data = json_module.loads(json_str)
+            # 解析 JSONP: jQuery({...})（直接处理 bytes，省去一次 UTF-8 解码）
+            if body.startswith(_JSONP_PREFIX) and body.endswith(b")"):
+                data = await _decode_json(body[len(_JSONP_PREFIX):-1])
             else:
                 return []
 
@@ -394,13 +495,7 @@ class EastMoneyStockNewsCollector(BaseNewsCollector):
 
         # 解析时间: "2026-01-20 17:19:17"
         date_str = item.get("date", "")
-        try:
-            publish_time = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        except (ValueError, TypeError):
-            try:
-                publish_time = datetime.strptime(date_str[:10], "%Y-%m-%d")
-            except (ValueError, TypeError):
-                publish_time = datetime.now()
+        publish_time = _fast_parse_dt(date_str) or datetime.now()
 
         # 重要性判断
         importance = 0
@@ -436,14 +531,22 @@ class EastMoneyNewsCollector(BaseNewsCollector):
     source = "eastmoney"
     API_URL = "https://np-anotice-stock.eastmoney.com/api/security/ann"
 
-    async def fetch_news(self, symbols: list[str] | None = None, since: datetime | None = None) -> list[NewsItem]:
+    def __init__(self, verify_ssl: bool = True):
+        self.verify_ssl = bool(verify_ssl)
+
+    async def fetch_news(
+        self,
+        symbols: list[str] | None = None,
+        since: datetime | None = None,
+        symbol_names: dict[str, str] | None = None,
+    ) -> list[NewsItem]:
         """获取东方财富公告（批量查询，单次请求）"""
         if not symbols:
             logger.debug("东方财富公告需要指定股票代码")
             return []
 
         # 只处理 A 股代码
-        a_share_symbols = [s for s in symbols if len(s) == 6 and s.isdigit()]
+        a_share_symbols = _a_share_filter(tuple(symbols))
         if not a_share_symbols:
             return []
 
@@ -468,10 +571,10 @@ class EastMoneyNewsCollector(BaseNewsCollector):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=5, verify=False) as client:
-                resp = await client.get(self.API_URL, params=params)
+            async with _eastmoney_client(self.verify_ssl) as client:
+                resp = await client.get(self.API_URL, params=params, timeout=5)
                 resp.raise_for_status()
-                data = resp.json()
+                data = await _decode_json(resp.content)
 
             if not data.get("success"):
                 return []
@@ -485,7 +588,7 @@ class EastMoneyNewsCollector(BaseNewsCollector):
                     codes = item.get("codes", []) or []
                     stock_codes = [c.get("stock_code", "") for c in codes if c.get("stock_code")]
                     if not stock_codes:
-                        stock_codes = a_share_symbols[:1]
+                        stock_codes = list(a_share_symbols[:1])
 
                     news = self._parse_item(item, stock_codes[0])
                     if news:
@@ -518,13 +621,7 @@ class EastMoneyNewsCollector(BaseNewsCollector):
 
         # 解析时间
         notice_date = item.get("notice_date", "")
-        try:
-            publish_time = datetime.strptime(notice_date, "%Y-%m-%d %H:%M:%S")
-        except (ValueError, TypeError):
-            try:
-                publish_time = datetime.strptime(notice_date[:10], "%Y-%m-%d")
-            except (ValueError, TypeError):
-                publish_time = datetime.now()
+        publish_time = _fast_parse_dt(notice_date) or datetime.now()
 
         # 重要性判断
         importance = 0
@@ -559,9 +656,12 @@ class NewsCollector:
     COLLECTOR_MAP = {
         "xueqiu": lambda config: XueqiuNewsCollector(cookies=config.get("cookies", "")),
         "eastmoney_news": lambda config: EastMoneyStockNewsCollector(
-            symbol_names=config.get("symbol_names")  # 可选，不传则自动从数据库获取
+            symbol_names=config.get("symbol_names"),  # 可选，不传则自动从数据库获取
+            verify_ssl=config.get("verify_ssl", True),
+        ),
+        "eastmoney": lambda config: EastMoneyNewsCollector(
+            verify_ssl=config.get("verify_ssl", True),
         ),
-        "eastmoney": lambda config: EastMoneyNewsCollector(),
     }
 
     def __init__(self, collectors: list[BaseNewsCollector] | None = None):
@@ -573,9 +673,6 @@ class NewsCollector:
     @classmethod
     def from_database(cls) -> "NewsCollector":
         """从数据库配置构建新闻采集器"""
-        from src.web.database import SessionLocal
-        from src.web.models import DataSource
-
         collectors = []
         db = SessionLocal()
         try:
@@ -620,13 +717,13 @@ class NewsCollector:
         Returns:
             按时间倒序排列的新闻列表
         """
-        import asyncio
-
-        # 如果传入了 symbol_names，更新各采集器的配置
-        if symbol_names:
-            for collector in self.collectors:
-                if isinstance(collector, EastMoneyStockNewsCollector):
-                    collector._symbol_names = symbol_names
+        # 名称映射只计算一次，传给所有采集器（未传入时由首个个股新闻采集器查询并缓存）
+        if not symbol_names and symbols:
+            name_source = next(
+                (c for c in self.collectors if isinstance(c, EastMoneyStockNewsCollector)), None
+            )
+            if name_source is not None:
+                symbol_names = name_source._get_symbol_names(symbols)
 
         # 公告使用更长的时间窗口（因为公告发布较少）
         news_since = datetime.now() - timedelta(hours=since_hours)
@@ -635,13 +732,29 @@ class NewsCollector:
         async def fetch_from_collector(collector: BaseNewsCollector) -> list[NewsItem]:
             try:
                 since = announcement_since if collector.source == "eastmoney" else news_since
-                return await collector.fetch_news(symbols, since)
+                return await collector.fetch_news(symbols, since, symbol_names)
             except Exception as e:
                 logger.error(f"采集器 {collector.source} 失败: {e}")
                 return []
 
-        # 并发采集所有数据源
-        results = await asyncio.gather(*[fetch_from_collector(c) for c in self.collectors])
+        # 并发采集所有数据源；东方财富资讯与公告共用一个连接池（证书校验配置一致时）
+        eastmoney = [
+            c for c in self.collectors
+            if isinstance(c, (EastMoneyStockNewsCollector, EastMoneyNewsCollector))
+        ]
+        if len(eastmoney) > 1 and len({c.verify_ssl for c in eastmoney}) == 1:
+            async with httpx.AsyncClient(
+                verify=eastmoney[0].verify_ssl,
+                http2=_HTTP2_AVAILABLE,
+                limits=_EASTMONEY_LIMITS,
+            ) as client:
+                token = _shared_eastmoney_client.set(client)
+                try:
+                    results = await asyncio.gather(*[fetch_from_collector(c) for c in self.collectors])
+                finally:
+                    _shared_eastmoney_client.reset(token)
+        else:
+            results = await asyncio.gather(*[fetch_from_collector(c) for c in self.collectors])
 
         all_news: list[NewsItem] = []
         for news_list in results:
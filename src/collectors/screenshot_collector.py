@@ -1,7 +1,13 @@
 """K线图截图采集器 - 基于 Playwright"""
+import asyncio
+import importlib.util
+import itertools
 import logging
 import os
+import sys
 import tempfile
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -18,11 +24,181 @@ SCREENSHOT_DIR.mkdir(exist_ok=True)
 DEFAULT_CONFIG = {
     "viewport": {"width": 1280, "height": 900},
     "wait_selector": ".quote_title",  # 等待页面主体加载
-    "extra_wait_ms": 3000,  # 等待图表渲染
+    "extra_wait_ms": 3000,  # 等待图表渲染的最长时间（检测到图表画布已绘制即提前结束）
+    "max_pages_per_context": 50,  # 共享 context 累计打开的页数上限，超过后回收以控制内存
+    "concurrency": 6,  # capture_batch 并发页面数
+    "block_resources": True,  # 拦截字体/媒体/无关图片/统计脚本，减少页面加载量
+    # browser: Playwright 截图；api: 日K 直接拉取 K 线 JSON 本地绘图（需安装 mplfinance，失败回退浏览器）
+    "render_mode": "browser",
+    "image_format": "jpeg",  # 截图格式：jpeg / png
+    "jpeg_quality": 75,
+    "save_to_disk": True,  # 是否同时落盘（关闭后仅在内存中保留 image_bytes）
+    # 使用持久化用户目录启动，跨运行保留 HTTP 缓存/cookie/V8 代码缓存；目录被占用时回退普通启动
+    "persistent_profile": True,
 }
 
+PROFILE_DIR = Path(tempfile.gettempdir()) / "panwatch_profile"
+# 同一 profile 目录只能被一个 Chromium 占用；进程内并发的采集器各占一个槽位目录（跨运行复用），
+# 槽位用尽时直接普通启动，不再尝试必然失败的持久化启动
+_MAX_PROFILE_SLOTS = 8
+_profile_slots: set[int] = set()
+_profile_slots_lock = threading.Lock()
+
+
+def _acquire_profile_slot() -> int | None:
+    with _profile_slots_lock:
+        for slot in range(_MAX_PROFILE_SLOTS):
+            if slot not in _profile_slots:
+                _profile_slots.add(slot)
+                return slot
+    return None
+
+
+def _release_profile_slot(slot: int) -> None:
+    with _profile_slots_lock:
+        _profile_slots.discard(slot)
+
+
+def _profile_dir(slot: int) -> Path:
+    return PROFILE_DIR if slot == 0 else PROFILE_DIR.with_name(f"{PROFILE_DIR.name}_{slot}")
+
+_LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+]
+
+_IMAGE_SUFFIX = {"jpeg": ".jpg", "png": ".png"}
+
+# 截图文件名序号，避免并发截图在同一秒内重名
+_filename_seq = itertools.count()
+
+_MPLFINANCE_AVAILABLE = importlib.util.find_spec("mplfinance") is not None
+
+# 截图无需加载的资源（样式表保留：截图区域依赖页面布局）
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+# 图表可能以图片形式渲染，URL 含这些关键字的图片放行
+_CHART_URL_KEYWORDS = ("kline", "chart", "quotepic")
+_TRACKER_DOMAINS = (
+    "google-analytics",
+    "googletagmanager",
+    "doubleclick",
+    "hm.baidu",
+    "sensorsdata",
+    "cnzz",
+)
+
+
+# 页面元素选择器（模块级常量，配合 page.locator 复用）
+XQ_CHART = ".stock-chart"
+XQ_DAILY_BTN = 'text="日K"'
+XQ_PERIOD_BTNS = {"weekly": 'text="周K"', "monthly": 'text="月K"'}
+SINA_KLINE = "#kline_container"
+EM_KLINE = "#kline_div"
+EM_QUOTE_TITLE = "#app > div > div > div.quote_title.self_clearfix"
+PERIOD_BTNS = {
+    "weekly": ('text="周K"', 'text="周线"', 'text="week"'),
+    "monthly": ('text="月K"', 'text="月线"', 'text="month"'),
+}
+CLOSE_POPUP_SELECTORS = (
+    'text="关闭"',
+    'text="×"',
+    'text="X"',
+    ".close-btn",
+    ".modal-close",
+    '[class*="close"]',
+    'button:has-text("关闭")',
+    'a:has-text("关闭")',
+    ".layui-layer-close",
+    ".popup-close",
+)
+
+# 各数据源 K 线图画布选择器
+_CHART_CANVAS_SELECTORS = {
+    "xueqiu": f"{XQ_CHART} canvas",
+    "sina": f"{SINA_KLINE} canvas",
+    "eastmoney": f"{EM_KLINE} canvas",
+}
 
-@dataclass
+# 画布已绘制：宽度合理，且中线横向采样存在非透明像素（跨域/非 2d 画布视为已就绪）
+_CANVAS_READY_JS = """
+(sel) => {
+  for (const c of document.querySelectorAll(sel)) {
+    if (c.width <= 100 || c.height <= 0) continue;
+    try {
+      const ctx = c.getContext('2d');
+      if (!ctx) return true;
+      const row = ctx.getImageData(0, Math.floor(c.height / 2), c.width, 1).data;
+      for (let i = 3; i < row.length; i += 4) if (row[i] > 0) return true;
+    } catch (e) {
+      return true;
+    }
+  }
+  return false;
+}
+"""
+
+
+# 雪球弹窗：点击"跳过"（登录弹窗）、弹窗区域内第一个可见关闭按钮（邀请加群等）、遮罩层
+_CLOSE_XUEQIU_POPUPS_JS = """
+() => {
+  const visible = (el) => {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  let closed = 0;
+  for (const el of document.querySelectorAll('a, button, span, div')) {
+    if (el.childElementCount === 0 && el.textContent.trim() === '跳过' && visible(el)) {
+      el.click();
+      closed++;
+      break;
+    }
+  }
+  for (const btn of document.querySelectorAll('svg, .close, [class*="close"], [class*="Close"]')) {
+    const r = btn.getBoundingClientRect();
+    if (visible(btn) && r.x > 200 && r.y < 500) {
+      btn.dispatchEvent(new MouseEvent('click', { bubbles: true }));
+      closed++;
+      break;
+    }
+  }
+  const mask = document.querySelector('.modal-mask, .overlay, [class*="mask"]');
+  if (mask && visible(mask)) {
+    mask.click();
+    closed++;
+  }
+  return closed;
+}
+"""
+
+
+async def _route_block_nonessential(route) -> None:
+    """page.route 处理器：中止与 K 线图无关的资源请求"""
+    request = route.request
+    url = request.url
+    if any(d in url for d in _TRACKER_DOMAINS) or (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES
+        and not any(k in url for k in _CHART_URL_KEYWORDS)
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 反检测脚本（在 context 级别注入一次，对其下所有页面生效）
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    Object.defineProperty(navigator, 'languages', { get: () => ['zh-CN', 'zh', 'en'] });
+    window.chrome = { runtime: {} };
+"""
+
+
+@dataclass(slots=True, frozen=True)
 class ChartScreenshot:
     """K线图截图"""
     symbol: str
@@ -31,12 +207,53 @@ class ChartScreenshot:
     filepath: str
     period: str = "daily"  # daily/weekly/monthly
     timestamp: datetime = field(default_factory=datetime.now)
+    image_bytes: bytes | None = field(default=None, repr=False)
+    image_format: str = "png"
 
     @property
     def exists(self) -> bool:
         return os.path.exists(self.filepath)
 
 
+def _render_kline_png(klines: list, title: str) -> bytes:
+    """用 mplfinance 将日K数据绘制为蜡烛图（含成交量和均线），返回 PNG 字节"""
+    import io
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import mplfinance as mpf
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            "Open": [k.open for k in klines],
+            "High": [k.high for k in klines],
+            "Low": [k.low for k in klines],
+            "Close": [k.close for k in klines],
+            "Volume": [k.volume for k in klines],
+        },
+        index=pd.DatetimeIndex([k.date for k in klines]),
+    )
+    buf = io.BytesIO()
+    mpf.plot(
+        df,
+        type="candle",
+        volume=True,
+        mav=(5, 10, 20),
+        style="charles",
+        title=title,
+        figsize=(6.6, 7.2),
+        savefig={"fname": buf, "dpi": 100, "format": "png"},
+    )
+    return buf.getvalue()
+
+
+def _write_bytes(filepath: str, data: bytes) -> None:
+    with open(filepath, "wb") as f:
+        f.write(data)
+
+
 class ScreenshotCollector:
     """
     K线图截图采集器
@@ -51,24 +268,52 @@ class ScreenshotCollector:
         self.config = {**DEFAULT_CONFIG, **(config or {})}
         self._browser = None
         self._playwright = None
+        self._context = None
+        self._persistent = False  # _context 是否为持久化 profile context
+        self._profile_slot: int | None = None  # 占用的 profile 槽位
+        self._context_pages = 0
+        # context -> 正在创建或仍在使用的页面数（含 new_page 尚未返回的页面），归零才可关闭
+        self._live_pages: dict = {}
+        self._storage_state: dict | None = None  # 回收 context 时保留的 cookie/localStorage
+        self._lock = asyncio.Lock()
+        # 数据源 -> (URL 生成, 截图逻辑)；未知数据源按东方财富处理
+        self._providers = {
+            "xueqiu": (self._get_xueqiu_url, self._capture_xueqiu),
+            "sina": (self._get_sina_url, self._capture_sina),
+            "eastmoney": (self._get_eastmoney_url, self._capture_eastmoney),
+        }
+
+    def _provider(self, provider: str):
+        return self._providers.get(provider) or self._providers["eastmoney"]
 
     async def _ensure_browser(self):
         """懒加载初始化 Playwright（带反检测设置）"""
-        if self._browser is not None:
+        if self._browser is not None or self._persistent:
             return
 
         try:
             from playwright.async_api import async_playwright
             self._playwright = await async_playwright().start()
 
+            slot = (
+                _acquire_profile_slot() if self.config.get("persistent_profile") else None
+            )
+            if slot is not None:
+                profile_dir = _profile_dir(slot)
+                try:
+                    self._context = await self._launch_persistent_context(profile_dir)
+                    self._persistent = True
+                    self._profile_slot = slot
+                    logger.info(f"Playwright 浏览器已启动（持久化 profile: {profile_dir}）")
+                    return
+                except Exception as e:
+                    _release_profile_slot(slot)
+                    logger.warning(f"持久化 profile 启动失败，回退普通模式: {e}")
+
             # 使用反检测设置启动浏览器
             self._browser = await self._playwright.chromium.launch(
                 headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                ]
+                args=_LAUNCH_ARGS,
             )
             logger.info("Playwright 浏览器已启动")
         except ImportError:
@@ -77,14 +322,150 @@ class ScreenshotCollector:
             logger.error(f"Playwright 启动失败: {e}")
             raise
 
+    async def _launch_persistent_context(self, profile_dir: Path):
+        """以持久化用户目录启动浏览器，返回其唯一的 BrowserContext"""
+        context = await self._playwright.chromium.launch_persistent_context(
+            user_data_dir=str(profile_dir),
+            headless=True,
+            args=_LAUNCH_ARGS,
+            viewport=self.config["viewport"],
+            locale="zh-CN",
+            user_agent=USER_AGENT,
+            java_script_enabled=True,
+            bypass_csp=True,
+        )
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
+        return context
+
+    async def _new_context(self):
+        """创建带反检测设置的 BrowserContext"""
+        # 使用真实的 User-Agent 和反检测设置
+        context = await self._browser.new_context(
+            viewport=self.config["viewport"],
+            locale="zh-CN",
+            user_agent=USER_AGENT,
+            java_script_enabled=True,
+            bypass_csp=True,
+            storage_state=self._storage_state,
+        )
+        # navigator 上的反检测修改不在 storage_state 中，新 context 需重新注入
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
+        return context
+
+    async def _new_page(self):
+        """在共享 context 中打开新页面（context 累计页数达到上限后换新；持久化 context 不回收）"""
+        async with self._lock:
+            await self._ensure_browser()
+            if not self._persistent and (
+                self._context is None
+                or self._context_pages >= self.config["max_pages_per_context"]
+            ):
+                old = self._context
+                if old is not None:
+                    # 新 context 沿用旧 context 的登录态/cookie（如雪球 token），避免重新触发弹窗
+                    try:
+                        self._storage_state = await old.storage_state()
+                    except Exception as e:
+                        logger.debug(f"读取 storage_state 失败: {e}")
+                self._context = await self._new_context()
+                self._context_pages = 0
+                # 旧 context 若仍有页面在创建或使用，等最后一个页面释放时再关闭
+                if old is not None and not self._live_pages.get(old):
+                    self._live_pages.pop(old, None)
+                    await self._close_context(old)
+            self._context_pages += 1
+            context = self._context
+            self._live_pages[context] = self._live_pages.get(context, 0) + 1
+        try:
+            return await context.new_page()
+        except Exception:
+            await self._unref_context(context)
+            raise
+
+    async def _release_page(self, page):
+        """关闭页面；所属 context 已被替换且无剩余页面时一并关闭"""
+        context = page.context
+        try:
+            await page.close()
+        except Exception:
+            pass
+        await self._unref_context(context)
+
+    async def _unref_context(self, context):
+        """页面计数减一；context 已被替换且计数归零时关闭"""
+        remaining = self._live_pages.get(context, 1) - 1
+        if remaining > 0:
+            self._live_pages[context] = remaining
+            return
+        self._live_pages.pop(context, None)
+        if context is not self._context:
+            await self._close_context(context)
+
+    @staticmethod
+    async def _close_context(context):
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器 context 失败: {e}")
+
+    def _use_api_render(self, period: str) -> bool:
+        return (
+            self.config.get("render_mode") == "api"
+            and period == "daily"
+            and _MPLFINANCE_AVAILABLE
+        )
+
+    async def _capture_via_api(
+        self, symbol: str, name: str, market: str
+    ) -> ChartScreenshot | None:
+        """通过 K 线 JSON 接口取数并本地绘图（跳过浏览器渲染）"""
+        from src.collectors.kline_collector import KlineCollector
+        from src.models.market import MarketCode
+
+        try:
+            collector = KlineCollector(MarketCode(market.upper()))
+            klines = await asyncio.to_thread(collector.get_klines, symbol, 120)
+            if not klines:
+                return None
+            image = await asyncio.to_thread(_render_kline_png, klines, symbol)
+        except Exception as e:
+            logger.debug(f"K线接口绘图失败 {name}({symbol})，回退浏览器截图: {e}")
+            return None
+
+        filepath = self._build_filepath(symbol, "png")
+        if self.config.get("save_to_disk", True):
+            await asyncio.to_thread(_write_bytes, filepath, image)
+
+        logger.info(f"K线绘图成功: {name}({symbol}) -> {filepath}")
+        return ChartScreenshot(
+            symbol=symbol,
+            name=name,
+            market=sys.intern(market),
+            filepath=filepath,
+            period="daily",
+            image_bytes=image,
+            image_format="png",
+        )
+
+    @staticmethod
+    def _build_filepath(symbol: str, image_format: str) -> str:
+        suffix = _IMAGE_SUFFIX.get(image_format, ".png")
+        fname = f"{symbol}_{time.strftime('%Y%m%d_%H%M%S')}_{next(_filename_seq)}{suffix}"
+        return str(SCREENSHOT_DIR / fname)
+
+    def _screenshot_options(self, filepath: str) -> dict:
+        """page/locator.screenshot 参数：按配置选择格式，save_to_disk 时同时写文件"""
+        image_format = self.config.get("image_format", "jpeg")
+        opts = {"type": image_format}
+        if image_format == "jpeg":
+            opts["quality"] = int(self.config.get("jpeg_quality", 75))
+        if self.config.get("save_to_disk", True):
+            opts["path"] = filepath
+        return opts
+
     def _get_url(self, symbol: str, market: str, provider: str = "xueqiu") -> str:
         """生成 K 线图页面 URL"""
-        if provider == "sina":
-            return self._get_sina_url(symbol, market)
-        elif provider == "xueqiu":
-            return self._get_xueqiu_url(symbol, market)
-        else:
-            return self._get_eastmoney_url(symbol, market)
+        return self._provider(provider)[0](symbol, market)
 
     def _get_sina_url(self, symbol: str, market: str) -> str:
         """新浪财经 URL"""
@@ -126,34 +507,27 @@ class ScreenshotCollector:
             name: 股票名称
             market: 市场 (CN/HK)
             period: K线周期 (daily/weekly/monthly)
-            provider: 数据源 (xueqiu/eastmoney)
+            provider: 数据源 (xueqiu/eastmoney)；render_mode=api 时日K不经过浏览器
 
         Returns:
             ChartScreenshot 或 None（失败时）
         """
-        await self._ensure_browser()
+        get_url, capture_fn = self._provider(provider)
+        url = get_url(symbol, market)
 
-        url = self._get_url(symbol, market, provider)
-        filepath = str(SCREENSHOT_DIR / f"{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+        if self._use_api_render(period):
+            shot = await self._capture_via_api(symbol, name, market)
+            if shot:
+                return shot
 
-        try:
-            # 使用真实的 User-Agent 和反检测设置
-            context = await self._browser.new_context(
-                viewport=self.config["viewport"],
-                locale="zh-CN",
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                java_script_enabled=True,
-                bypass_csp=True,
-            )
-            page = await context.new_page()
+        image_format = self.config.get("image_format", "jpeg")
+        filepath = self._build_filepath(symbol, image_format)
 
-            # 注入反检测脚本
-            await page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['zh-CN', 'zh', 'en'] });
-                window.chrome = { runtime: {} };
-            """)
+        page = None
+        try:
+            page = await self._new_page()
+            if self.config.get("block_resources"):
+                await page.route("**/*", _route_block_nonessential)
 
             logger.debug(f"正在加载 {name}({symbol}) K线图: {url}")
             await page.goto(url, wait_until="domcontentloaded", timeout=30000)
@@ -169,33 +543,43 @@ class ScreenshotCollector:
                 # 备选：等待任意内容加载
                 await page.wait_for_load_state("networkidle", timeout=10000)
 
-            # 额外等待渲染
-            await page.wait_for_timeout(self.config["extra_wait_ms"])
+            # 等待图表渲染：画布绘制完成即继续，最多等待 extra_wait_ms
+            await self._wait_for_chart(page, provider)
 
             # 根据数据源执行不同的截图逻辑
-            if provider == "xueqiu":
-                await self._capture_xueqiu(page, filepath, period)
-            elif provider == "sina":
-                await self._capture_sina(page, filepath, period)
-            else:
-                await self._capture_eastmoney(page, filepath, period)
-
-            await context.close()
+            image = await capture_fn(page, filepath, period)
 
             logger.info(f"截图成功: {name}({symbol}) -> {filepath}")
             return ChartScreenshot(
                 symbol=symbol,
                 name=name,
-                market=market,
+                market=sys.intern(market),
                 filepath=filepath,
-                period=period,
+                period=sys.intern(period),
+                image_bytes=image,
+                image_format=image_format,
             )
 
         except Exception as e:
             logger.error(f"截图失败 {name}({symbol}): {e}")
             return None
+        finally:
+            if page is not None:
+                await self._release_page(page)
+
+    async def _wait_for_chart(self, page, provider: str):
+        """轮询 K 线画布是否已绘制，超时（extra_wait_ms）后直接继续"""
+        selector = _CHART_CANVAS_SELECTORS.get(provider, _CHART_CANVAS_SELECTORS["eastmoney"])
+        try:
+            await page.wait_for_function(
+                _CANVAS_READY_JS,
+                arg=selector,
+                timeout=max(int(self.config["extra_wait_ms"]), 1),
+            )
+        except Exception:
+            logger.debug(f"未检测到图表画布就绪（{selector}），按超时继续")
 
-    async def _capture_xueqiu(self, page, filepath: str, period: str):
+    async def _capture_xueqiu(self, page, filepath: str, period: str) -> bytes:
         """雪球截图逻辑"""
         # 等待页面加载
         await page.wait_for_timeout(1000)
@@ -205,7 +589,7 @@ class ScreenshotCollector:
 
         # 等待图表加载
         try:
-            await page.wait_for_selector(".stock-chart", timeout=10000)
+            await page.wait_for_selector(XQ_CHART, timeout=10000)
         except Exception:
             pass
 
@@ -219,37 +603,37 @@ class ScreenshotCollector:
             await self._switch_period_xueqiu(page, "monthly")
 
         # 直接截取固定区域（K线图区域）
-        await page.screenshot(
-            path=filepath,
-            clip={"x": 250, "y": 80, "width": 660, "height": 720}
+        image = await page.screenshot(
+            clip={"x": 250, "y": 80, "width": 660, "height": 720},
+            **self._screenshot_options(filepath),
         )
         logger.debug("雪球 K 线图截图完成")
+        return image
 
-    async def _capture_sina(self, page, filepath: str, period: str):
+    async def _capture_sina(self, page, filepath: str, period: str) -> bytes:
         """新浪财经截图逻辑"""
         # 等待页面加载
         try:
-            await page.wait_for_selector("#kline_container", timeout=10000)
+            await page.wait_for_selector(SINA_KLINE, timeout=10000)
         except Exception:
             pass
 
         # 截取 K 线图区域
         try:
-            chart = await page.query_selector("#kline_container")
-            if chart:
-                await chart.screenshot(path=filepath)
-                return
+            chart = page.locator(SINA_KLINE).first
+            if await chart.count():
+                return await chart.screenshot(**self._screenshot_options(filepath))
         except Exception:
             pass
 
-        await page.screenshot(path=filepath, full_page=False)
+        return await page.screenshot(full_page=False, **self._screenshot_options(filepath))
 
-    async def _capture_eastmoney(self, page, filepath: str, period: str):
+    async def _capture_eastmoney(self, page, filepath: str, period: str) -> bytes:
         """东方财富截图逻辑"""
         # 滚动到 K 线图区域
         try:
-            kline_area = await page.query_selector("#app > div > div > div.quote_title.self_clearfix")
-            if kline_area:
+            kline_area = page.locator(EM_QUOTE_TITLE).first
+            if await kline_area.count():
                 await kline_area.scroll_into_view_if_needed()
                 await page.wait_for_timeout(500)
         except Exception:
@@ -261,79 +645,40 @@ class ScreenshotCollector:
 
         # 截图 K 线图区域
         try:
-            kline_container = await page.query_selector("#kline_div")
-            if kline_container:
-                await kline_container.screenshot(path=filepath)
-                return
+            kline_container = page.locator(EM_KLINE).first
+            if await kline_container.count():
+                return await kline_container.screenshot(**self._screenshot_options(filepath))
         except Exception:
             pass
 
-        await page.screenshot(path=filepath, full_page=False)
+        return await page.screenshot(full_page=False, **self._screenshot_options(filepath))
 
     async def _close_xueqiu_popups(self, page):
-        """关闭雪球所有弹窗"""
-        # 多次尝试关闭各种弹窗
-        for _ in range(5):
-            closed = False
-
-            # 1. 关闭登录弹窗（点击"跳过"）
-            try:
-                skip_btn = await page.query_selector('text="跳过"')
-                if skip_btn and await skip_btn.is_visible():
-                    await skip_btn.click()
-                    await page.wait_for_timeout(500)
-                    logger.debug("已关闭登录弹窗")
-                    closed = True
-            except Exception:
-                pass
-
-            # 2. 关闭邀请加群弹窗（点击 X 按钮）
+        """关闭雪球所有弹窗（每轮在页面内一次 evaluate 完成，减少 CDP 往返）"""
+        for _ in range(2):
             try:
-                # 弹窗右上角的关闭按钮
-                close_btns = await page.query_selector_all('svg, .close, [class*="close"], [class*="Close"]')
-                for btn in close_btns:
-                    try:
-                        if await btn.is_visible():
-                            box = await btn.bounding_box()
-                            # 只点击在弹窗区域内的关闭按钮
-                            if box and box["x"] > 200 and box["y"] < 500:
-                                await btn.click()
-                                await page.wait_for_timeout(500)
-                                logger.debug("已关闭弹窗")
-                                closed = True
-                                break
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+                closed = await page.evaluate(_CLOSE_XUEQIU_POPUPS_JS)
+            except Exception as e:
+                logger.debug(f"关闭弹窗脚本执行失败: {e}")
+                closed = 0
 
-            # 3. 按 ESC 键
+            # 按 ESC 键
             try:
                 await page.keyboard.press("Escape")
-                await page.wait_for_timeout(300)
-            except Exception:
-                pass
-
-            # 4. 点击遮罩层关闭
-            try:
-                mask = await page.query_selector('.modal-mask, .overlay, [class*="mask"]')
-                if mask and await mask.is_visible():
-                    await mask.click()
-                    await page.wait_for_timeout(500)
-                    closed = True
             except Exception:
                 pass
 
             if not closed:
                 break
-            await page.wait_for_timeout(300)
+            logger.debug(f"已关闭 {closed} 个弹窗")
+            await page.wait_for_timeout(200)
 
     async def _switch_to_daily_kline(self, page):
         """雪球切换到日K线图"""
         try:
             # 点击"日K"按钮
-            daily_btn = await page.query_selector('text="日K"')
-            if daily_btn and await daily_btn.is_visible():
+            daily_btn = page.locator(XQ_DAILY_BTN).first
+            if await daily_btn.count() and await daily_btn.is_visible():
                 await daily_btn.click()
                 await page.wait_for_timeout(1500)
                 logger.debug("已切换到日K线图")
@@ -342,38 +687,24 @@ class ScreenshotCollector:
 
     async def _switch_period_xueqiu(self, page, period: str):
         """雪球切换K线周期"""
-        period_text = {"weekly": "周K", "monthly": "月K"}.get(period)
-        if not period_text:
+        selector = XQ_PERIOD_BTNS.get(period)
+        if not selector:
             return
         try:
-            btn = await page.query_selector(f'text="{period_text}"')
-            if btn and await btn.is_visible():
+            btn = page.locator(selector).first
+            if await btn.count() and await btn.is_visible():
                 await btn.click()
                 await page.wait_for_timeout(1500)
-                logger.debug(f"已切换到{period_text}")
+                logger.debug(f"已切换周期: {selector}")
         except Exception:
             pass
 
     async def _close_popups(self, page):
         """关闭弹窗广告"""
-        # 常见的关闭按钮选择器
-        close_selectors = [
-            'text="关闭"',
-            'text="×"',
-            'text="X"',
-            '.close-btn',
-            '.modal-close',
-            '[class*="close"]',
-            'button:has-text("关闭")',
-            'a:has-text("关闭")',
-            '.layui-layer-close',
-            '.popup-close',
-        ]
-
-        for selector in close_selectors:
+        for selector in CLOSE_POPUP_SELECTORS:
             try:
-                btn = await page.query_selector(selector)
-                if btn and await btn.is_visible():
+                btn = page.locator(selector).first
+                if await btn.count() and await btn.is_visible():
                     await btn.click()
                     await page.wait_for_timeout(500)
                     logger.debug(f"关闭弹窗: {selector}")
@@ -389,16 +720,10 @@ class ScreenshotCollector:
 
     async def _switch_period(self, page, period: str):
         """切换K线周期"""
-        period_map = {
-            "weekly": ["周K", "周线", "week"],
-            "monthly": ["月K", "月线", "month"],
-        }
-        keywords = period_map.get(period, [])
-
-        for keyword in keywords:
+        for selector in PERIOD_BTNS.get(period, ()):
             try:
-                btn = await page.query_selector(f'text="{keyword}"')
-                if btn:
+                btn = page.locator(selector).first
+                if await btn.count():
                     await btn.click()
                     await page.wait_for_timeout(1000)
                     return
@@ -422,17 +747,37 @@ class ScreenshotCollector:
         Returns:
             ChartScreenshot 列表
         """
+        if not stocks:
+            return []
+
+        # 先启动浏览器，启动失败直接抛出（与逐只截图时行为一致）；接口绘图模式按需启动
+        if not self._use_api_render(period):
+            async with self._lock:
+                await self._ensure_browser()
+
+        # 多页面并发截图（同一 context），耗时主要在等待网络/渲染
+        semaphore = asyncio.Semaphore(max(1, int(self.config.get("concurrency", 6))))
+
+        async def capture_one(stock: dict) -> ChartScreenshot | None:
+            async with semaphore:
+                return await self.capture(
+                    symbol=stock.get("symbol", ""),
+                    name=stock.get("name", ""),
+                    market=stock.get("market", "CN"),
+                    period=period,
+                    provider=provider,
+                )
+
+        outcomes = await asyncio.gather(
+            *[capture_one(stock) for stock in stocks], return_exceptions=True
+        )
+
         results = []
-        for stock in stocks:
-            screenshot = await self.capture(
-                symbol=stock.get("symbol", ""),
-                name=stock.get("name", ""),
-                market=stock.get("market", "CN"),
-                period=period,
-                provider=provider,
-            )
-            if screenshot:
-                results.append(screenshot)
+        for stock, outcome in zip(stocks, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"截图失败 {stock.get('name', '')}({stock.get('symbol', '')}): {outcome}")
+            elif outcome:
+                results.append(outcome)
 
         return results
 
@@ -441,19 +786,33 @@ class ScreenshotCollector:
         cutoff = datetime.now().timestamp() - max_age_hours * 3600
         cleaned = 0
 
-        for filepath in SCREENSHOT_DIR.glob("*.png"):
-            if filepath.stat().st_mtime < cutoff:
-                try:
-                    filepath.unlink()
-                    cleaned += 1
-                except Exception as e:
-                    logger.debug(f"清理截图失败 {filepath}: {e}")
+        try:
+            with os.scandir(SCREENSHOT_DIR) as it:
+                for entry in it:
+                    if not entry.name.endswith((".png", ".jpg")):
+                        continue
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                            cleaned += 1
+                    except OSError as e:
+                        logger.debug(f"清理截图失败 {entry.path}: {e}")
+        except FileNotFoundError:
+            return
 
         if cleaned:
             logger.info(f"清理了 {cleaned} 张过期截图")
 
     async def close(self):
         """关闭浏览器"""
+        if self._context:
+            await self._close_context(self._context)
+            self._context = None
+            self._persistent = False
+        if self._profile_slot is not None:
+            _release_profile_slot(self._profile_slot)
+            self._profile_slot = None
+        self._live_pages.clear()
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -1,5 +1,6 @@
 from pathlib import Path
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 import yaml
 from pydantic_settings import BaseSettings
@@ -7,6 +8,11 @@ from pydantic import Field, AliasChoices
 
 from src.models.market import MarketCode
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # 未编译 libyaml 时回退纯 Python 解析器
+    from yaml import SafeLoader as _YamlLoader
+
 
 class Settings(BaseSettings):
     """环境变量配置"""
@@ -51,7 +57,7 @@ class Settings(BaseSettings):
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
-@dataclass
+@dataclass(slots=True)
 class StockConfig:
     """自选股配置"""
 
@@ -71,11 +77,18 @@ class AppConfig:
 def load_watchlist(path: str | Path = "config/watchlist.yaml") -> list[StockConfig]:
     """从 YAML 加载自选股列表"""
     path = Path(path)
-    if not path.exists():
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
+    return list(_load_watchlist_cached(str(path), mtime))
+
 
+@lru_cache(maxsize=4)
+def _load_watchlist_cached(path: str, mtime: int) -> tuple[StockConfig, ...]:
+    """按 (路径, 修改时间) 缓存解析结果，文件未变时跳过 IO 与解析"""
     with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
 
     stocks = []
     for market_group in data.get("markets", []):
@@ -89,7 +102,7 @@ def load_watchlist(path: str | Path = "config/watchlist.yaml") -> list[StockConf
                 )
             )
 
-    return stocks
+    return tuple(stocks)
 
 
 def load_config() -> AppConfig:
@@ -23,19 +23,36 @@ def record_agent_run(
         error: 错误信息（会截断）
         duration_ms: 执行耗时（毫秒）
     """
+    record_agent_runs([
+        {
+            "agent_name": agent_name,
+            "status": status,
+            "result": result,
+            "error": error,
+            "duration_ms": duration_ms,
+        }
+    ])
+
+
+def record_agent_runs(records: list[dict]) -> None:
+    """批量记录 Agent 运行结果（单个事务提交），每条字段同 record_agent_run。"""
+    if not records:
+        return
     db = SessionLocal()
     try:
-        db.add(AgentRun(
-            agent_name=agent_name,
-            status=status,
-            result=(result or "")[:2000],
-            error=(error or "")[:2000],
-            duration_ms=duration_ms,
-        ))
+        db.add_all([
+            AgentRun(
+                agent_name=r["agent_name"],
+                status=r["status"],
+                result=(r.get("result") or "")[:2000],
+                error=(r.get("error") or "")[:2000],
+                duration_ms=r.get("duration_ms") or 0,
+            )
+            for r in records
+        ])
         db.commit()
     except Exception as e:
         logger.warning(f"写入 AgentRun 失败: {e}")
         db.rollback()
     finally:
         db.close()
-
@@ -1,5 +1,8 @@
+import asyncio
 import base64
+import importlib.util
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
@@ -7,6 +10,17 @@ from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 图片编码专用线程池，避免大批量图片占满默认 executor
+_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-image")
+
+
+def _image_data_url(data: bytes) -> str:
+    """图片字节转 data URL（按文件头识别 JPEG/PNG）"""
+    mime = "image/jpeg" if data[:2] == b"\xff\xd8" else "image/png"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
 
 class AIClient:
     """OpenAI 协议兼容的 AI 客户端"""
@@ -23,6 +37,24 @@ class AIClient:
         self.client = AsyncOpenAI(**kwargs)
         self.model = model
         self.total_tokens_used = 0
+        self._raw_client: httpx.AsyncClient | None = None
+
+    def _get_raw_client(self) -> httpx.AsyncClient:
+        """raw Authorization 回退使用的 HTTP 客户端（懒加载，复用连接）"""
+        if self._raw_client is None:
+            self._raw_client = httpx.AsyncClient(
+                timeout=60,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                http2=_HTTP2_AVAILABLE,
+            )
+        return self._raw_client
+
+    async def aclose(self) -> None:
+        """关闭底层 HTTP 连接"""
+        if self._raw_client is not None:
+            await self._raw_client.aclose()
+            self._raw_client = None
+        await self.client.close()
 
     async def chat(
         self,
@@ -30,6 +62,7 @@ class AIClient:
         user_content: str,
         images: list[str] | None = None,
         temperature: float = 0.4,
+        image_bytes: list[bytes] | None = None,
     ) -> str:
         """
         调用 LLM 获取文本回复。
@@ -39,21 +72,31 @@ class AIClient:
             user_content: 用户输入内容
             images: 图片路径列表（用于多模态，可选）
             temperature: 生成温度
+            image_bytes: 内存中的图片数据（JPEG/PNG，不经过磁盘，可选）
         """
         messages = [
             {"role": "system", "content": system_prompt},
         ]
 
         # 构建 user message
-        if images:
+        if images or image_bytes:
+            loop = asyncio.get_running_loop()
+            encoded = await asyncio.gather(
+                *[
+                    loop.run_in_executor(_IMAGE_EXECUTOR, self._encode_image, p)
+                    for p in images or []
+                ],
+                *[
+                    loop.run_in_executor(_IMAGE_EXECUTOR, _image_data_url, b)
+                    for b in image_bytes or []
+                ],
+            )
             content_parts = [{"type": "text", "text": user_content}]
-            for img_path in images:
-                img_data = self._encode_image(img_path)
-                if img_data:
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{img_data}"}
-                    })
+            content_parts += [
+                {"type": "image_url", "image_url": {"url": url}}
+                for url in encoded
+                if url
+            ]
             messages.append({"role": "user", "content": content_parts})
         else:
             messages.append({"role": "user", "content": user_content})
@@ -100,10 +143,10 @@ class AIClient:
             "Authorization": self.api_key,
         }
         endpoint = f"{self.base_url}/chat/completions"
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(endpoint, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        client = self._get_raw_client()
+        response = await client.post(endpoint, headers=headers, json=payload)
+        response.raise_for_status()
+        data = response.json()
 
         usage = data.get("usage") or {}
         if usage:
@@ -112,11 +155,12 @@ class AIClient:
             ((data.get("choices") or [{}])[0].get("message") or {}).get("content") or ""
         )
 
-    def _encode_image(self, image_path: str) -> str | None:
-        """将图片文件编码为 base64"""
+    @staticmethod
+    def _encode_image(image_path: str) -> str | None:
+        """将图片文件编码为 base64 data URL（同步，由 chat 投递到线程池执行）"""
         path = Path(image_path)
         if not path.exists():
             logger.warning(f"图片不存在: {image_path}")
             return None
         with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
+            return _image_data_url(f.read())
@@ -1,12 +1,53 @@
 """分析历史记录管理"""
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import date, datetime
 
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from src.web.database import SessionLocal
 from src.web.models import AnalysisHistory
 
 logger = logging.getLogger(__name__)
 
+# 查询结果内存缓存（60 秒过期，LRU 淘汰）；写入/删除后按 agent 失效
+# 同时被 API 线程池、调度器及 asyncio.run 线程访问，读写均需持锁
+_cache: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_TTL = 60.0
+_CACHE_MAX = 2048
+_MISS = object()
+
+
+def _get_cached(key: tuple):
+    """获取缓存，未命中返回 _MISS（缓存值可能为 None）"""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            cached_time, data = entry
+            if time.monotonic() - cached_time < _CACHE_TTL:
+                _cache.move_to_end(key)
+                return data
+            del _cache[key]
+    return _MISS
+
+
+def _set_cached(key: tuple, data) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), data)
+        _cache.move_to_end(key)
+        if len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+
+
+def invalidate_analysis_cache(agent_name: str) -> None:
+    """失效某个 agent 的所有缓存（历史列表/最近记录都可能受影响）"""
+    with _cache_lock:
+        for key in [k for k in _cache if k[1] == agent_name]:
+            del _cache[key]
+
 
 def save_analysis(
     agent_name: str,
@@ -19,7 +60,7 @@ def save_analysis(
     """
     保存分析结果
 
-    - 同一天可以覆盖
+    - 同一天可以覆盖（单条 INSERT ... ON CONFLICT DO UPDATE）
     - 历史记录不可覆盖（通过数据库约束保证）
 
     Args:
@@ -40,34 +81,27 @@ def save_analysis(
 
     db = SessionLocal()
     try:
-        # 查找是否已存在
-        existing = db.query(AnalysisHistory).filter(
-            AnalysisHistory.agent_name == agent_name,
-            AnalysisHistory.stock_symbol == stock_symbol,
-            AnalysisHistory.analysis_date == date_str,
-        ).first()
-
-        if existing:
-            # 更新（同一天可覆盖）
-            existing.title = title
-            existing.content = content
-            existing.raw_data = raw_data or {}
-            existing.updated_at = datetime.now()
-            logger.info(f"更新分析记录: {agent_name}/{stock_symbol}/{date_str}")
-        else:
-            # 新增
-            record = AnalysisHistory(
-                agent_name=agent_name,
-                stock_symbol=stock_symbol,
-                analysis_date=date_str,
-                title=title,
-                content=content,
-                raw_data=raw_data or {},
-            )
-            db.add(record)
-            logger.info(f"新增分析记录: {agent_name}/{stock_symbol}/{date_str}")
-
+        stmt = sqlite_insert(AnalysisHistory.__table__).values(
+            agent_name=agent_name,
+            stock_symbol=stock_symbol,
+            analysis_date=date_str,
+            title=title,
+            content=content,
+            raw_data=raw_data or {},
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["agent_name", "stock_symbol", "analysis_date"],
+            set_={
+                "title": stmt.excluded.title,
+                "content": stmt.excluded.content,
+                "raw_data": stmt.excluded.raw_data,
+                "updated_at": datetime.now(),
+            },
+        )
+        db.execute(stmt)
         db.commit()
+        logger.info(f"保存分析记录: {agent_name}/{stock_symbol}/{date_str}")
+        invalidate_analysis_cache(agent_name)
         return True
 
     except Exception as e:
@@ -98,16 +132,22 @@ def get_analysis(
         analysis_date = date.today()
 
     date_str = analysis_date.strftime("%Y-%m-%d")
+    key = ("get", agent_name, stock_symbol, date_str)
+    cached = _get_cached(key)
+    if cached is not _MISS:
+        return cached
 
     db = SessionLocal()
     try:
-        return db.query(AnalysisHistory).filter(
+        result = db.query(AnalysisHistory).filter(
             AnalysisHistory.agent_name == agent_name,
             AnalysisHistory.stock_symbol == stock_symbol,
             AnalysisHistory.analysis_date == date_str,
         ).first()
     finally:
         db.close()
+    _set_cached(key, result)
+    return result
 
 
 def get_latest_analysis(
@@ -130,16 +170,22 @@ def get_latest_analysis(
         before_date = date.today()
 
     date_str = before_date.strftime("%Y-%m-%d")
+    key = ("latest", agent_name, stock_symbol, date_str)
+    cached = _get_cached(key)
+    if cached is not _MISS:
+        return cached
 
     db = SessionLocal()
     try:
-        return db.query(AnalysisHistory).filter(
+        result = db.query(AnalysisHistory).filter(
             AnalysisHistory.agent_name == agent_name,
             AnalysisHistory.stock_symbol == stock_symbol,
             AnalysisHistory.analysis_date < date_str,
         ).order_by(AnalysisHistory.analysis_date.desc()).first()
     finally:
         db.close()
+    _set_cached(key, result)
+    return result
 
 
 def get_analysis_history(
@@ -158,6 +204,11 @@ def get_analysis_history(
     Returns:
         分析记录列表，按日期倒序
     """
+    key = ("history", agent_name, stock_symbol, limit)
+    cached = _get_cached(key)
+    if cached is not _MISS:
+        return list(cached)
+
     db = SessionLocal()
     try:
         query = db.query(AnalysisHistory).filter(
@@ -167,6 +218,8 @@ def get_analysis_history(
         if stock_symbol:
             query = query.filter(AnalysisHistory.stock_symbol == stock_symbol)
 
-        return query.order_by(AnalysisHistory.analysis_date.desc()).limit(limit).all()
+        result = query.order_by(AnalysisHistory.analysis_date.desc()).limit(limit).all()
     finally:
         db.close()
+    _set_cached(key, tuple(result))
+    return result
@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 
+# Prefix -> exchange, matched longest-first (3 -> 2 -> 1 chars).
+_EXCHANGE_BY_PREFIX3 = {"920": "BJ", "900": "SH"}
+_EXCHANGE_BY_PREFIX2 = {"83": "BJ", "87": "BJ", "88": "BJ"}
+_EXCHANGE_BY_PREFIX1 = {"5": "SH", "6": "SH"}
+
+
+@lru_cache(maxsize=4096)
 def get_cn_exchange(symbol: str) -> str:
     """Return CN exchange code: SH / SZ / BJ.
 
@@ -12,13 +20,15 @@ def get_cn_exchange(symbol: str) -> str:
     - SZ: others (default)
     """
     sym = (symbol or "").strip()
-    if sym.startswith("920") or sym.startswith(("83", "87", "88")):
-        return "BJ"
-    if sym.startswith(("5", "6")) or sym.startswith("900"):
-        return "SH"
-    return "SZ"
+    return (
+        _EXCHANGE_BY_PREFIX3.get(sym[:3])
+        or _EXCHANGE_BY_PREFIX2.get(sym[:2])
+        or _EXCHANGE_BY_PREFIX1.get(sym[:1])
+        or "SZ"
+    )
 
 
+@lru_cache(maxsize=4096)
 def get_cn_prefix(symbol: str, upper: bool = False) -> str:
     """Return market prefix for CN symbol.
 
@@ -1,19 +1,41 @@
 """统一数据源管理器"""
 
+import asyncio
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache, wraps
 from typing import Any, Callable
 
+from sqlalchemy import Row, select
+
 from src.web.database import SessionLocal
 from src.web.models import DataSource
 from src.models.market import MarketCode
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# 只读查询使用的数据源列（返回 Row，支持 source.name 等属性访问，跳过 ORM 实例化）
+_SOURCE_COLUMNS = (
+    DataSource.id,
+    DataSource.name,
+    DataSource.type,
+    DataSource.provider,
+    DataSource.config,
+    DataSource.enabled,
+    DataSource.priority,
+    DataSource.supports_batch,
+    DataSource.test_symbols,
+)
+
+_MKT_CN = MarketCode.CN
+_MARKET_BY_STR = {m.value: m for m in MarketCode}
+
+@dataclass(slots=True)
 class CollectorResult:
     """采集结果"""
 
@@ -26,7 +48,7 @@ class CollectorResult:
     source_provider: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectorLog:
     """采集日志"""
 
@@ -37,6 +59,85 @@ class CollectorLog:
     message: str
     duration_ms: int = 0
     count: int = 0
+    timestamp_str: str = ""  # 预先格式化的 "HH:MM:SS"，供 get_logs 直接使用
+
+
+def _tracked(
+    source_name: str,
+    source_type: str,
+    start_message: Callable[..., str],
+    success_message: Callable[[CollectorResult], str],
+):
+    """采集方法装饰器：统一计时、记录 start/success/error 日志，异常转为失败结果
+
+    被装饰方法返回 CollectorResult（duration_ms 由装饰器填充）。
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(self, *args, **kwargs) -> CollectorResult:
+            t0 = time.perf_counter_ns()
+            self._log(source_name, source_type, "start", start_message(*args, **kwargs))
+            try:
+                result = await fn(self, *args, **kwargs)
+                message = success_message(result) if result.success else result.error
+            except Exception as e:
+                result = CollectorResult(success=False, error=str(e))
+                message = result.error
+            result.duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
+            self._log(
+                source_name,
+                source_type,
+                "success" if result.success else "error",
+                message,
+                duration_ms=result.duration_ms,
+                count=result.count if result.success else 0,
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@cache
+def _get_factories() -> dict[str, dict[str, Callable]]:
+    """注册所有采集器（懒加载，只在首次调用时导入采集器模块）"""
+    from src.collectors.news_collector import (
+        XueqiuNewsCollector,
+        EastMoneyStockNewsCollector,
+        EastMoneyNewsCollector,
+    )
+    from src.collectors.kline_collector import KlineCollector
+    from src.collectors.capital_flow_collector import CapitalFlowCollector
+    from src.collectors.akshare_collector import AkshareCollector
+    from src.collectors.events_collector import EastMoneyEventsCollector
+
+    return {
+        "news": {
+            "xueqiu": lambda cfg: XueqiuNewsCollector(
+                cookies=cfg.get("cookies", "")
+            ),
+            "eastmoney_news": lambda cfg: EastMoneyStockNewsCollector(),
+            "eastmoney": lambda cfg: EastMoneyNewsCollector(),
+        },
+        "kline": {
+            "tencent": lambda cfg: ("tencent", KlineCollector),
+        },
+        "capital_flow": {
+            "eastmoney": lambda cfg: CapitalFlowCollector(_MKT_CN),
+        },
+        "quote": {
+            "tencent": lambda cfg: AkshareCollector(_MKT_CN),
+        },
+        "chart": {
+            "xueqiu": lambda cfg: ("xueqiu", cfg),
+            "eastmoney": lambda cfg: ("eastmoney", cfg),
+        },
+        "events": {
+            "eastmoney": lambda cfg: EastMoneyEventsCollector(),
+        },
+    }
 
 
 class DataCollectorManager:
@@ -49,50 +150,26 @@ class DataCollectorManager:
     - 批量/单个采集
     """
 
-    # 数据源类型 -> (provider -> 采集器工厂)
-    COLLECTOR_FACTORIES: dict[str, dict[str, Callable]] = {}
+    # 内存中保留的采集日志条数上限（环形缓冲）
+    _MAX_LOGS = 500
+
+    # 默认测试股票名称映射
+    _DEFAULT_NAMES = {
+        "601127": "赛力斯",
+        "600519": "贵州茅台",
+        "000001": "平安银行",
+        "000858": "五粮液",
+        "300750": "宁德时代",
+    }
 
     def __init__(self):
-        self.logs: list[CollectorLog] = []
-        self._register_collectors()
-
-    def _register_collectors(self):
-        """注册所有采集器"""
-        from src.collectors.news_collector import (
-            XueqiuNewsCollector,
-            EastMoneyStockNewsCollector,
-            EastMoneyNewsCollector,
-        )
-        from src.collectors.kline_collector import KlineCollector
-        from src.collectors.capital_flow_collector import CapitalFlowCollector
-        from src.collectors.akshare_collector import AkshareCollector
-        from src.collectors.events_collector import EastMoneyEventsCollector
-
-        self.COLLECTOR_FACTORIES = {
-            "news": {
-                "xueqiu": lambda cfg: XueqiuNewsCollector(
-                    cookies=cfg.get("cookies", "")
-                ),
-                "eastmoney_news": lambda cfg: EastMoneyStockNewsCollector(),
-                "eastmoney": lambda cfg: EastMoneyNewsCollector(),
-            },
-            "kline": {
-                "tencent": lambda cfg: ("tencent", KlineCollector),
-            },
-            "capital_flow": {
-                "eastmoney": lambda cfg: CapitalFlowCollector(MarketCode.CN),
-            },
-            "quote": {
-                "tencent": lambda cfg: AkshareCollector(MarketCode.CN),
-            },
-            "chart": {
-                "xueqiu": lambda cfg: ("xueqiu", cfg),
-                "eastmoney": lambda cfg: ("eastmoney", cfg),
-            },
-            "events": {
-                "eastmoney": lambda cfg: EastMoneyEventsCollector(),
-            },
-        }
+        self.logs: deque[CollectorLog] = deque(maxlen=self._MAX_LOGS)
+        self._stock_names: dict[str, str] = {}  # 已从数据库查到的股票名称
+
+    @property
+    def COLLECTOR_FACTORIES(self) -> dict[str, dict[str, Callable]]:
+        """数据源类型 -> (provider -> 采集器工厂)，首次访问时才导入采集器模块"""
+        return _get_factories()
 
     def _log(
         self,
@@ -104,262 +181,155 @@ class DataCollectorManager:
         count: int = 0,
     ):
         """记录日志"""
+        now = datetime.now()
         log = CollectorLog(
-            timestamp=datetime.now(),
+            timestamp=now,
             source_name=source_name,
             source_type=source_type,
             action=action,
             message=message,
             duration_ms=duration_ms,
             count=count,
+            timestamp_str=f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}",
         )
         self.logs.append(log)
 
-        # 同时输出到 logger
-        if action == "error":
-            logger.warning(f"[{source_name}] {message}")
-        else:
-            logger.info(f"[{source_name}] {message}")
-
-    def get_logs(self) -> list[dict]:
-        """获取日志（用于 UI 展示）"""
-        return [
-            {
-                "timestamp": log.timestamp.strftime("%H:%M:%S"),
-                "source_name": log.source_name,
-                "source_type": log.source_type,
-                "action": log.action,
-                "message": log.message,
-                "duration_ms": log.duration_ms,
-                "count": log.count,
-            }
-            for log in self.logs
-        ]
+        # 同时输出到 logger（级别未开启时不做格式化）
+        level = logging.WARNING if action == "error" else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, "[%s] %s", source_name, message)
+
+    def get_logs(self) -> dict[str, list]:
+        """获取日志（用于 UI 展示），按列返回：{列名: [各条日志的值]}"""
+        logs = self.logs
+        return {
+            "timestamp": [log.timestamp_str for log in logs],
+            "source_name": [log.source_name for log in logs],
+            "source_type": [log.source_type for log in logs],
+            "action": [log.action for log in logs],
+            "message": [log.message for log in logs],
+            "duration_ms": [log.duration_ms for log in logs],
+            "count": [log.count for log in logs],
+        }
 
     def clear_logs(self):
         """清空日志"""
-        self.logs = []
+        self.logs.clear()
 
-    def get_enabled_sources(self, source_type: str) -> list[DataSource]:
+    def get_enabled_sources(self, source_type: str) -> list[Row]:
         """获取指定类型的已启用数据源"""
-        db = SessionLocal()
-        try:
-            return (
-                db.query(DataSource)
-                .filter(DataSource.type == source_type, DataSource.enabled == True)
-                .order_by(DataSource.priority)
-                .all()
-            )
-        finally:
-            db.close()
+        stmt = (
+            select(*_SOURCE_COLUMNS)
+            .where(DataSource.type == source_type, DataSource.enabled == True)
+            .order_by(DataSource.priority)
+        )
+        with SessionLocal() as db:
+            return db.execute(stmt).all()
 
-    def get_source_by_id(self, source_id: int) -> DataSource | None:
+    def get_source_by_id(self, source_id: int) -> Row | None:
         """根据 ID 获取数据源"""
-        db = SessionLocal()
-        try:
-            return db.query(DataSource).filter(DataSource.id == source_id).first()
-        finally:
-            db.close()
+        stmt = select(*_SOURCE_COLUMNS).where(DataSource.id == source_id)
+        with SessionLocal() as db:
+            return db.execute(stmt).first()
 
     def _get_stock_names(self, symbols: list[str]) -> dict[str, str]:
-        """获取股票代码到名称的映射"""
+        """获取股票代码到名称的映射（已查到的名称缓存复用，只查询缺失的代码）"""
         from src.web.models import Stock
 
-        # 默认测试股票名称映射
-        default_names = {
-            "601127": "赛力斯",
-            "600519": "贵州茅台",
-            "000001": "平安银行",
-            "000858": "五粮液",
-            "300750": "宁德时代",
-        }
-
-        db = SessionLocal()
-        try:
-            stocks = db.query(Stock).filter(Stock.symbol.in_(symbols)).all()
-            result = {s.symbol: s.name for s in stocks}
-
-            # 对于数据库中没有的股票，使用默认名称
-            for symbol in symbols:
-                if symbol not in result and symbol in default_names:
-                    result[symbol] = default_names[symbol]
-
-            return result
-        except Exception as e:
-            logger.warning(f"获取股票名称失败: {e}")
-            # 返回默认名称
-            return {s: default_names.get(s, s) for s in symbols if s in default_names}
-        finally:
-            db.close()
-
+        default_names = self._DEFAULT_NAMES
+        missing = [s for s in symbols if s not in self._stock_names]
+        if missing:
+            try:
+                stmt = select(Stock.symbol, Stock.name).where(Stock.symbol.in_(missing))
+                with SessionLocal() as db:
+                    self._stock_names.update(db.execute(stmt).tuples().all())
+            except Exception as e:
+                logger.warning(f"获取股票名称失败: {e}")
+                # 返回默认名称
+                return {s: default_names[s] for s in symbols if s in default_names}
+
+        # 对于数据库中没有的股票，使用默认名称
+        result = {}
+        for symbol in symbols:
+            name = self._stock_names.get(symbol) or default_names.get(symbol)
+            if name:
+                result[symbol] = name
+        return result
+
+    @_tracked(
+        "新闻采集",
+        "news",
+        lambda symbols, *_, **__: f"开始采集 {len(symbols)} 只股票的新闻",
+        lambda r: f"采集完成，共 {r.count} 条",
+    )
     async def collect_news(
         self, symbols: list[str], hours: int = 12
     ) -> CollectorResult:
         """采集新闻（使用所有已启用的新闻数据源）"""
         from src.collectors.news_collector import NewsCollector
 
-        start_time = datetime.now()
-        self._log("新闻采集", "news", "start", f"开始采集 {len(symbols)} 只股票的新闻")
-
-        try:
-            collector = NewsCollector.from_database()
-            news_list = await collector.fetch_all(symbols=symbols, since_hours=hours)
-
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log(
-                "新闻采集",
-                "news",
-                "success",
-                f"采集完成，共 {len(news_list)} 条",
-                duration_ms=duration_ms,
-                count=len(news_list),
-            )
-
-            return CollectorResult(
-                success=True,
-                data=news_list,
-                count=len(news_list),
-                duration_ms=duration_ms,
-            )
-        except Exception as e:
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log("新闻采集", "news", "error", str(e), duration_ms=duration_ms)
-            return CollectorResult(success=False, error=str(e), duration_ms=duration_ms)
+        collector = NewsCollector.from_database()
+        news_list = await collector.fetch_all(symbols=symbols, since_hours=hours)
+        return CollectorResult(success=True, data=news_list, count=len(news_list))
 
+    @_tracked(
+        "K线数据",
+        "kline",
+        lambda symbol, *_, **__: f"获取 {symbol} 的 K 线数据",
+        lambda r: f"获取成功，最新收盘价 {r.data.get('last_close', 'N/A')}",
+    )
     async def collect_kline(
         self, symbol: str, market: str = "CN", days: int = 60
     ) -> CollectorResult:
         """采集 K 线数据"""
         from src.collectors.kline_collector import KlineCollector
-        from src.models.market import MarketCode
-
-        start_time = datetime.now()
-        self._log("K线数据", "kline", "start", f"获取 {symbol} 的 K 线数据")
-
-        try:
-            market_code = MarketCode(market)
-            collector = KlineCollector(market_code)
-            summary = collector.get_kline_summary(symbol)
-
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-
-            if summary.get("error"):
-                self._log(
-                    "K线数据",
-                    "kline",
-                    "error",
-                    summary["error"],
-                    duration_ms=duration_ms,
-                )
-                return CollectorResult(
-                    success=False, error=summary["error"], duration_ms=duration_ms
-                )
-
-            self._log(
-                "K线数据",
-                "kline",
-                "success",
-                f"获取成功，最新收盘价 {summary.get('last_close', 'N/A')}",
-                duration_ms=duration_ms,
-            )
-
-            return CollectorResult(
-                success=True,
-                data=summary,
-                count=1,
-                duration_ms=duration_ms,
-            )
-        except Exception as e:
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log("K线数据", "kline", "error", str(e), duration_ms=duration_ms)
-            return CollectorResult(success=False, error=str(e), duration_ms=duration_ms)
 
+        # 未知市场仍走 MarketCode() 以保留原有的错误信息
+        market_code = _MARKET_BY_STR.get(market) or MarketCode(market)
+        collector = KlineCollector(market_code)
+        summary = collector.get_kline_summary(symbol)
+        if summary.get("error"):
+            return CollectorResult(success=False, error=summary["error"])
+        return CollectorResult(success=True, data=summary, count=1)
+
+    @_tracked(
+        "资金流向",
+        "capital_flow",
+        lambda symbol, *_, **__: f"获取 {symbol} 的资金流向",
+        lambda r: f"获取成功，主力净流入 {r.data.main_net_inflow / 10000:.2f}万",
+    )
     async def collect_capital_flow(self, symbol: str) -> CollectorResult:
         """采集资金流向"""
         from src.collectors.capital_flow_collector import CapitalFlowCollector
 
-        start_time = datetime.now()
-        self._log("资金流向", "capital_flow", "start", f"获取 {symbol} 的资金流向")
-
-        try:
-            collector = CapitalFlowCollector(MarketCode.CN)
-            data = collector.get_capital_flow(symbol)
-
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-
-            if not data:
-                self._log(
-                    "资金流向",
-                    "capital_flow",
-                    "error",
-                    "无数据",
-                    duration_ms=duration_ms,
-                )
-                return CollectorResult(
-                    success=False, error="无数据", duration_ms=duration_ms
-                )
-
-            self._log(
-                "资金流向",
-                "capital_flow",
-                "success",
-                f"获取成功，主力净流入 {data.main_net_inflow / 10000:.2f}万",
-                duration_ms=duration_ms,
-            )
-
-            return CollectorResult(
-                success=True,
-                data=data,
-                count=1,
-                duration_ms=duration_ms,
-            )
-        except Exception as e:
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log(
-                "资金流向", "capital_flow", "error", str(e), duration_ms=duration_ms
-            )
-            return CollectorResult(success=False, error=str(e), duration_ms=duration_ms)
-
+        collector = CapitalFlowCollector(_MKT_CN)
+        data = collector.get_capital_flow(symbol)
+        if not data:
+            return CollectorResult(success=False, error="无数据")
+        return CollectorResult(success=True, data=data, count=1)
+
+    @_tracked(
+        "实时行情",
+        "quote",
+        lambda symbols, *_, **__: f"获取 {len(symbols)} 只股票的行情",
+        lambda r: f"获取成功，共 {r.count} 只",
+    )
     async def collect_quote(self, symbols: list[str]) -> CollectorResult:
         """采集实时行情"""
         from src.collectors.akshare_collector import AkshareCollector
 
-        start_time = datetime.now()
-        self._log("实时行情", "quote", "start", f"获取 {len(symbols)} 只股票的行情")
-
-        try:
-            collector = AkshareCollector(MarketCode.CN)
-            stocks = await collector.get_stock_data(symbols)
-
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log(
-                "实时行情",
-                "quote",
-                "success",
-                f"获取成功，共 {len(stocks)} 只",
-                duration_ms=duration_ms,
-                count=len(stocks),
-            )
+        collector = AkshareCollector(_MKT_CN)
+        stocks = await collector.get_stock_data(symbols)
+        return CollectorResult(success=True, data=stocks, count=len(stocks))
 
-            return CollectorResult(
-                success=True,
-                data=stocks,
-                count=len(stocks),
-                duration_ms=duration_ms,
-            )
-        except Exception as e:
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            self._log("实时行情", "quote", "error", str(e), duration_ms=duration_ms)
-            return CollectorResult(success=False, error=str(e), duration_ms=duration_ms)
-
-    async def test_source(self, source: DataSource) -> CollectorResult:
+    async def test_source(self, source: DataSource | Row) -> CollectorResult:
         """测试单个数据源"""
         test_symbols = source.test_symbols or [
             "601127",
             "600519",
         ]  # 默认测试赛力斯和茅台
 
-        start_time = datetime.now()
+        t0 = time.perf_counter_ns()
         self._log(
             source.name,
             source.type,
@@ -369,7 +339,7 @@ class DataCollectorManager:
 
         try:
             result = await self._test_source_impl(source, test_symbols)
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
 
             if result.success:
                 self._log(
@@ -395,7 +365,7 @@ class DataCollectorManager:
             return result
 
         except Exception as e:
-            duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - t0) // 1_000_000
             self._log(
                 source.name, source.type, "error", str(e), duration_ms=duration_ms
             )
@@ -408,7 +378,7 @@ class DataCollectorManager:
             )
 
     async def _test_source_impl(
-        self, source: DataSource, test_symbols: list[str]
+        self, source: DataSource | Row, test_symbols: list[str]
     ) -> CollectorResult:
         """测试数据源的具体实现"""
         from datetime import timedelta
@@ -460,18 +430,21 @@ class DataCollectorManager:
         elif source.type == "kline":
             from src.collectors.kline_collector import KlineCollector
 
-            collector = KlineCollector(MarketCode.CN)
-            results = []
-            for symbol in test_symbols[:3]:
-                summary = collector.get_kline_summary(symbol)
-                if not summary.get("error"):
-                    results.append(
-                        {
-                            "symbol": symbol,
-                            "last_close": summary.get("last_close"),
-                            "trend": summary.get("trend"),
-                        }
-                    )
+            collector = KlineCollector(_MKT_CN)
+            symbols = test_symbols[:3]
+            # 同步 HTTP 请求放到线程中并发执行
+            summaries = await asyncio.gather(
+                *(asyncio.to_thread(collector.get_kline_summary, s) for s in symbols)
+            )
+            results = [
+                {
+                    "symbol": symbol,
+                    "last_close": summary.get("last_close"),
+                    "trend": summary.get("trend"),
+                }
+                for symbol, summary in zip(symbols, summaries)
+                if not summary.get("error")
+            ]
 
             return CollectorResult(
                 success=len(results) > 0,
@@ -483,19 +456,21 @@ class DataCollectorManager:
         elif source.type == "capital_flow":
             from src.collectors.capital_flow_collector import CapitalFlowCollector
 
-            collector = CapitalFlowCollector(MarketCode.CN)
-            results = []
-            for symbol in test_symbols[:3]:
-                data = collector.get_capital_flow(symbol)
-                if data:
-                    results.append(
-                        {
-                            "symbol": symbol,
-                            "name": data.name,
-                            "main_net": data.main_net_inflow,
-                            "main_pct": data.main_net_inflow_pct,
-                        }
-                    )
+            collector = CapitalFlowCollector(_MKT_CN)
+            symbols = test_symbols[:3]
+            flows = await asyncio.gather(
+                *(asyncio.to_thread(collector.get_capital_flow, s) for s in symbols)
+            )
+            results = [
+                {
+                    "symbol": symbol,
+                    "name": data.name,
+                    "main_net": data.main_net_inflow,
+                    "main_pct": data.main_net_inflow_pct,
+                }
+                for symbol, data in zip(symbols, flows)
+                if data
+            ]
 
             return CollectorResult(
                 success=len(results) > 0,
@@ -507,7 +482,7 @@ class DataCollectorManager:
         elif source.type == "quote":
             from src.collectors.akshare_collector import AkshareCollector
 
-            collector = AkshareCollector(MarketCode.CN)
+            collector = AkshareCollector(_MKT_CN)
             stocks = await collector.get_stock_data(test_symbols[:5])
 
             return CollectorResult(
@@ -529,7 +504,10 @@ class DataCollectorManager:
             from src.collectors.screenshot_collector import ScreenshotCollector
             import base64
 
-            collector = ScreenshotCollector(config={"extra_wait_ms": 3000})
+            # 测试只需要内存中的图片数据，不落盘
+            collector = ScreenshotCollector(
+                config={"extra_wait_ms": 3000, "save_to_disk": False}
+            )
             try:
                 symbol = test_symbols[0] if test_symbols else "601127"
                 screenshot = await collector.capture(
@@ -538,12 +516,15 @@ class DataCollectorManager:
                     market="CN",
                     provider=source.provider,
                 )
-                if screenshot and screenshot.exists:
-                    with open(screenshot.filepath, "rb") as f:
-                        img_base64 = base64.b64encode(f.read()).decode("utf-8")
+                if screenshot and screenshot.image_bytes:
+                    img_base64 = (
+                        await asyncio.to_thread(base64.b64encode, screenshot.image_bytes)
+                    ).decode("ascii")
                     return CollectorResult(
                         success=True,
-                        data={"image": f"data:image/png;base64,{img_base64}"},
+                        data={
+                            "image": f"data:image/{screenshot.image_format};base64,{img_base64}"
+                        },
                         count=1,
                     )
                 return CollectorResult(success=False, error="截图失败")
@@ -604,11 +585,16 @@ class DataCollectorManager:
 
 # 全局单例
 _manager: DataCollectorManager | None = None
+_manager_lock = threading.Lock()
 
 
 def get_collector_manager() -> DataCollectorManager:
-    """获取全局数据源管理器"""
+    """获取全局数据源管理器（线程安全；创建后无锁直接返回）"""
     global _manager
-    if _manager is None:
-        _manager = DataCollectorManager()
-    return _manager
+    manager = _manager
+    if manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = DataCollectorManager()
+            manager = _manager
+    return manager
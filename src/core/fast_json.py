@@ -0,0 +1,34 @@
+"""JSON encode/decode helpers.
+
+Prefer orjson (C parser, works directly on bytes); fall back to stdlib json
+when it's not installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Encode to compact UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option, default=str)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=str
+    ).encode("utf-8")
@@ -1,11 +1,15 @@
 import logging
 import os
 import re
+from typing import Callable
+from urllib.parse import urlsplit
 
 import apprise
 import asyncio
 import httpx
 
+from src.core import fast_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -107,6 +111,8 @@ CHANNEL_TYPES = {
     },
 }
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 # 通过 Apprise 支持的渠道类型（无代理配置时）
 _APPRISE_TYPES = {"telegram", "bark", "dingtalk", "lark", "discord", "pushover"}
 
@@ -119,6 +125,125 @@ _MARKDOWN_CHANNELS = {"wecom", "serverchan", "pushplus", "dingtalk", "lark", "di
 # 不支持 Markdown 的渠道（需要 sanitize）
 _PLAIN_TEXT_CHANNELS = {"telegram", "bark", "pushover"}
 
+# 自定义渠道的消息长度上限（含标题），超出会被服务端拒绝；Apprise 渠道由其自行截断
+# 企业微信 markdown.content 按 UTF-8 字节计
+_BYTE_LIMITS = {"wecom": 4096}
+# Telegram sendMessage 按字符（UTF-16 码元）计
+_CHAR_LIMITS = {"telegram": 4096}
+# 截断后追加的提示
+_TRUNCATED_MARKER = "\n…(已截断)"
+
+
+def truncate_utf8(text: str, max_bytes: int) -> str:
+    """按 UTF-8 字节数截断，不截断半个字符"""
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    return data[:max_bytes].decode("utf-8", "ignore")
+
+
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def truncate_utf16(text: str, max_units: int) -> str:
+    """按 UTF-16 码元数截断（Telegram 的长度口径），不拆开代理对"""
+    if len(text) <= max_units // 2 or _utf16_len(text) <= max_units:
+        return text
+    return text.encode("utf-16-le")[: max_units * 2].decode("utf-16-le", "ignore")
+
+
+def _fit_body(body: str, limit: int, by_bytes: bool) -> str:
+    """正文超过 limit 时截断并追加截断提示（提示本身计入 limit）"""
+    if by_bytes:
+        size, cut = (lambda t: len(t.encode("utf-8"))), truncate_utf8
+    else:
+        size, cut = _utf16_len, truncate_utf16
+    if size(body) <= limit:
+        return body
+    return cut(body, max(limit - size(_TRUNCATED_MARKER), 0)) + _TRUNCATED_MARKER
+
+
+def _build_telegram_url(config: dict) -> str | None:
+    bot_token = config.get("bot_token", "")
+    chat_id = config.get("chat_id", "")
+    if not bot_token or not chat_id:
+        raise ValueError("Telegram 需要 bot_token 和 chat_id")
+    # 如果配置了代理（渠道级或全局），返回 None，使用自定义方式发送
+    proxy = config.get("proxy", "").strip() or get_global_proxy()
+    if proxy:
+        return None
+    return f"tgram://{bot_token}/{chat_id}"
+
+
+def _build_bark_url(config: dict) -> str:
+    device_key = config.get("device_key", "")
+    server_url = config.get("server_url", "").strip("/")
+    if not device_key:
+        raise ValueError("Bark 需要 device_key")
+    if server_url:
+        parts = urlsplit(server_url if "://" in server_url else "//" + server_url)
+        host = (parts.netloc + parts.path).rstrip("/")
+        return f"bark://{host}/{device_key}/"
+    return f"bark://{device_key}/"
+
+
+def _build_dingtalk_url(config: dict) -> str:
+    # Apprise 钉钉格式：
+    # - 无加签：dingtalk://{access_token}/
+    # - 加签：  dingtalk://{secret}@{access_token}/
+    # - @手机号：在 URL 末尾追加 ?to=13800138000,13900139000
+    token = (config.get("token") or "").strip()
+    secret = (config.get("secret") or "").strip()
+    phones = (config.get("phones") or "").strip()
+    if not token:
+        raise ValueError("钉钉需要 token")
+    base = f"dingtalk://{secret}@{token}/" if secret else f"dingtalk://{token}/"
+    if phones:
+        # 仅保留数字和逗号
+        phone_list = [
+            re.sub(r"[^0-9]", "", p)
+            for p in phones.split(",")
+            if re.sub(r"[^0-9]", "", p)
+        ]
+        if phone_list:
+            base += f"?to={','.join(phone_list)}"
+    return base
+
+
+def _build_lark_url(config: dict) -> str:
+    webhook_token = config.get("webhook_token", "")
+    if not webhook_token:
+        raise ValueError("飞书需要 webhook_token")
+    return f"lark://{webhook_token}/"
+
+
+def _build_discord_url(config: dict) -> str:
+    webhook_id = config.get("webhook_id", "")
+    webhook_token = config.get("webhook_token", "")
+    if not webhook_id or not webhook_token:
+        raise ValueError("Discord 需要 webhook_id 和 webhook_token")
+    return f"discord://{webhook_id}/{webhook_token}/"
+
+
+def _build_pushover_url(config: dict) -> str:
+    user_key = config.get("user_key", "")
+    app_token = config.get("app_token", "")
+    if not user_key or not app_token:
+        raise ValueError("Pushover 需要 user_key 和 app_token")
+    return f"pover://{user_key}@{app_token}/"
+
+
+# 渠道类型 -> Apprise URL 构建函数
+_URL_BUILDERS: dict[str, Callable[[dict], str | None]] = {
+    "telegram": _build_telegram_url,
+    "bark": _build_bark_url,
+    "dingtalk": _build_dingtalk_url,
+    "lark": _build_lark_url,
+    "discord": _build_discord_url,
+    "pushover": _build_pushover_url,
+}
+
 
 def build_apprise_url(channel_type: str, config: dict) -> str | None:
     """
@@ -127,71 +252,10 @@ def build_apprise_url(channel_type: str, config: dict) -> str | None:
     Returns:
         Apprise URL 或 None（如果需要使用自定义方式发送，如带代理的 Telegram）
     """
-    if channel_type == "telegram":
-        bot_token = config.get("bot_token", "")
-        chat_id = config.get("chat_id", "")
-        if not bot_token or not chat_id:
-            raise ValueError("Telegram 需要 bot_token 和 chat_id")
-        # 如果配置了代理（渠道级或全局），返回 None，使用自定义方式发送
-        proxy = config.get("proxy", "").strip() or get_global_proxy()
-        if proxy:
-            return None
-        return f"tgram://{bot_token}/{chat_id}"
-
-    elif channel_type == "bark":
-        device_key = config.get("device_key", "")
-        server_url = config.get("server_url", "").strip("/")
-        if not device_key:
-            raise ValueError("Bark 需要 device_key")
-        if server_url:
-            host = server_url.replace("https://", "").replace("http://", "")
-            return f"bark://{host}/{device_key}/"
-        return f"bark://{device_key}/"
-
-    elif channel_type == "dingtalk":
-        # Apprise 钉钉格式：
-        # - 无加签：dingtalk://{access_token}/
-        # - 加签：  dingtalk://{secret}@{access_token}/
-        # - @手机号：在 URL 末尾追加 ?to=13800138000,13900139000
-        token = (config.get("token") or "").strip()
-        secret = (config.get("secret") or "").strip()
-        phones = (config.get("phones") or "").strip()
-        if not token:
-            raise ValueError("钉钉需要 token")
-        base = f"dingtalk://{secret}@{token}/" if secret else f"dingtalk://{token}/"
-        if phones:
-            # 仅保留数字和逗号
-            phone_list = [
-                re.sub(r"[^0-9]", "", p)
-                for p in phones.split(",")
-                if re.sub(r"[^0-9]", "", p)
-            ]
-            if phone_list:
-                base += f"?to={','.join(phone_list)}"
-        return base
-
-    elif channel_type == "lark":
-        webhook_token = config.get("webhook_token", "")
-        if not webhook_token:
-            raise ValueError("飞书需要 webhook_token")
-        return f"lark://{webhook_token}/"
-
-    elif channel_type == "discord":
-        webhook_id = config.get("webhook_id", "")
-        webhook_token = config.get("webhook_token", "")
-        if not webhook_id or not webhook_token:
-            raise ValueError("Discord 需要 webhook_id 和 webhook_token")
-        return f"discord://{webhook_id}/{webhook_token}/"
-
-    elif channel_type == "pushover":
-        user_key = config.get("user_key", "")
-        app_token = config.get("app_token", "")
-        if not user_key or not app_token:
-            raise ValueError("Pushover 需要 user_key 和 app_token")
-        return f"pover://{user_key}@{app_token}/"
-
-    else:
+    builder = _URL_BUILDERS.get(channel_type)
+    if builder is None:
         raise ValueError(f"不支持的 Apprise 渠道类型: {channel_type}")
+    return builder(config)
 
 
 class NotifierManager:
@@ -204,6 +268,37 @@ class NotifierManager:
         # 钉钉关键字（可选）：若群机器人启用“关键字”安全校验，则自动附加
         self._dingtalk_keywords: set[str] = set()
         self.policy = policy
+        # 自定义渠道（企业微信/Server酱/PushPlus）共用的 HTTP 客户端，懒加载
+        self._http: httpx.AsyncClient | None = None
+        # 自定义渠道类型 -> 发送方法
+        self._custom_senders = {
+            "telegram": self._send_telegram,
+            "wecom": self._send_wecom,
+            "serverchan": self._send_serverchan,
+            "pushplus": self._send_pushplus,
+        }
+
+    async def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return self._http
+
+    async def _post_json(self, url: str, payload: dict):
+        """POST JSON 并解析 JSON 响应（orjson 编解码，直接处理 UTF-8 字节）"""
+        client = await self._get_http()
+        resp = await client.post(
+            url, content=fast_json.dumps(payload), headers=_JSON_HEADERS
+        )
+        return fast_json.loads(resp.content)
+
+    async def aclose(self) -> None:
+        """关闭共用的 HTTP 连接"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     def add_channel(self, channel_type: str, config: dict):
         """添加通知渠道"""
@@ -295,21 +390,21 @@ class NotifierManager:
             await asyncio.sleep(backoff * (2 ** max(0, i - 1)))
 
         # Apprise 渠道（使用纯文本，因为 Telegram 等不支持 Markdown）
-        if len(self._ap) > 0:
-            apprise_ok = False
+        async def _send_apprise() -> str | None:
             last_err = ""
             for attempt in range(0, retry_attempts + 1):
                 try:
-                    success = await self._ap.async_notify(
+                    # 整个 Apprise 调用（含附件读取和同步插件的 HTTP 请求）放到线程中，不阻塞事件循环
+                    success = await asyncio.to_thread(
+                        self._ap.notify,
                         title=title,
                         body=plain_content,
                         body_format=apprise.NotifyFormat.TEXT,
                         attach=attachments,
                     )
                     if success:
-                        apprise_ok = True
                         logger.info(f"Apprise 通知发送成功: {title}")
-                        break
+                        return None
                     last_err = "Apprise 通知发送失败（可能是网络问题或配置错误）"
                     logger.error(f"{last_err}: {title}")
                 except Exception as e:
@@ -317,29 +412,59 @@ class NotifierManager:
                     logger.error(last_err)
                 if attempt < retry_attempts:
                     await _sleep_retry(attempt + 1)
-            if not apprise_ok:
-                errors.append(last_err or "Apprise 通知发送失败")
+            return last_err or "Apprise 通知发送失败"
+
+        # 超长内容按渠道上限预先截断（同一渠道类型共用结果），避免发出必然被拒绝的请求
+        truncated: dict[str, str] = {}
+
+        def _channel_content(ch_type: str) -> str:
+            # 支持 Markdown 的渠道使用原始内容，否则使用纯文本
+            body = content if ch_type in _MARKDOWN_CHANNELS else plain_content
+            if ch_type not in truncated:
+                if ch_type in _BYTE_LIMITS:
+                    # 与 _send_wecom 拼接的标题前缀一致
+                    prefix = f"## {title}\n\n" if title else ""
+                    truncated[ch_type] = _fit_body(
+                        body,
+                        _BYTE_LIMITS[ch_type] - len(prefix.encode("utf-8")),
+                        by_bytes=True,
+                    )
+                elif ch_type in _CHAR_LIMITS:
+                    # 与 _send_telegram 拼接的标题前缀一致
+                    prefix = f"*{title}*\n\n" if title else ""
+                    truncated[ch_type] = _fit_body(
+                        body, _CHAR_LIMITS[ch_type] - _utf16_len(prefix), by_bytes=False
+                    )
+                else:
+                    truncated[ch_type] = body
+            return truncated[ch_type]
 
         # 自定义渠道（根据渠道类型自动选择格式）
-        for ch_type, config in self._custom_channels:
-            ch_ok = False
+        async def _send_channel(ch_type: str, config: dict) -> str | None:
+            ch_content = _channel_content(ch_type)
             last_err = ""
             for attempt in range(0, retry_attempts + 1):
                 try:
-                    # 支持 Markdown 的渠道使用原始内容，否则使用纯文本
-                    ch_content = (
-                        content if ch_type in _MARKDOWN_CHANNELS else plain_content
-                    )
                     await self._send_custom(ch_type, config, title, ch_content)
-                    ch_ok = True
-                    break
+                    return None
                 except Exception as e:
                     last_err = f"{ch_type} 发送失败: {e}"
                     logger.error(last_err)
                 if attempt < retry_attempts:
                     await _sleep_retry(attempt + 1)
-            if not ch_ok:
-                errors.append(last_err or f"{ch_type} 发送失败")
+            return last_err or f"{ch_type} 发送失败"
+
+        # 各渠道相互独立，并发发送（各自重试），错误按渠道顺序汇总
+        sends = [_send_channel(ch_type, config) for ch_type, config in self._custom_channels]
+        if len(self._ap) > 0:
+            sends.insert(0, _send_apprise())
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for r in results:
+            if isinstance(r, BaseException):
+                logger.error(f"通知发送异常: {r}")
+                errors.append(str(r))
+            elif r:
+                errors.append(r)
 
         if errors:
             return {"success": False, "error": "; ".join(errors)}
@@ -347,16 +472,11 @@ class NotifierManager:
 
     async def _send_custom(self, ch_type: str, config: dict, title: str, content: str):
         """发送自定义渠道通知"""
-        if ch_type == "telegram":
-            await self._send_telegram(config, title, content)
-        elif ch_type == "wecom":
-            await self._send_wecom(config, title, content)
-        elif ch_type == "serverchan":
-            await self._send_serverchan(config, title, content)
-        elif ch_type == "pushplus":
-            await self._send_pushplus(config, title, content)
-        else:
+        sender = self._custom_senders.get(ch_type)
+        if sender is None:
             logger.warning(f"未知的自定义渠道类型: {ch_type}")
+            return
+        await sender(config, title, content)
 
     async def _send_telegram(self, config: dict, title: str, content: str):
         """Telegram Bot API（支持代理）"""
@@ -415,12 +535,10 @@ class NotifierManager:
         text = f"## {title}\n\n{content}" if title else content
         payload = {"msgtype": "markdown", "markdown": {"content": text}}
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, json=payload, timeout=30)
-            data = resp.json()
-            if data.get("errcode") != 0:
-                raise RuntimeError(f"企业微信发送失败: {data.get('errmsg')}")
-            logger.info(f"企业微信通知发送成功: {title}")
+        data = await self._post_json(url, payload)
+        if data.get("errcode") != 0:
+            raise RuntimeError(f"企业微信发送失败: {data.get('errmsg')}")
+        logger.info(f"企业微信通知发送成功: {title}")
 
     async def _send_serverchan(self, config: dict, title: str, content: str):
         """Server酱推送"""
@@ -431,12 +549,10 @@ class NotifierManager:
         url = f"https://sctapi.ftqq.com/{sendkey}.send"
         payload = {"title": title or "通知", "desp": content}
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, json=payload, timeout=30)
-            data = resp.json()
-            if data.get("code") != 0:
-                raise RuntimeError(f"Server酱发送失败: {data.get('message')}")
-            logger.info(f"Server酱通知发送成功: {title}")
+        data = await self._post_json(url, payload)
+        if data.get("code") != 0:
+            raise RuntimeError(f"Server酱发送失败: {data.get('message')}")
+        logger.info(f"Server酱通知发送成功: {title}")
 
     async def _send_pushplus(self, config: dict, title: str, content: str):
         """PushPlus 推送"""
@@ -455,9 +571,7 @@ class NotifierManager:
         if topic:
             payload["topic"] = topic
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(url, json=payload, timeout=30)
-            data = resp.json()
-            if data.get("code") != 200:
-                raise RuntimeError(f"PushPlus 发送失败: {data.get('msg')}")
-            logger.info(f"PushPlus 通知发送成功: {title}")
+        data = await self._post_json(url, payload)
+        if data.get("code") != 200:
+            raise RuntimeError(f"PushPlus 发送失败: {data.get('msg')}")
+        logger.info(f"PushPlus 通知发送成功: {title}")
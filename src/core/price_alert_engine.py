@@ -310,6 +310,8 @@ class PriceAlertEngine:
             return False, err
         except Exception as e:
             return False, str(e)
+        finally:
+            await notifier.aclose()
 
     async def scan_once(
         self,
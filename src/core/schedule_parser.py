@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Iterable
 from zoneinfo import ZoneInfo
 
@@ -132,7 +133,14 @@ def normalize_cron_day_of_week_field(day_of_week: str) -> str:
     return _compress_ints_to_cron_ranges(aps_set)
 
 
+@lru_cache(maxsize=256)
 def parse_cron(cron: str, timezone: str = "UTC") -> CronTrigger:
+    """Parse a 5-part cron into a CronTrigger.
+
+    Cached: APScheduler 3 CronTrigger holds no per-job state, so the same
+    instance can be shared across jobs and reloads. Interval triggers are not
+    cached since their start_date is fixed at construction.
+    """
     parts = cron.split()
     if len(parts) != 5:
         raise ValueError(f"无效的 cron 表达式: {cron}")
@@ -1,3 +1,5 @@
+import asyncio
+import dataclasses
 import logging
 import time
 from typing import Callable, Awaitable
@@ -5,12 +7,28 @@ from typing import Callable, Awaitable
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from src.agents.base import BaseAgent, AgentContext
-from src.core.agent_runs import record_agent_run
+from src.core.agent_runs import record_agent_run, record_agent_runs
 from src.models.market import MARKETS
 from src.core.schedule_parser import parse_schedule
 
 logger = logging.getLogger(__name__)
 
+# single 模式下同一 Agent 并发执行的股票数上限（默认）
+DEFAULT_SINGLE_MAX_WORKERS = 8
+
+# 运行记录后台写入：队列容量 / 单次事务最多写入条数
+_RECORD_QUEUE_SIZE = 1024
+_RECORD_BATCH_SIZE = 64
+# 从其他线程关闭时，等待事件循环取回剩余记录的最长时间（秒）
+_FLUSH_TIMEOUT = 10.0
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
 
 class AgentScheduler:
     """Agent 调度器"""
@@ -19,15 +37,31 @@ class AgentScheduler:
         self.scheduler = AsyncIOScheduler()
         self.agents: dict[str, BaseAgent] = {}
         self.execution_modes: dict[str, str] = {}
+        self.execution_max_workers: dict[str, int] = {}
         self.timezone = timezone
         # 改为存储 context 构建函数，而非固定 context
         self.context_builder: Callable[[str], AgentContext] | None = None
+        # 运行记录队列（start 时在事件循环内启动写入任务）
+        self._record_queue: asyncio.Queue[dict] | None = None
+        self._writer_task: asyncio.Task | None = None
+        # 调度器与写入任务所在的事件循环（可能从线程池中重载/关闭）
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
 
     def set_context_builder(self, builder: Callable[[str], AgentContext]):
         """设置 context 构建函数（每次执行时动态构建）"""
         self.context_builder = builder
 
-    def register(self, agent: BaseAgent, schedule: str, execution_mode: str = "batch"):
+    def register(
+        self,
+        agent: BaseAgent,
+        schedule: str,
+        execution_mode: str = "batch",
+        execution_max_workers: int | None = None,
+    ):
         """
         注册 Agent 到调度器。
 
@@ -37,9 +71,13 @@ class AgentScheduler:
                 - cron 格式: "分 时 日 月 周" (5 部分)
                 - interval 格式: "interval:3m" 或 "interval:30s"
             execution_mode: 执行模式 batch/single（single 将逐只股票执行 run_single）
+            execution_max_workers: single 模式下并发执行的股票数上限，默认 8
         """
         self.agents[agent.name] = agent
         self.execution_modes[agent.name] = execution_mode or "batch"
+        self.execution_max_workers[agent.name] = max(
+            1, execution_max_workers or DEFAULT_SINGLE_MAX_WORKERS
+        )
 
         # 解析调度表达式
         # cron 使用 5 段: "分 时 日 月 周"
@@ -70,61 +108,97 @@ class AgentScheduler:
             logger.error(f"Agent 未找到: {agent_name}")
             return
 
-        start = time.monotonic()
+        start = time.perf_counter_ns()
+        context = None
         try:
+            mode = self.execution_modes.get(agent_name, "batch")
+            single = mode == "single" and hasattr(agent, "run_single")
+            closed_markets: dict = {}
+            if single:
+                # 每次调度只判断一次各市场是否交易时段
+                closed_markets = {
+                    market: market_def.name
+                    for market, market_def in MARKETS.items()
+                    if not market_def.is_trading_time()
+                }
+                if MARKETS and len(closed_markets) == len(MARKETS):
+                    # 全部休市：不构建 context，直接返回
+                    logger.info(f"[调度] 跳过 {agent.display_name}（所有市场均非交易时段）")
+                    self._record(
+                        agent_name=agent_name,
+                        status="success",
+                        result="single mode skipped: all markets closed",
+                        duration_ms=(time.perf_counter_ns() - start) // 1_000_000,
+                    )
+                    return
+
             # 每次执行时动态构建 context（获取最新配置）
             context = self.context_builder(agent_name)
             logger.info(f"[调度] 开始执行 Agent: {agent.display_name}")
-            mode = self.execution_modes.get(agent_name, "batch")
-            if mode == "single" and hasattr(agent, "run_single"):
-                processed = 0
-                skipped = 0
-                errors: list[str] = []
-                for stock in list(context.watchlist):
-                    market_def = MARKETS.get(stock.market)
-                    if market_def and not market_def.is_trading_time():
-                        skipped += 1
-                        logger.info(
-                            f"[调度] 跳过 {agent.display_name} {stock.symbol}（{market_def.name} 非交易时段）"
-                        )
-                        continue
+            if single:
+                # 每只股票使用独立 context 副本，原 watchlist 不会被改写，无需复制
+                watchlist = context.watchlist
+                total = len(watchlist)
+                active = [s for s in watchlist if s.market not in closed_markets]
+                skipped = total - len(active)
+                if skipped:
+                    logger.info(
+                        f"[调度] 跳过 {agent.display_name} {skipped} 只股票（{'/'.join(closed_markets.values())} 非交易时段）"
+                    )
+                sem = asyncio.Semaphore(
+                    self.execution_max_workers.get(
+                        agent_name, DEFAULT_SINGLE_MAX_WORKERS
+                    )
+                )
+
+                async def _one(stock) -> tuple[str, str]:
+                    """执行单只股票，返回 (status, error)"""
+                    # run_single 会临时改写 config.watchlist，并发时每只股票使用独立副本
+                    stock_context = dataclasses.replace(
+                        context, config=dataclasses.replace(context.config)
+                    )
                     try:
-                        res = await agent.run_single(context, stock.symbol)  # type: ignore[attr-defined]
-                        processed += 1
-                        try:
-                            notify_error = (
-                                (res.raw_data or {}).get("notify_error") if res else ""
-                            )
-                        except Exception:
-                            notify_error = ""
-                        if notify_error:
-                            errors.append(f"{stock.symbol} notify: {notify_error}")
+                        async with sem:
+                            res = await agent.run_single(stock_context, stock.symbol)  # type: ignore[attr-defined]
                     except Exception as e:
                         logger.error(
                             f"Agent [{agent_name}] 单只执行失败 {stock.symbol}: {e}",
                             exc_info=True,
                         )
-                        errors.append(f"{stock.symbol}: {e}")
+                        return "error", f"{stock.symbol}: {e}"
+                    try:
+                        notify_error = (
+                            (res.raw_data or {}).get("notify_error") if res else ""
+                        )
+                    except Exception:
+                        notify_error = ""
+                    if notify_error:
+                        return "processed", f"{stock.symbol} notify: {notify_error}"
+                    return "processed", ""
+
+                results = await asyncio.gather(*(_one(stock) for stock in active))
+                processed = sum(1 for status, _ in results if status == "processed")
+                errors: list[str] = [err for _, err in results if err]
                 logger.info(
-                    f"[调度] Agent 单只模式执行完成: {agent.display_name}（执行{processed}，跳过{skipped}，共{len(context.watchlist)}）"
+                    f"[调度] Agent 单只模式执行完成: {agent.display_name}（执行{processed}，跳过{skipped}，共{total}）"
                 )
-                duration_ms = int((time.monotonic() - start) * 1000)
-                record_agent_run(
+                duration_ms = (time.perf_counter_ns() - start) // 1_000_000
+                self._record(
                     agent_name=agent_name,
                     status="failed" if errors else "success",
-                    result=f"single mode executed {processed}, skipped {skipped}, total {len(context.watchlist)}",
+                    result=f"single mode executed {processed}, skipped {skipped}, total {total}",
                     error="; ".join(errors),
                     duration_ms=duration_ms,
                 )
             else:
                 result = await agent.run(context)
-                duration_ms = int((time.monotonic() - start) * 1000)
+                duration_ms = (time.perf_counter_ns() - start) // 1_000_000
                 notify_error = ""
                 try:
                     notify_error = (result.raw_data or {}).get("notify_error") or ""
                 except Exception:
                     notify_error = ""
-                record_agent_run(
+                self._record(
                     agent_name=agent_name,
                     status="failed" if notify_error else "success",
                     result=(result.content or "")[:2000],
@@ -134,21 +208,103 @@ class AgentScheduler:
             logger.info(f"[调度] Agent 执行完成: {agent.display_name}")
         except Exception as e:
             logger.error(f"Agent [{agent_name}] 调度执行异常: {e}", exc_info=True)
-            duration_ms = int((time.monotonic() - start) * 1000)
-            record_agent_run(
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
+            self._record(
                 agent_name=agent_name,
                 status="failed",
                 error=str(e),
                 duration_ms=duration_ms,
             )
+        finally:
+            # 单只模式的各股票 context 共用同一组客户端，统一在此关闭一次
+            if context is not None:
+                await context.aclose()
+
+    def _record(self, **record) -> None:
+        """记录运行结果：优先投递到后台队列，未启动或队列已满时直接写库"""
+        if self._writer_task is not None and not self._writer_task.done():
+            try:
+                self._record_queue.put_nowait(record)
+                return
+            except asyncio.QueueFull:
+                pass
+        record_agent_run(**record)
+
+    def _start_record_writer(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        running = _running_loop()
+        loop = loop or running
+        if loop is None:
+            return  # 无事件循环：_record 退化为同步写入
+        self._loop = loop
+        if loop is running:
+            self._create_record_writer()
+        else:
+            # 在其他线程中启动（如线程池中的 reload_scheduler）：到目标事件循环内创建任务
+            loop.call_soon_threadsafe(self._create_record_writer)
+
+    def _create_record_writer(self) -> None:
+        self._record_queue = asyncio.Queue(maxsize=_RECORD_QUEUE_SIZE)
+        self._writer_task = self._loop.create_task(self._drain_records())
+
+    async def _drain_records(self) -> None:
+        """后台写入任务：攒批后在线程中单事务提交"""
+        queue = self._record_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _RECORD_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await asyncio.to_thread(record_agent_runs, batch)
+            except Exception as e:
+                logger.warning(f"批量写入 AgentRun 失败: {e}")
+
+    def _flush_records(self) -> None:
+        """停止写入任务，并把队列中剩余记录同步写入"""
+        loop = self._loop
+        if loop is not None and loop is not _running_loop() and loop.is_running():
+            # 取消任务与读取 asyncio.Queue 都不是线程安全的，交由事件循环线程执行
+            async def _stop() -> list[dict]:
+                return self._stop_record_writer()
+
+            try:
+                pending = asyncio.run_coroutine_threadsafe(_stop(), loop).result(
+                    timeout=_FLUSH_TIMEOUT
+                )
+            except Exception as e:
+                logger.warning(f"停止运行记录写入任务失败: {e}")
+                pending = []
+        else:
+            pending = self._stop_record_writer()
+        record_agent_runs(pending)
+
+    def _stop_record_writer(self) -> list[dict]:
+        """取消写入任务并取出队列中的剩余记录（须在事件循环线程中调用）"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        pending: list[dict] = []
+        while self._record_queue is not None and not self._record_queue.empty():
+            pending.append(self._record_queue.get_nowait())
+        return pending
 
     async def trigger_now(self, agent_name: str):
         """立即执行某个 Agent（手动触发）"""
         await self._run_agent(agent_name)
 
-    def start(self):
-        """启动调度器"""
+    def start(self, loop: asyncio.AbstractEventLoop | None = None):
+        """
+        启动调度器。
+
+        Args:
+            loop: 调度器运行的事件循环；在事件循环外（如线程池）启动时必须传入
+        """
+        if loop is not None and loop is not _running_loop():
+            self.scheduler.configure(event_loop=loop)
         self.scheduler.start()
+        self._start_record_writer(loop)
         logger.info(f"调度器已启动，已注册 {len(self.agents)} 个 Agent")
 
         # 打印所有已注册的任务
@@ -159,4 +315,5 @@ class AgentScheduler:
     def shutdown(self):
         """关闭调度器"""
         self.scheduler.shutdown()
+        self._flush_records()
         logger.info("调度器已关闭")
@@ -1,39 +1,171 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Coroutine
 
 from src.collectors.akshare_collector import AkshareCollector
+from src.collectors.capital_flow_collector import CapitalFlowCollector
+from src.collectors.events_collector import EventsCollector
 from src.collectors.kline_collector import KlineCollector
-from src.collectors.news_collector import NewsCollector, NewsItem
+from src.collectors.news_collector import NewsCollector
 from src.models.market import MarketCode
 from src.models.market import StockData
+from src.web.database import SessionLocal
+from src.web.models import DataSource
 
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent blocking per-symbol fetches (kline / capital flow)
+_MAX_CONCURRENT_FETCHES = 8
 
-@dataclass(frozen=True)
+# (source_type, default_providers) -> (cached_at, (providers, disabled))
+_POLICY_CACHE_TTL = 30.0
+_policy_cache: dict[
+    tuple[str, tuple[str, ...]], tuple[float, tuple[list[tuple[str, dict]], bool]]
+] = {}
+
+# Cross-run data cache TTLs (seconds) by kind; only successful fetches are shared.
+_SHARED_CACHE_TTLS = {
+    "quote": 15.0,
+    "kline": 300.0,
+    "capital_flow": 120.0,
+    "events": 600.0,
+}
+
+
+class _TTLCache:
+    """Process-wide (value, source) store with per-kind TTL."""
+
+    def __init__(self, ttls: dict[str, float], maxsize: int = 4096):
+        self._ttls = ttls
+        self._maxsize = maxsize
+        self._data: OrderedDict[tuple, tuple[float, object, str]] = OrderedDict()
+
+    def get(self, kind: str, key) -> tuple[object, str] | None:
+        k = (kind, key)
+        item = self._data.get(k)
+        if item is None:
+            return None
+        expires_at, value, source = item
+        if time.monotonic() >= expires_at:
+            self._data.pop(k, None)
+            return None
+        return value, source
+
+    def set(self, kind: str, key, value, source: str) -> None:
+        ttl = self._ttls.get(kind, 0)
+        if ttl <= 0:
+            return
+        k = (kind, key)
+        self._data[k] = (time.monotonic() + ttl, value, source)
+        self._data.move_to_end(k)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_shared_cache = _TTLCache(_SHARED_CACHE_TTLS)
+
+# (kind, key) -> future of the fetch currently running for it
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+async def _coalesced(key: tuple, coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run `coro` unless an identical fetch is already in flight; then await that.
+
+    Lets concurrent builders (e.g. agents firing on the same tick) share one
+    upstream call per key. No lock needed: get/set happen without an await.
+    """
+
+    loop = asyncio.get_running_loop()
+    fut = _inflight.get(key)
+    if fut is not None and fut.get_loop() is loop:
+        coro.close()
+        return await asyncio.shield(fut)
+
+    fut = loop.create_future()
+    _inflight[key] = fut
+    try:
+        result = await coro
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved when nobody else is waiting
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+
+# Max news / events items kept per symbol in a pack
+_PACK_ITEMS_LIMIT = 5
+
+
+def _top_items_by_symbol(
+    entries, symbol_set: frozenset[str], limit: int = _PACK_ITEMS_LIMIT
+) -> dict[str, list[dict]]:
+    """Bucket (symbols, entry) pairs by symbol, keeping the top `limit` per symbol.
+
+    Ranked by importance, then time; ties keep the earlier entry. Each bucket is
+    a bounded heap so it never grows beyond `limit`.
+    """
+
+    heaps: dict[str, list[tuple[tuple, dict]]] = {}
+    for seq, (syms, entry) in enumerate(entries):
+        rank = (entry.get("importance") or 0, entry.get("time") or "", -seq)
+        for sym in syms:
+            if sym not in symbol_set:
+                continue
+            heap = heaps.setdefault(sym, [])
+            if len(heap) < limit:
+                heapq.heappush(heap, (rank, entry))
+            elif rank > heap[0][0]:
+                heapq.heapreplace(heap, (rank, entry))
+    return {
+        sym: [entry for _, entry in sorted(heap, key=lambda x: x[0], reverse=True)]
+        for sym, heap in heaps.items()
+    }
+
+
+@dataclass(frozen=True, slots=True)
 class PositionSnapshot:
     has_position: bool
-    accounts: list[dict] = field(default_factory=list)
+    accounts: tuple[dict, ...] | list[dict] = field(default_factory=list)
     aggregated: dict | None = None
 
 
-@dataclass(frozen=True)
+# Shared snapshot for symbols without a position (immutable: empty accounts tuple)
+_EMPTY_POSITION = PositionSnapshot(has_position=False, accounts=())
+
+
+@dataclass(frozen=True, slots=True)
 class NewsSnapshot:
     hours: int
     items: list[dict] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EventsSnapshot:
     days: int
     items: list[dict] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SignalPack:
     symbol: str
     name: str
@@ -52,19 +184,25 @@ class SignalPack:
 class SignalPackBuilder:
     """Build structured inputs for agents.
 
-    This is an in-memory per-run cache to reduce repeated network calls.
+    Per-run dicts keep one build consistent; successful quote/kline/flow/events
+    results are also kept in a process-wide TTL cache so later runs (and other
+    agents) can reuse them.
     """
 
-    def __init__(self):
+    def __init__(self, cache: _TTLCache | None = None):
+        self._shared = cache if cache is not None else _shared_cache
         self._quote_cache: dict[tuple[MarketCode, str], StockData | None] = {}
         self._quote_source_cache: dict[tuple[MarketCode, str], str] = {}
         self._tech_cache: dict[tuple[MarketCode, str], dict] = {}
         self._tech_source_cache: dict[tuple[MarketCode, str], str] = {}
-        self._news_cache: dict[tuple[str, int], list[NewsItem]] = {}
+        # (symbols, packed entry); entries are formatted once and shared by symbol
+        self._news_cache: dict[
+            tuple[frozenset[str], int], list[tuple[list[str], dict]]
+        ] = {}
         self._flow_cache: dict[tuple[MarketCode, str], dict] = {}
         self._flow_source_cache: dict[tuple[MarketCode, str], str] = {}
-        self._events_cache: dict[tuple[str, int], list[dict]] = {}
-        self._events_source_cache: dict[tuple[str, int], str] = {}
+        self._events_cache: dict[tuple[frozenset[str], int], list[dict]] = {}
+        self._events_source_cache: dict[tuple[frozenset[str], int], str] = {}
 
     @staticmethod
     def _source_policy(
@@ -75,12 +213,17 @@ class SignalPackBuilder:
         - If DB has no sources of this type: use defaults.
         - If DB has sources but all are disabled: disabled=True.
         - If some enabled: return them ordered by priority.
+
+        Results are cached for a short TTL; see invalidate_source_policy().
         """
 
-        try:
-            from src.web.database import SessionLocal
-            from src.web.models import DataSource
+        key = (source_type, tuple(default_providers))
+        cached = _policy_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _POLICY_CACHE_TTL:
+            providers, disabled = cached[1]
+            return list(providers), disabled
 
+        try:
             db = SessionLocal()
             try:
                 total = (
@@ -89,25 +232,133 @@ class SignalPackBuilder:
                     .count()
                 )
                 if total == 0:
-                    return [(p, {}) for p in default_providers], False
-                enabled = (
-                    db.query(DataSource)
-                    .filter(DataSource.type == source_type, DataSource.enabled == True)
-                    .order_by(DataSource.priority)
-                    .all()
-                )
-                if not enabled:
-                    return [], True
-                return [
-                    ((r.provider or "").strip(), (r.config or {}))
-                    for r in enabled
-                    if (r.provider or "").strip()
-                ], False
+                    policy = [(p, {}) for p in default_providers], False
+                else:
+                    enabled = (
+                        db.query(DataSource)
+                        .filter(
+                            DataSource.type == source_type, DataSource.enabled == True
+                        )
+                        .order_by(DataSource.priority)
+                        .all()
+                    )
+                    policy = [
+                        ((r.provider or "").strip(), (r.config or {}))
+                        for r in enabled
+                        if (r.provider or "").strip()
+                    ], not enabled
             finally:
                 db.close()
         except Exception:
             return [(p, {}) for p in default_providers], False
 
+        _policy_cache[key] = (time.monotonic(), policy)
+        return list(policy[0]), policy[1]
+
+    @classmethod
+    def invalidate_source_policy(cls) -> None:
+        """Drop cached source policies and shared data (call after DataSource writes)."""
+        _policy_cache.clear()
+        _shared_cache.clear()
+
+    def _from_shared(self, kind: str, key, cache: dict, source_cache: dict) -> bool:
+        hit = self._shared.get(kind, key)
+        if hit is None:
+            return False
+        cache[key], source_cache[key] = hit
+        return True
+
+    def _to_shared(self, kind: str, key, value, source: str) -> None:
+        if value is None or source in ("disabled", "unavailable"):
+            return
+        if isinstance(value, dict) and value.get("error"):
+            return
+        self._shared.set(kind, key, value, source)
+
+    @staticmethod
+    async def _fetch_market_quotes(
+        market: MarketCode,
+        symbols: list[str],
+        providers: list[tuple[str, dict]],
+    ) -> dict[str, tuple[StockData, str]]:
+        """Fetch quotes of one market, trying providers in order.
+
+        Returns {symbol: (quote, provider)} for symbols that were found.
+        """
+
+        got: dict[str, tuple[StockData, str]] = {}
+        remaining = set(symbols)
+        for provider, cfg in providers:
+            if not remaining:
+                break
+            try:
+                if provider == "tencent":
+                    collector = AkshareCollector(market)
+                else:
+                    logger.info(f"SignalPack quote 未支持 provider={provider}，跳过")
+                    continue
+
+                stocks = await collector.get_stock_data(sorted(remaining))
+                for sd in stocks:
+                    if sd and sd.symbol in remaining:
+                        got[sd.symbol] = (sd, provider)
+                        remaining.discard(sd.symbol)
+            except Exception as e:
+                logger.warning(
+                    f"SignalPack quotes 采集失败({market.value},{provider}): {e}"
+                )
+                continue
+        return got
+
+    @staticmethod
+    async def _fetch_summary(
+        sem: asyncio.Semaphore,
+        providers: list[tuple[str, dict]],
+        *,
+        kind: str,
+        supported: str,
+        fetch: Callable[[], dict],
+        fallback_error: str,
+    ) -> tuple[dict, str]:
+        """Try providers in order; the blocking fetch runs in a worker thread.
+
+        Returns (summary, source).
+        """
+
+        last_err = None
+        async with sem:
+            for provider, cfg in providers:
+                if provider != supported:
+                    logger.info(f"SignalPack {kind} 未支持 provider={provider}，跳过")
+                    continue
+                try:
+                    return await asyncio.to_thread(fetch), provider
+                except Exception as e:
+                    last_err = e
+        return {
+            "error": str(last_err) if last_err else fallback_error
+        }, "unavailable"
+
+    def _store_summary(
+        self,
+        kind: str,
+        cache: dict,
+        source_cache: dict,
+        key,
+        result: tuple[dict, str] | BaseException,
+    ) -> None:
+        if isinstance(result, BaseException):
+            cache[key] = {"error": str(result)}
+            source_cache.setdefault(key, "unavailable")
+            return
+        summary, source = result
+        cache[key] = summary
+        if source == "unavailable":
+            source_cache.setdefault(key, source)
+        else:
+            source_cache[key] = source
+            self._to_shared(kind, key, summary, source)
+
     @staticmethod
     def _now_iso() -> str:
         return datetime.now(timezone.utc).isoformat()
@@ -137,7 +388,7 @@ class SignalPackBuilder:
         """
 
         computed_at = self._now_iso()
-        symbol_set = {s for s, _, _ in symbols}
+        symbol_set = frozenset(s for s, _, _ in symbols)
 
         quote_providers, quote_disabled = self._source_policy(
             "quote", default_providers=["tencent"]
@@ -159,48 +410,44 @@ class SignalPackBuilder:
             by_market.setdefault(market, []).append((sym, name))
 
         quote_map: dict[str, StockData | None] = {}
+        missing_by_market: dict[MarketCode, list[str]] = {}
         for market, items in by_market.items():
-            missing = [s for s, _ in items if (market, s) not in self._quote_cache]
-            if missing:
-                if quote_disabled:
-                    for sym in missing:
-                        self._quote_cache[(market, sym)] = None
-                        self._quote_source_cache[(market, sym)] = "disabled"
+            missing = [
+                s
+                for s, _ in items
+                if (market, s) not in self._quote_cache
+                and not self._from_shared(
+                    "quote", (market, s), self._quote_cache, self._quote_source_cache
+                )
+            ]
+            if not missing:
+                continue
+            if quote_disabled:
+                for sym in missing:
+                    self._quote_cache[(market, sym)] = None
+                    self._quote_source_cache[(market, sym)] = "disabled"
+            else:
+                missing_by_market[market] = missing
+
+        results = await asyncio.gather(
+            *(
+                self._fetch_market_quotes(market, missing, quote_providers)
+                for market, missing in missing_by_market.items()
+            ),
+            return_exceptions=True,
+        )
+        for (market, missing), res in zip(missing_by_market.items(), results):
+            got = res if isinstance(res, dict) else {}
+            for sym in missing:
+                key = (market, sym)
+                if sym in got:
+                    self._quote_cache[key], self._quote_source_cache[key] = got[sym]
+                    self._to_shared("quote", key, *got[sym])
                 else:
-                    remaining = set(missing)
-                    for provider, cfg in quote_providers:
-                        if not remaining:
-                            break
-                        try:
-                            if provider == "tencent":
-                                collector = AkshareCollector(market)
-                            else:
-                                logger.info(
-                                    f"SignalPack quote 未支持 provider={provider}，跳过"
-                                )
-                                continue
-
-                            stocks = await collector.get_stock_data(sorted(remaining))
-                            got = {s.symbol: s for s in stocks}
-                            for sym in list(remaining):
-                                sd = got.get(sym)
-                                if not sd:
-                                    continue
-                                self._quote_cache[(market, sym)] = sd
-                                self._quote_source_cache[(market, sym)] = provider
-                                remaining.discard(sym)
-                        except Exception as e:
-                            logger.warning(
-                                f"SignalPack quotes 采集失败({market.value},{provider}): {e}"
-                            )
-                            continue
-
-                    for sym in remaining:
-                        self._quote_cache[(market, sym)] = None
-                        self._quote_source_cache.setdefault(
-                            (market, sym), "unavailable"
-                        )
+                    self._quote_cache[key] = None
+                    self._quote_source_cache.setdefault(key, "unavailable")
 
+        for market, items in by_market.items():
             for sym, _ in items:
                 quote_map[sym] = self._quote_cache.get((market, sym))
                 if (
@@ -209,49 +456,58 @@ class SignalPackBuilder:
                 ):
                     self._quote_source_cache[(market, sym)] = "cache"
 
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+
         # 2) Technical
         tech_map: dict[str, dict | None] = {}
         if include_technical:
+            pending: dict[tuple[MarketCode, str], str] = {}
+            for sym, market, _ in symbols:
+                key = (market, sym)
+                if key in self._tech_cache or key in pending:
+                    continue
+                if kline_disabled:
+                    self._tech_cache[key] = {"error": "K线数据源已禁用"}
+                    self._tech_source_cache[key] = "disabled"
+                elif not self._from_shared(
+                    "kline", key, self._tech_cache, self._tech_source_cache
+                ):
+                    pending[key] = sym
+
+            results = await asyncio.gather(
+                *(
+                    _coalesced(
+                        ("kline", key),
+                        self._fetch_summary(
+                            sem,
+                            kline_providers,
+                            kind="kline",
+                            supported="tencent",
+                            fetch=partial(
+                                KlineCollector(key[0]).get_kline_summary, sym
+                            ),
+                            fallback_error="获取K线失败",
+                        ),
+                    )
+                    for key, sym in pending.items()
+                ),
+                return_exceptions=True,
+            )
+            for key, res in zip(pending, results):
+                self._store_summary(
+                    "kline", self._tech_cache, self._tech_source_cache, key, res
+                )
+
             for sym, market, _ in symbols:
                 key = (market, sym)
-                if key not in self._tech_cache:
-                    if kline_disabled:
-                        self._tech_cache[key] = {"error": "K线数据源已禁用"}
-                        self._tech_source_cache[key] = "disabled"
-                    else:
-                        last_err = None
-                        for provider, cfg in kline_providers:
-                            try:
-                                if provider == "tencent":
-                                    collector = KlineCollector(market)
-                                else:
-                                    logger.info(
-                                        f"SignalPack kline 未支持 provider={provider}，跳过"
-                                    )
-                                    continue
-                                self._tech_cache[key] = collector.get_kline_summary(sym)
-                                self._tech_source_cache[key] = provider
-                                last_err = None
-                                break
-                            except Exception as e:
-                                last_err = e
-                                continue
-                        if key not in self._tech_cache:
-                            self._tech_cache[key] = {
-                                "error": str(last_err) if last_err else "获取K线失败"
-                            }
-                            self._tech_source_cache.setdefault(key, "unavailable")
                 tech_map[sym] = self._tech_cache[key]
-                if key in self._tech_cache and key not in self._tech_source_cache:
+                if key not in self._tech_source_cache:
                     self._tech_source_cache[key] = "cache"
 
         # 3) News
         news_by_symbol: dict[str, list[dict]] = {}
         if include_news:
-            key = (
-                ",".join(sorted(symbol_set)),
-                int(news_hours),
-            )
+            key = (symbol_set, int(news_hours))
             if key not in self._news_cache:
                 try:
                     collector = NewsCollector.from_database()
@@ -259,26 +515,25 @@ class SignalPackBuilder:
                         symbols=sorted(symbol_set),
                         since_hours=news_hours,
                     )
-                    self._news_cache[key] = all_news
+                    self._news_cache[key] = [
+                        (
+                            it.symbols or [],
+                            {
+                                "source": it.source,
+                                "external_id": it.external_id,
+                                "title": it.title,
+                                "time": it.publish_time.strftime("%Y-%m-%d %H:%M"),
+                                "importance": it.importance,
+                                "url": it.url,
+                            },
+                        )
+                        for it in all_news
+                    ]
                 except Exception as e:
                     logger.warning(f"SignalPack news 采集失败: {e}")
                     self._news_cache[key] = []
 
-            for it in self._news_cache[key]:
-                # attach to each symbol
-                for sym in it.symbols or []:
-                    if sym not in symbol_set:
-                        continue
-                    news_by_symbol.setdefault(sym, []).append(
-                        {
-                            "source": it.source,
-                            "external_id": it.external_id,
-                            "title": it.title,
-                            "time": it.publish_time.strftime("%Y-%m-%d %H:%M"),
-                            "importance": it.importance,
-                            "url": it.url,
-                        }
-                    )
+            news_by_symbol = _top_items_by_symbol(self._news_cache[key], symbol_set)
 
         # 4) Capital flow (CN only)
         flow_map: dict[str, dict] = {}
@@ -293,57 +548,68 @@ class SignalPackBuilder:
                         flow_map[sym] = self._flow_cache[key]
                 else:
                     try:
-                        from src.collectors.capital_flow_collector import (
-                            CapitalFlowCollector,
+                        collector = CapitalFlowCollector(MarketCode.CN)
+                        pending = [
+                            sym
+                            for sym in dict.fromkeys(cn_symbols)
+                            if (MarketCode.CN, sym) not in self._flow_cache
+                            and not self._from_shared(
+                                "capital_flow",
+                                (MarketCode.CN, sym),
+                                self._flow_cache,
+                                self._flow_source_cache,
+                            )
+                        ]
+                        results = await asyncio.gather(
+                            *(
+                                _coalesced(
+                                    ("capital_flow", (MarketCode.CN, sym)),
+                                    self._fetch_summary(
+                                        sem,
+                                        flow_providers,
+                                        kind="capital_flow",
+                                        supported="eastmoney",
+                                        fetch=partial(
+                                            collector.get_capital_flow_summary, sym
+                                        ),
+                                        fallback_error="获取资金流向失败",
+                                    ),
+                                )
+                                for sym in pending
+                            ),
+                            return_exceptions=True,
                         )
+                        for sym, res in zip(pending, results):
+                            self._store_summary(
+                                "capital_flow",
+                                self._flow_cache,
+                                self._flow_source_cache,
+                                (MarketCode.CN, sym),
+                                res,
+                            )
 
-                        collector = CapitalFlowCollector(MarketCode.CN)
                         for sym in cn_symbols:
                             key = (MarketCode.CN, sym)
-                            if key in self._flow_cache:
-                                flow_map[sym] = self._flow_cache[key]
-                                if key not in self._flow_source_cache:
-                                    self._flow_source_cache[key] = "cache"
-                                continue
-
-                            last_err = None
-                            for provider, cfg in flow_providers:
-                                try:
-                                    if provider != "eastmoney":
-                                        logger.info(
-                                            f"SignalPack capital_flow 未支持 provider={provider}，跳过"
-                                        )
-                                        continue
-                                    self._flow_cache[key] = (
-                                        collector.get_capital_flow_summary(sym)
-                                    )
-                                    self._flow_source_cache[key] = provider
-                                    last_err = None
-                                    break
-                                except Exception as e:
-                                    last_err = e
-                                    continue
-
-                            if key not in self._flow_cache:
-                                self._flow_cache[key] = {
-                                    "error": str(last_err)
-                                    if last_err
-                                    else "获取资金流向失败"
-                                }
-                                self._flow_source_cache.setdefault(key, "unavailable")
                             flow_map[sym] = self._flow_cache[key]
+                            if key not in self._flow_source_cache:
+                                self._flow_source_cache[key] = "cache"
                     except Exception as e:
                         logger.warning(f"SignalPack capital_flow 采集失败: {e}")
 
         # 5) Events
         events_by_symbol: dict[str, list[dict]] = {}
-        events_key = (",".join(sorted(symbol_set)), int(events_days))
+        events_key = (symbol_set, int(events_days))
         if include_events:
             if events_key not in self._events_cache:
                 if events_disabled:
                     self._events_cache[events_key] = []
                     self._events_source_cache[events_key] = "disabled"
-                else:
+                elif not self._from_shared(
+                    "events",
+                    events_key,
+                    self._events_cache,
+                    self._events_source_cache,
+                ):
                     last_err = None
                     used_provider = ""
                     for provider, cfg in events_providers:
@@ -353,8 +619,6 @@ class SignalPackBuilder:
                             )
                             continue
                         try:
-                            from src.collectors.events_collector import EventsCollector
-
                             collector = EventsCollector.from_database()
                             items = await collector.fetch_all(
                                 symbols=sorted(symbol_set),
@@ -381,6 +645,9 @@ class SignalPackBuilder:
                             self._events_cache[events_key] = packed
                             used_provider = provider
                             self._events_source_cache[events_key] = used_provider
+                            self._to_shared(
+                                "events", events_key, packed, used_provider
+                            )
                             last_err = None
                             break
                         except Exception as e:
@@ -392,40 +659,63 @@ class SignalPackBuilder:
                         self._events_cache[events_key] = []
                         self._events_source_cache[events_key] = "unavailable"
 
-            for it in self._events_cache.get(events_key, []):
-                for sym in it.get("symbols") or []:
-                    if sym not in symbol_set:
-                        continue
-                    events_by_symbol.setdefault(sym, []).append(it)
+            events_by_symbol = _top_items_by_symbol(
+                (
+                    (it.get("symbols") or [], it)
+                    for it in self._events_cache.get(events_key, [])
+                ),
+                symbol_set,
+            )
+
+        # 6) Position (bulk lookup; per-symbol fallback for other portfolio types)
+        pos_by_sym: dict[str, list] | None = None
+        agg_by_sym: dict[str, dict | None] = {}
+        try:
+            sym_list = [s for s, _, _ in symbols]
+            pos_by_sym = portfolio.get_positions_bulk(sym_list)
+            agg_by_sym = portfolio.get_aggregated_positions_bulk(sym_list)
+        except Exception:
+            pos_by_sym = None
 
-        # 6) Position
         packs: dict[str, SignalPack] = {}
         for sym, market, name in symbols:
             pos_list = []
-            try:
-                pos_list = portfolio.get_positions_for_stock(sym)
-            except Exception:
-                pos_list = []
-
-            accounts = []
-            for p in pos_list:
+            if pos_by_sym is not None:
+                pos_list = pos_by_sym.get(sym) or []
+            else:
                 try:
-                    accounts.append(
-                        {
-                            "account_name": getattr(p, "account_name", ""),
-                            "cost_price": getattr(p, "cost_price", None),
-                            "quantity": getattr(p, "quantity", None),
-                            "trading_style": getattr(p, "trading_style", ""),
-                        }
-                    )
+                    pos_list = portfolio.get_positions_for_stock(sym)
                 except Exception:
-                    continue
+                    pos_list = []
+
+            if not pos_list:
+                position = _EMPTY_POSITION
+            else:
+                accounts = []
+                for p in pos_list:
+                    try:
+                        accounts.append(
+                            {
+                                "account_name": getattr(p, "account_name", ""),
+                                "cost_price": getattr(p, "cost_price", None),
+                                "quantity": getattr(p, "quantity", None),
+                                "trading_style": getattr(p, "trading_style", ""),
+                            }
+                        )
+                    except Exception:
+                        continue
 
-            aggregated = None
-            try:
-                aggregated = portfolio.get_aggregated_position(sym)
-            except Exception:
                 aggregated = None
+                if pos_by_sym is not None:
+                    aggregated = agg_by_sym.get(sym)
+                else:
+                    try:
+                        aggregated = portfolio.get_aggregated_position(sym)
+                    except Exception:
+                        aggregated = None
+                position = PositionSnapshot(
+                    has_position=True, accounts=accounts, aggregated=aggregated
+                )
 
             missing: list[str] = []
             if quote_map.get(sym) is None:
@@ -452,13 +742,9 @@ class SignalPackBuilder:
                 computed_at=computed_at,
                 quote=quote_map.get(sym),
                 technical=tech_map.get(sym) if include_technical else None,
-                position=PositionSnapshot(
-                    has_position=bool(pos_list),
-                    accounts=accounts,
-                    aggregated=aggregated,
-                ),
+                position=position,
                 news=NewsSnapshot(
-                    hours=news_hours, items=news_by_symbol.get(sym, [])[:5]
+                    hours=news_hours, items=news_by_symbol.get(sym, [])
                 )
                 if include_news
                 else None,
@@ -466,7 +752,7 @@ class SignalPackBuilder:
                 if (include_capital_flow and market == MarketCode.CN)
                 else None,
                 events=EventsSnapshot(
-                    days=int(events_days), items=events_by_symbol.get(sym, [])[:5]
+                    days=int(events_days), items=events_by_symbol.get(sym, [])
                 )
                 if include_events
                 else None,
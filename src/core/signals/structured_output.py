@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import json
+import re
+
+from src.core import fast_json
 
 
 ALLOWED_ACTIONS = {
@@ -22,6 +24,11 @@ ACTION_ALIASES = {
 TAG_START = "<!--PANWATCH_JSON-->"
 TAG_END = "<!--/PANWATCH_JSON-->"
 
+# ```json\n...\n``` (fence lines may carry a language tag / trailing text)
+_FENCED_RE = re.compile(r"^```[^\n]*\n(?P<body>.*)\n[ \t]*```[^\n]*$", re.DOTALL)
+# A bare "json" first line without code fences.
+_JSON_PREFIX_RE = re.compile(r"^json[ \t]*\r?\n", re.IGNORECASE)
+
 
 def try_parse_action_json(text: str) -> dict | None:
     """Parse JSON-only output. Returns dict on success."""
@@ -31,21 +38,20 @@ def try_parse_action_json(text: str) -> dict | None:
 
     # Allow fenced code blocks (```json ... ```)
     if raw.startswith("```"):
-        lines = raw.splitlines()
-        if len(lines) >= 3 and lines[0].lstrip().startswith("```"):
-            if lines[-1].strip().startswith("```"):
-                raw = "\n".join(lines[1:-1]).strip()
-        else:
+        m = _FENCED_RE.match(raw)
+        if m:
+            raw = m.group("body").strip()
+        elif raw.count("\n") < 2:
             raw = raw.strip("`").strip()
     # Allow "json" prefix line without code fences.
     # Example:
     # json
     # {"action":"buy", ...}
-    lines = raw.splitlines()
-    if lines and lines[0].strip().lower() == "json":
-        raw = "\n".join(lines[1:]).strip()
+    m = _JSON_PREFIX_RE.match(raw)
+    if m:
+        raw = raw[m.end() :].strip()
     try:
-        obj = json.loads(raw)
+        obj = fast_json.loads(raw)
     except Exception:
         return None
     if not isinstance(obj, dict):
@@ -70,18 +76,18 @@ def try_extract_tagged_json(
     <!--/PANWATCH_JSON-->
     """
 
-    raw = text or ""
-    i = raw.rfind(start)
-    if i < 0:
+    head, sep, tail = (text or "").rpartition(end)
+    # a start tag after the last end tag means the block is unterminated
+    if not sep or start in tail:
         return None
-    j = raw.rfind(end)
-    if j < 0 or j <= i:
+    _, sep, payload = head.rpartition(start)
+    if not sep:
         return None
-    payload = raw[i + len(start) : j].strip()
+    payload = payload.strip()
     if not payload:
         return None
     try:
-        obj = json.loads(payload)
+        obj = fast_json.loads(payload)
     except Exception:
         return None
     return obj if isinstance(obj, dict) else None
@@ -90,10 +96,10 @@ def try_extract_tagged_json(
 def strip_tagged_json(text: str, *, start: str = TAG_START, end: str = TAG_END) -> str:
     """Remove tagged JSON block from text (if present)."""
     raw = text or ""
-    i = raw.rfind(start)
-    if i < 0:
+    head, sep, tail = raw.rpartition(end)
+    if not sep or start in tail:
         return raw
-    j = raw.rfind(end)
-    if j < 0 or j <= i:
+    pre, sep, _ = head.rpartition(start)
+    if not sep:
         return raw
-    return (raw[:i] + raw[j + len(end) :]).strip()
+    return (pre + tail).strip()
@@ -1,13 +1,19 @@
 """建议池管理 - 汇总各 Agent 建议"""
 
+import atexit
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
-from datetime import timezone
+
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import aliased, raiseload
 
 from src.web.database import SessionLocal
 from src.web.models import StockSuggestion
-from src.core.timezone import utc_now, to_iso_with_tz
+from src.core.timezone import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +48,364 @@ AGENT_LABELS = {
     "news_digest": "新闻速递",
 }
 
+
+@dataclass(slots=True)
+class _LatestSuggestion:
+    """(股票, Agent) 最新一条建议的去重快照
+
+    action/action_label/signal 在写入快照时已规范化空白，比较时只需规范化新值。
+    """
+
+    id: int | None  # 尚在写入缓冲中时为 None
+    action: str
+    action_label: str
+    signal: str
+    created_at: datetime  # UTC
+    expires_at: datetime | None
+    stock_name: str
+    row: dict | None = None  # 缓冲中的待写入行，落库后置 None
+
+
+# 进程内去重缓存：命中时无需查询数据库；重启后首次保存回源查询
+_LAST_SUGGESTION: dict[tuple[str, str], _LatestSuggestion] = {}
+_last_lock = threading.Lock()
+
+# 新建议写入缓冲：攒够一批或超过时间阈值后单事务批量写入
+_FLUSH_BATCH_SIZE = 50
+_FLUSH_INTERVAL_SECONDS = 2.0
+_pending: list[_LatestSuggestion] = []
+_flush_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+
+
+def flush_pending_suggestions() -> int:
+    """将缓冲中的新建议批量写入数据库（单事务），返回写入条数
+
+    读取接口在查询前会先调用，保证写入后立即可读。
+    """
+    global _flush_timer
+    with _flush_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if not _pending:
+            return 0
+        batch = _pending[:]
+        _pending.clear()
+        symbols = {item.row["stock_symbol"] for item in batch}
+
+        db = SessionLocal()
+        try:
+            ids = (
+                db.execute(
+                    insert(StockSuggestion).returning(
+                        StockSuggestion.id, sort_by_parameter_order=True
+                    ),
+                    [item.row for item in batch],
+                )
+                .scalars()
+                .all()
+            )
+            db.commit()
+        except Exception as e:
+            logger.error(f"批量保存建议失败({len(batch)} 条): {e}")
+            db.rollback()
+            # 丢弃失败批次对应的去重快照，下次保存时回源查询
+            failed = {id(item) for item in batch}
+            with _last_lock:
+                for key, item in list(_LAST_SUGGESTION.items()):
+                    if id(item) in failed:
+                        del _LAST_SUGGESTION[key]
+            for item in batch:
+                item.row = None
+            return 0
+        finally:
+            db.close()
+
+        for item, suggestion_id in zip(batch, ids):
+            item.id = suggestion_id
+            item.row = None
+    _invalidate_latest_cache(symbols)
+    return len(batch)
+
+
+def _enqueue(item: _LatestSuggestion) -> None:
+    global _flush_timer
+    with _flush_lock:
+        _pending.append(item)
+        full = len(_pending) >= _FLUSH_BATCH_SIZE
+        if not full and _flush_timer is None:
+            _flush_timer = threading.Timer(
+                _FLUSH_INTERVAL_SECONDS, flush_pending_suggestions
+            )
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    if full:
+        flush_pending_suggestions()
+
+
+atexit.register(flush_pending_suggestions)
+
+
+# 去重所需的短字段，避免加载 prompt_context/ai_response 等大文本和 ORM 实例化
+_LATEST_COLUMNS = (
+    StockSuggestion.id,
+    StockSuggestion.action,
+    StockSuggestion.action_label,
+    StockSuggestion.signal,
+    StockSuggestion.created_at,
+    StockSuggestion.expires_at,
+    StockSuggestion.stock_name,
+)
+
+
+def _to_snapshot(row) -> _LatestSuggestion | None:
+    if not row or not row.created_at:
+        return None
+    return _LatestSuggestion(
+        id=row.id,
+        action=_norm_text(row.action),
+        action_label=_norm_text(row.action_label),
+        signal=_norm_text(row.signal),
+        created_at=row.created_at,
+        expires_at=row.expires_at,
+        stock_name=row.stock_name or "",
+    )
+
+
+def _load_latest(db, stock_symbol: str, agent_name: str) -> _LatestSuggestion | None:
+    latest = db.execute(
+        select(*_LATEST_COLUMNS)
+        .where(
+            StockSuggestion.stock_symbol == stock_symbol,
+            StockSuggestion.agent_name == agent_name,
+        )
+        .order_by(StockSuggestion.created_at.desc(), StockSuggestion.id.desc())
+        .limit(1)
+    ).first()
+    return _to_snapshot(latest)
+
+
+def _prefetch_latest(db, keys: set[tuple[str, str]]) -> set[tuple[str, str]]:
+    """一次查询预取多个 (股票, Agent) 的最新建议写入去重缓存，返回已查询的键"""
+    with _last_lock:
+        missing = [key for key in keys if key not in _LAST_SUGGESTION]
+    if not missing:
+        return set()
+    ranked = (
+        select(
+            *_LATEST_COLUMNS,
+            StockSuggestion.stock_symbol,
+            StockSuggestion.agent_name,
+            func.row_number()
+            .over(
+                partition_by=(StockSuggestion.stock_symbol, StockSuggestion.agent_name),
+                order_by=(StockSuggestion.created_at.desc(), StockSuggestion.id.desc()),
+            )
+            .label("rn"),
+        )
+        .where(tuple_(StockSuggestion.stock_symbol, StockSuggestion.agent_name).in_(missing))
+        .subquery()
+    )
+    rows = db.execute(select(ranked).where(ranked.c.rn == 1)).all()
+    with _last_lock:
+        for row in rows:
+            latest = _to_snapshot(row)
+            if latest is not None:
+                _LAST_SUGGESTION.setdefault((row.stock_symbol, row.agent_name), latest)
+    return set(missing)
+
+
+# 会话中已执行、待提交的延期 UPDATE：[(快照, 新值)]，提交成功后才写回快照
+_EXTENDS_KEY = "suggestion_pool.extends"
+
+
+def _commit(db) -> int:
+    """提交会话，并把已落库的延期写回去重快照；返回生效的延期条数"""
+    extends = db.info.pop(_EXTENDS_KEY, [])
+    if not extends:
+        return 0
+    db.commit()
+    for latest, values in extends:
+        latest.expires_at = values.get("expires_at", latest.expires_at)
+        latest.stock_name = values.get("stock_name", latest.stock_name)
+    return len(extends)
+
+
+def _rollback(db) -> None:
+    """回滚会话并丢弃未提交的延期（快照保持与数据库一致）"""
+    db.info.pop(_EXTENDS_KEY, None)
+    db.rollback()
+
+
+def _extend_latest(
+    db, latest: _LatestSuggestion, expires_at: datetime, stock_name: str
+) -> bool:
+    """延长已有建议的有效期（必要时补全股票名称）
+
+    已落库的建议执行单条 UPDATE，返回 True 表示有待调用方 _commit 的写入；
+    快照在提交成功后才更新，回滚不会留下未落库的有效期。
+    """
+    values = {}
+    if not latest.expires_at or latest.expires_at < expires_at:
+        values["expires_at"] = expires_at
+    if not latest.stock_name and stock_name:
+        values["stock_name"] = stock_name
+    if not values:
+        return False
+    with _flush_lock:
+        if latest.row is not None:
+            # 仍在写入缓冲中：直接合并到待写入行，随批次一起落库
+            latest.row.update(values)
+            latest.expires_at = values.get("expires_at", latest.expires_at)
+            latest.stock_name = values.get("stock_name", latest.stock_name)
+            return False
+    # 有效期只增不减、名称只补不改：在 SQL 中取较大值，并发写入时不会互相覆盖
+    sql_values = {}
+    if "expires_at" in values:
+        sql_values["expires_at"] = case(
+            (StockSuggestion.expires_at > expires_at, StockSuggestion.expires_at),
+            else_=expires_at,
+        )
+    if "stock_name" in values:
+        sql_values["stock_name"] = func.coalesce(
+            func.nullif(StockSuggestion.stock_name, ""), stock_name
+        )
+    db.execute(
+        update(StockSuggestion)
+        .where(StockSuggestion.id == latest.id)
+        .values(**sql_values)
+    )
+    db.info.setdefault(_EXTENDS_KEY, []).append((latest, values))
+    return True
+
+
+def _save_one(
+    db,
+    *,
+    lookup: bool = True,
+    stock_symbol: str,
+    stock_name: str,
+    action: str,
+    action_label: str,
+    agent_name: str,
+    signal: str = "",
+    reason: str = "",
+    agent_label: str = "",
+    expires_hours: Optional[int] = None,
+    prompt_context: str = "",
+    ai_response: str = "",
+    meta: dict | None = None,
+) -> tuple[str, _LatestSuggestion | None]:
+    """去重并写入一条建议，返回 (结果, 快照)
+
+    结果：queued=新建议进入写入缓冲；extended=已执行延期 UPDATE，待调用方 _commit；
+    kept=去重命中且无需写库。
+    lookup=False 表示该键已批量预取过，缓存未命中即视为无历史建议。
+    """
+    # 计算过期时间（使用 UTC）
+    if expires_hours is None:
+        expires_hours = AGENT_EXPIRY_HOURS.get(agent_name, 8)
+
+    now = utc_now()
+    expires_at = now + timedelta(hours=expires_hours)
+
+    # Agent 标签
+    if not agent_label:
+        agent_label = AGENT_LABELS.get(agent_name, agent_name)
+
+    # Dedupe: if the latest suggestion from the same agent is essentially the same,
+    # do not create a new row. This prevents "AI 建议反复" in the UI.
+    cache_key = (stock_symbol, agent_name)
+    try:
+        with _last_lock:
+            latest = _LAST_SUGGESTION.get(cache_key)
+        if latest is None and lookup:
+            latest = _load_latest(db, stock_symbol, agent_name)
+            if latest is not None:
+                with _last_lock:
+                    _LAST_SUGGESTION.setdefault(cache_key, latest)
+
+        if latest:
+            latest_created = latest.created_at
+
+            window = timedelta(minutes=_dedupe_window_minutes(agent_name))
+            same_key = (
+                latest.action == _norm_text(action)
+                and latest.action_label == _norm_text(action_label)
+                and latest.signal == _norm_text(signal)
+            )
+
+            if same_key and (now - latest_created) <= window:
+                # Extend expiry (keep the first message to avoid churn).
+                dirty = _extend_latest(db, latest, expires_at, stock_name)
+                logger.info(
+                    f"建议去重: {stock_symbol} {action_label} (来源: {agent_label})"
+                )
+                return ("extended" if dirty else "kept"), latest
+
+            # Stability: avoid flip-flopping to a less severe action within a short window.
+            try:
+                action_rank = {
+                    "alert": 4,
+                    "avoid": 4,
+                    "sell": 4,
+                    "reduce": 3,
+                    "buy": 2,
+                    "add": 2,
+                    "hold": 1,
+                    "watch": 0,
+                }
+                old_r = action_rank.get(latest.action, 0)
+                new_r = action_rank.get((action or "").strip(), 0)
+                change_window = timedelta(
+                    minutes=_dedupe_window_minutes(agent_name)
+                )
+                if (now - latest_created) <= change_window and new_r < old_r:
+                    # Keep the previous (more severe) action; extend expiry.
+                    dirty = _extend_latest(db, latest, expires_at, stock_name)
+                    logger.info(
+                        f"建议稳定: {stock_symbol} 新建议降级({action_label})，保持上一条({latest.action_label})"
+                    )
+                    return ("extended" if dirty else "kept"), latest
+            except Exception:
+                _rollback(db)
+    except Exception:
+        # Best-effort only; never block saving.
+        _rollback(db)
+
+    # 创建新建议（进入写入缓冲，批量落库）
+    item = _LatestSuggestion(
+        id=None,
+        action=_norm_text(action),
+        action_label=_norm_text(action_label),
+        signal=_norm_text(signal),
+        created_at=now,
+        expires_at=expires_at,
+        stock_name=stock_name or "",
+        row={
+            "stock_symbol": stock_symbol,
+            "stock_name": stock_name,
+            "action": action,
+            "action_label": action_label,
+            "signal": signal,
+            "reason": reason,
+            "agent_name": agent_name,
+            "agent_label": agent_label,
+            "expires_at": expires_at,
+            "prompt_context": prompt_context[:2000] if prompt_context else "",  # 限制长度
+            "ai_response": ai_response[:2000] if ai_response else "",  # 限制长度
+            "meta": meta or {},
+        },
+    )
+    _enqueue(item)
+    with _last_lock:
+        _LAST_SUGGESTION[cache_key] = item
+
+    logger.info(f"保存建议: {stock_symbol} {action_label} (来源: {agent_label})")
+    return "queued", item
+
+
 def save_suggestion(
     stock_symbol: str,
     stock_name: str,
@@ -77,117 +441,88 @@ def save_suggestion(
     """
     db = SessionLocal()
     try:
-        # 计算过期时间（使用 UTC）
-        if expires_hours is None:
-            expires_hours = AGENT_EXPIRY_HOURS.get(agent_name, 8)
-
-        now = utc_now()
-        expires_at = now + timedelta(hours=expires_hours)
-
-        # Agent 标签
-        if not agent_label:
-            agent_label = AGENT_LABELS.get(agent_name, agent_name)
-
-        # Dedupe: if the latest suggestion from the same agent is essentially the same,
-        # do not create a new row. This prevents "AI 建议反复" in the UI.
-        try:
-            latest = (
-                db.query(StockSuggestion)
-                .filter(
-                    StockSuggestion.stock_symbol == stock_symbol,
-                    StockSuggestion.agent_name == agent_name,
-                )
-                .order_by(StockSuggestion.created_at.desc(), StockSuggestion.id.desc())
-                .first()
-            )
-
-            if latest and latest.created_at:
-                latest_created = latest.created_at
-                if latest_created.tzinfo is None:
-                    latest_created = latest_created.replace(tzinfo=timezone.utc)
-
-                window = timedelta(minutes=_dedupe_window_minutes(agent_name))
-                same_key = (
-                    _norm_text(latest.action) == _norm_text(action)
-                    and _norm_text(latest.action_label) == _norm_text(action_label)
-                    and _norm_text(latest.signal or "") == _norm_text(signal)
-                )
-
-                if same_key and (now - latest_created) <= window:
-                    # Extend expiry (keep the first message to avoid churn).
-                    if not latest.expires_at or latest.expires_at < expires_at:
-                        latest.expires_at = expires_at
-                    if not (latest.stock_name or "") and stock_name:
-                        latest.stock_name = stock_name
-                    db.commit()
-                    logger.info(
-                        f"建议去重: {stock_symbol} {action_label} (来源: {agent_label})"
-                    )
-                    return True
-
-                # Stability: avoid flip-flopping to a less severe action within a short window.
-                try:
-                    action_rank = {
-                        "alert": 4,
-                        "avoid": 4,
-                        "sell": 4,
-                        "reduce": 3,
-                        "buy": 2,
-                        "add": 2,
-                        "hold": 1,
-                        "watch": 0,
-                    }
-                    old_r = action_rank.get((latest.action or "").strip(), 0)
-                    new_r = action_rank.get((action or "").strip(), 0)
-                    change_window = timedelta(
-                        minutes=_dedupe_window_minutes(agent_name)
-                    )
-                    if (now - latest_created) <= change_window and new_r < old_r:
-                        # Keep the previous (more severe) action; extend expiry.
-                        if not latest.expires_at or latest.expires_at < expires_at:
-                            latest.expires_at = expires_at
-                        if not (latest.stock_name or "") and stock_name:
-                            latest.stock_name = stock_name
-                        db.commit()
-                        logger.info(
-                            f"建议稳定: {stock_symbol} 新建议降级({action_label})，保持上一条({latest.action_label})"
-                        )
-                        return True
-                except Exception:
-                    db.rollback()
-        except Exception:
-            # Best-effort only; never block saving.
-            db.rollback()
-
-        # 创建新建议
-        suggestion = StockSuggestion(
+        outcome, _ = _save_one(
+            db,
             stock_symbol=stock_symbol,
             stock_name=stock_name,
             action=action,
             action_label=action_label,
+            agent_name=agent_name,
             signal=signal,
             reason=reason,
-            agent_name=agent_name,
             agent_label=agent_label,
-            expires_at=expires_at,
-            prompt_context=prompt_context[:2000] if prompt_context else "",  # 限制长度
-            ai_response=ai_response[:2000] if ai_response else "",  # 限制长度
-            meta=meta or {},
+            expires_hours=expires_hours,
+            prompt_context=prompt_context,
+            ai_response=ai_response,
+            meta=meta,
         )
-        db.add(suggestion)
-        db.commit()
-
-        logger.info(f"保存建议: {stock_symbol} {action_label} (来源: {agent_label})")
+        if outcome == "extended":
+            _commit(db)
+            _invalidate_latest_cache({stock_symbol})
         return True
-
     except Exception as e:
         logger.error(f"保存建议失败: {e}")
-        db.rollback()
+        _rollback(db)
         return False
     finally:
         db.close()
 
 
+def save_suggestions(items: list[dict]) -> int:
+    """
+    批量保存 Agent 建议：一次查询预取各 (股票, Agent) 最新建议，单事务提交
+
+    Args:
+        items: save_suggestion 的关键字参数列表
+
+    Returns:
+        实际落库（或去重命中无需写库）的条数
+    """
+    if not items:
+        return 0
+    kept = extended = 0
+    queued: list[_LatestSuggestion] = []
+    queried: set[tuple[str, str]] = set()
+    db = SessionLocal()
+    try:
+        try:
+            queried = _prefetch_latest(
+                db, {(item["stock_symbol"], item["agent_name"]) for item in items}
+            )
+        except Exception as e:
+            logger.warning(f"预取最新建议失败: {e}")
+            _rollback(db)
+
+        for item in items:
+            try:
+                key = (item["stock_symbol"], item["agent_name"])
+                outcome, latest = _save_one(db, lookup=key not in queried, **item)
+            except Exception as e:
+                logger.error(f"保存建议失败 {item.get('stock_symbol')}: {e}")
+                continue
+            if outcome == "queued":
+                queued.append(latest)
+            elif outcome == "kept":
+                kept += 1
+        # 中途回滚过的延期已从会话中丢弃，这里只统计真正提交的
+        extended = _commit(db)
+        if extended:
+            _invalidate_latest_cache({item["stock_symbol"] for item in items})
+    except Exception as e:
+        logger.error(f"批量保存建议失败: {e}")
+        _rollback(db)
+        extended = 0
+    finally:
+        db.close()
+    flush_pending_suggestions()
+    # 写入缓冲落库成功后快照会拿到 id
+    return kept + extended + sum(1 for item in queued if item.id is not None)
+
+
+# 列表查询每批拉取的行数
+_YIELD_PER = 200
+
+
 def get_suggestions_for_stock(
     stock_symbol: str,
     include_expired: bool = False,
@@ -204,10 +539,14 @@ def get_suggestions_for_stock(
     Returns:
         建议列表，按时间倒序
     """
+    flush_pending_suggestions()
     db = SessionLocal()
     try:
-        query = db.query(StockSuggestion).filter(
-            StockSuggestion.stock_symbol == stock_symbol
+        # raiseload：_to_dict 只读列字段，禁止隐式懒加载关联（避免 N+1）
+        query = (
+            db.query(StockSuggestion)
+            .options(raiseload("*"))
+            .filter(StockSuggestion.stock_symbol == stock_symbol)
         )
 
         now = utc_now()
@@ -217,16 +556,32 @@ def get_suggestions_for_stock(
                 | (StockSuggestion.expires_at > now)
             )
 
-        suggestions = (
-            query.order_by(StockSuggestion.created_at.desc()).limit(limit).all()
-        )
-
-        return [_to_dict(s, now) for s in suggestions]
+        query = query.order_by(StockSuggestion.created_at.desc()).limit(limit)
+        return [_to_dict(s, now) for s in query.yield_per(_YIELD_PER)]
 
     finally:
         db.close()
 
 
+# 最新建议查询缓存：首页/持仓页高频轮询，短 TTL + 写入时按股票失效
+_LATEST_CACHE_TTL_SECONDS = 5.0
+_LATEST_CACHE_MAXSIZE = 64
+_latest_cache: dict[tuple[frozenset[str] | None, bool], tuple[float, dict]] = {}
+_latest_cache_lock = threading.Lock()
+
+
+def _invalidate_latest_cache(symbols: set[str] | None) -> None:
+    """失效包含指定股票（None 表示全部）的最新建议缓存"""
+    with _latest_cache_lock:
+        if symbols is None:
+            _latest_cache.clear()
+            return
+        for key in list(_latest_cache):
+            key_symbols = key[0]
+            if key_symbols is None or not key_symbols.isdisjoint(symbols):
+                del _latest_cache[key]
+
+
 def get_latest_suggestions(
     stock_symbols: Optional[list[str]] = None,
     include_expired: bool = False,
@@ -241,78 +596,61 @@ def get_latest_suggestions(
     Returns:
         {symbol: suggestion_dict}
     """
+    flush_pending_suggestions()
+    cache_key = (frozenset(stock_symbols) if stock_symbols else None, include_expired)
+    now_ts = time.monotonic()
+    with _latest_cache_lock:
+        hit = _latest_cache.get(cache_key)
+        if hit and now_ts - hit[0] <= _LATEST_CACHE_TTL_SECONDS:
+            return dict(hit[1])
+
     db = SessionLocal()
     try:
-        # 使用子查询获取每只股票的最新建议
-        from sqlalchemy import func
-
-        # 先获取每只股票最新建议的 ID
-        subquery = (
-            db.query(
-                StockSuggestion.stock_symbol,
-                func.max(StockSuggestion.id).label("max_id"),
+        # 窗口函数按股票分区取 id 最大的一条，单次扫描 (stock_symbol, id DESC) 索引
+        ranked = select(
+            StockSuggestion,
+            func.row_number()
+            .over(
+                partition_by=StockSuggestion.stock_symbol,
+                order_by=StockSuggestion.id.desc(),
             )
-            .group_by(StockSuggestion.stock_symbol)
-            .subquery()
-        )
-
-        query = db.query(StockSuggestion).join(
-            subquery,
-            (StockSuggestion.stock_symbol == subquery.c.stock_symbol)
-            & (StockSuggestion.id == subquery.c.max_id),
+            .label("rn"),
         )
-
         if stock_symbols:
-            query = query.filter(StockSuggestion.stock_symbol.in_(stock_symbols))
+            ranked = ranked.where(StockSuggestion.stock_symbol.in_(stock_symbols))
+        ranked = ranked.subquery()
+        latest = aliased(StockSuggestion, ranked)
+
+        query = db.query(latest).options(raiseload("*")).filter(ranked.c.rn == 1)
 
         now = utc_now()
         if not include_expired:
             query = query.filter(
-                (StockSuggestion.expires_at == None)
-                | (StockSuggestion.expires_at > now)
+                (latest.expires_at == None) | (latest.expires_at > now)
             )
 
-        suggestions = query.all()
-
-        return {s.stock_symbol: _to_dict(s, now) for s in suggestions}
-
+        # 分批取行并即时转换，避免先物化全部 ORM 对象再转换
+        result = {s.stock_symbol: _to_dict(s, now) for s in query.yield_per(_YIELD_PER)}
     finally:
         db.close()
 
+    with _latest_cache_lock:
+        if len(_latest_cache) >= _LATEST_CACHE_MAXSIZE:
+            _latest_cache.pop(next(iter(_latest_cache)))
+        _latest_cache[cache_key] = (now_ts, result)
+    return dict(result)
+
 
 def _to_dict(suggestion: StockSuggestion, now: Optional[datetime] = None) -> dict:
-    """将 StockSuggestion 转换为字典（时间使用 ISO 格式带时区）"""
+    """将 StockSuggestion 转换为字典（时间使用 ISO 格式带时区）
+
+    时间列读出即为带时区的 UTC 时间（UTCDateTime），无需逐行补时区。
+    """
     if now is None:
         now = utc_now()
 
-    is_expired = False
-    if suggestion.expires_at:
-        # 确保比较时都使用 UTC
-        expires_utc = suggestion.expires_at
-        if expires_utc.tzinfo is None:
-            from src.core.timezone import timezone
-
-            expires_utc = expires_utc.replace(tzinfo=timezone.utc)
-        is_expired = expires_utc < now
-
-    # 转换时间为带时区的 ISO 格式
-    created_at_str = None
-    if suggestion.created_at:
-        created_at = suggestion.created_at
-        if created_at.tzinfo is None:
-            from src.core.timezone import timezone
-
-            created_at = created_at.replace(tzinfo=timezone.utc)
-        created_at_str = to_iso_with_tz(created_at)
-
-    expires_at_str = None
-    if suggestion.expires_at:
-        expires_at = suggestion.expires_at
-        if expires_at.tzinfo is None:
-            from src.core.timezone import timezone
-
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        expires_at_str = to_iso_with_tz(expires_at)
+    created_at = suggestion.created_at
+    expires_at = suggestion.expires_at
 
     return {
         "id": suggestion.id,
@@ -324,9 +662,9 @@ def _to_dict(suggestion: StockSuggestion, now: Optional[datetime] = None) -> dic
         "reason": suggestion.reason,
         "agent_name": suggestion.agent_name,
         "agent_label": suggestion.agent_label,
-        "created_at": created_at_str,
-        "expires_at": expires_at_str,
-        "is_expired": is_expired,
+        "created_at": created_at.isoformat() if created_at else None,
+        "expires_at": expires_at.isoformat() if expires_at else None,
+        "is_expired": bool(expires_at and expires_at < now),
         "prompt_context": suggestion.prompt_context or "",
         "ai_response": suggestion.ai_response or "",
         "meta": suggestion.meta or {},
@@ -335,9 +673,13 @@ def _to_dict(suggestion: StockSuggestion, now: Optional[datetime] = None) -> dic
     }
 
 
+# 清理时每批删除的行数，保持单个事务短小
+_CLEANUP_BATCH_SIZE = 10000
+
+
 def cleanup_expired_suggestions(days: int = 7) -> int:
     """
-    清理过期的建议记录
+    清理过期的建议记录（按 id 分批 DELETE，每批单独提交）
 
     Args:
         days: 清理多少天前的记录
@@ -345,20 +687,48 @@ def cleanup_expired_suggestions(days: int = 7) -> int:
     Returns:
         删除的记录数
     """
+    flush_pending_suggestions()
     db = SessionLocal()
+    total = 0
     try:
         cutoff = utc_now() - timedelta(days=days)
-        result = (
-            db.query(StockSuggestion)
-            .filter(StockSuggestion.created_at < cutoff)
-            .delete()
+        batch_ids = (
+            select(StockSuggestion.id)
+            .where(StockSuggestion.created_at < cutoff)
+            .order_by(StockSuggestion.id)
+            .limit(_CLEANUP_BATCH_SIZE)
         )
-        db.commit()
-        logger.info(f"清理了 {result} 条过期建议")
-        return result
+        stmt = (
+            delete(StockSuggestion)
+            .where(StockSuggestion.id.in_(batch_ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        while True:
+            deleted = db.execute(stmt).rowcount
+            db.commit()
+            total += deleted
+            if deleted < _CLEANUP_BATCH_SIZE:
+                break
+        logger.info(f"清理了 {total} 条过期建议")
+        return total
     except Exception as e:
         logger.error(f"清理过期建议失败: {e}")
         db.rollback()
-        return 0
+        return total
     finally:
         db.close()
+        if total:
+            _forget_deleted_suggestions()
+
+
+def _forget_deleted_suggestions() -> None:
+    """删除记录后清理依赖旧行的缓存
+
+    去重快照可能指向已删除的行（延长有效期会 UPDATE 不存在的 id，新建议被吞掉），
+    因此丢弃所有已落库的快照；仍在写入缓冲中的快照保留。
+    """
+    with _last_lock:
+        for key, item in list(_LAST_SUGGESTION.items()):
+            if item.row is None:
+                del _LAST_SUGGESTION[key]
+    _invalidate_latest_cache(None)
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
@@ -24,6 +25,8 @@ _SCAN_CACHE_TTL_SECONDS = {
     False: 12.0,  # quick scan
     True: 25.0,   # AI scan
 }
+# 盘中扫描 AI 分析的最大并发请求数
+_SCAN_AI_CONCURRENCY = 8
 
 
 def _build_scan_cache_key(analyze: bool, watchlist) -> str:
@@ -175,9 +178,6 @@ class AgentConfigResponse(BaseModel):
     notify_channel_ids: list[int]
     config: dict
 
-    class Config:
-        from_attributes = True
-
 
 class AgentRunResponse(BaseModel):
     id: int
@@ -194,11 +194,27 @@ class AgentRunResponse(BaseModel):
 
 @router.get("", response_model=list[AgentConfigResponse])
 def list_agents(db: Session = Depends(get_db)):
-    agents = db.query(AgentConfig).all()
-    return [_agent_to_response(a) for a in agents]
-
-
-def _agent_to_response(agent: AgentConfig) -> dict:
+    # 只查询响应所需的列，不实例化 ORM 对象
+    rows = db.execute(select(*_AGENT_RESPONSE_COLUMNS)).all()
+    return [_agent_to_response(row) for row in rows]
+
+
+_AGENT_RESPONSE_COLUMNS = (
+    AgentConfig.id,
+    AgentConfig.name,
+    AgentConfig.display_name,
+    AgentConfig.description,
+    AgentConfig.enabled,
+    AgentConfig.schedule,
+    AgentConfig.execution_mode,
+    AgentConfig.ai_model_id,
+    AgentConfig.notify_channel_ids,
+    AgentConfig.config,
+)
+
+
+def _agent_to_response(agent) -> dict:
+    """AgentConfig 实例或同名列的查询行 -> 响应字典"""
     return {
         "id": agent.id,
         "name": agent.name,
@@ -213,14 +229,23 @@ def _agent_to_response(agent: AgentConfig) -> dict:
     }
 
 
-@router.put("/{agent_name}", response_model=AgentConfigResponse)
-def update_agent(
-    agent_name: str, update: AgentConfigUpdate, db: Session = Depends(get_db)
-):
+def get_agent(agent_name: str, db: Session = Depends(get_db)) -> AgentConfig:
+    """路由依赖：按名称加载 Agent 配置，不存在时返回 404
+
+    与处理函数共用同一请求内的 db 会话（FastAPI 按请求缓存依赖）。
+    """
     agent = db.query(AgentConfig).filter(AgentConfig.name == agent_name).first()
     if not agent:
         raise HTTPException(404, f"Agent {agent_name} 不存在")
+    return agent
 
+
+@router.put("/{agent_name}", response_model=AgentConfigResponse)
+def update_agent(
+    update: AgentConfigUpdate,
+    agent: AgentConfig = Depends(get_agent),
+    db: Session = Depends(get_db),
+):
     for key, value in update.model_dump(exclude_unset=True).items():
         setattr(agent, key, value)
 
@@ -249,14 +274,9 @@ def preview_schedule_expr(schedule: str, count: int = 5):
 
 
 @router.get("/{agent_name}/schedule/preview")
-def preview_agent_schedule(
-    agent_name: str, count: int = 5, db: Session = Depends(get_db)
-):
+def preview_agent_schedule(count: int = 5, agent: AgentConfig = Depends(get_agent)):
     """预览某个 Agent 接下来几次的触发时间（按调度时区）"""
     tz = Settings().app_timezone or "UTC"
-    agent = db.query(AgentConfig).filter(AgentConfig.name == agent_name).first()
-    if not agent:
-        raise HTTPException(404, f"Agent {agent_name} 不存在")
     if not agent.schedule:
         return {"schedule": "", "timezone": tz, "next_runs": []}
 
@@ -273,11 +293,11 @@ def preview_agent_schedule(
 
 
 @router.delete("/{agent_name}")
-def delete_agent(agent_name: str, db: Session = Depends(get_db)):
+def delete_agent(
+    agent: AgentConfig = Depends(get_agent), db: Session = Depends(get_db)
+):
     """删除 Agent 配置"""
-    agent = db.query(AgentConfig).filter(AgentConfig.name == agent_name).first()
-    if not agent:
-        raise HTTPException(404, f"Agent {agent_name} 不存在")
+    agent_name = agent.name
 
     # 删除关联的 stock_agents 记录
     from src.web.models import StockAgent
@@ -290,11 +310,9 @@ def delete_agent(agent_name: str, db: Session = Depends(get_db)):
 
 
 @router.post("/{agent_name}/trigger")
-async def trigger_agent_endpoint(agent_name: str, db: Session = Depends(get_db)):
+async def trigger_agent_endpoint(agent: AgentConfig = Depends(get_agent)):
     """手动触发 Agent 执行"""
-    agent = db.query(AgentConfig).filter(AgentConfig.name == agent_name).first()
-    if not agent:
-        raise HTTPException(404, f"Agent {agent_name} 不存在")
+    agent_name = agent.name
     if not agent.enabled:
         raise HTTPException(400, f"Agent {agent_name} 未启用")
 
@@ -363,7 +381,7 @@ async def scan_intraday(analyze: bool = False, db: Session = Depends(get_db)):
     from src.models.market import MarketCode, MARKETS
     from src.agents.intraday_monitor import IntradayMonitorAgent
     from src.core.analysis_history import get_latest_analysis, get_analysis
-    from src.core.suggestion_pool import save_suggestion
+    from src.core.suggestion_pool import save_suggestions
 
     agent_name = "intraday_monitor"
     agent_cfg = db.query(AgentConfig).filter(AgentConfig.name == agent_name).first()
@@ -511,71 +529,75 @@ async def scan_intraday(analyze: bool = False, db: Session = Depends(get_db)):
 
     # AI 分析
     if analyze and results:
+        context = None
         try:
             context = build_context(agent_name)
             agent = monitor_agent
 
-            ai_sem = asyncio.Semaphore(3)
+            ai_sem = asyncio.Semaphore(_SCAN_AI_CONCURRENCY)
+            pool_items: list[dict] = []
 
             async def _analyze_item(item: dict):
                 try:
+                    stock_data = quote_by_symbol.get(item["symbol"])
+                    if not stock_data:
+                        return
+
+                    data = {
+                        "stock_data": stock_data,
+                        "stocks": [stock_data],
+                        "kline_summary": item["kline"],
+                        "daily_analysis": daily_analysis.content
+                        if daily_analysis
+                        else None,
+                        "premarket_analysis": premarket_analysis.content
+                        if premarket_analysis
+                        else None,
+                    }
+
+                    # 事件门禁仅保留为上下文信息，不阻断 AI 分析。
+                    # 产品策略：建议持续更新，通知层再做去重与降噪。
+                    try:
+                        if getattr(agent, "event_only", False):
+                            from src.core.intraday_event_gate import check_and_update
+
+                            decision = check_and_update(
+                                symbol=item["symbol"],
+                                change_pct=item.get("change_pct"),
+                                volume_ratio=(item.get("kline") or {}).get(
+                                    "volume_ratio"
+                                ),
+                                kline_summary=item.get("kline"),
+                                price_threshold=getattr(
+                                    agent, "price_alert_threshold", 3.0
+                                ),
+                                volume_threshold=getattr(
+                                    agent, "volume_alert_ratio", 2.0
+                                ),
+                            )
+                            data["event_gate"] = {
+                                "reasons": decision.reasons,
+                                "should_analyze": bool(decision.should_analyze),
+                            }
+                    except Exception:
+                        pass
+
+                    system_prompt, user_content = agent.build_prompt(data, context)
+                    # 仅对 AI 调用限流，行情/门禁等准备工作不占并发名额
                     async with ai_sem:
-                        stock_data = quote_by_symbol.get(item["symbol"])
-                        if not stock_data:
-                            return
-
-                        data = {
-                            "stock_data": stock_data,
-                            "stocks": [stock_data],
-                            "kline_summary": item["kline"],
-                            "daily_analysis": daily_analysis.content
-                            if daily_analysis
-                            else None,
-                            "premarket_analysis": premarket_analysis.content
-                            if premarket_analysis
-                            else None,
-                        }
-
-                        # 事件门禁仅保留为上下文信息，不阻断 AI 分析。
-                        # 产品策略：建议持续更新，通知层再做去重与降噪。
-                        try:
-                            if getattr(agent, "event_only", False):
-                                from src.core.intraday_event_gate import check_and_update
-
-                                decision = check_and_update(
-                                    symbol=item["symbol"],
-                                    change_pct=item.get("change_pct"),
-                                    volume_ratio=(item.get("kline") or {}).get(
-                                        "volume_ratio"
-                                    ),
-                                    kline_summary=item.get("kline"),
-                                    price_threshold=getattr(
-                                        agent, "price_alert_threshold", 3.0
-                                    ),
-                                    volume_threshold=getattr(
-                                        agent, "volume_alert_ratio", 2.0
-                                    ),
-                                )
-                                data["event_gate"] = {
-                                    "reasons": decision.reasons,
-                                    "should_analyze": bool(decision.should_analyze),
-                                }
-                        except Exception:
-                            pass
-
-                        system_prompt, user_content = agent.build_prompt(data, context)
                         response = await context.ai_client.chat(
                             system_prompt, user_content
                         )
 
-                        # 解析结构化建议
-                        suggestion = agent._parse_suggestion(response)
-                        suggestion["raw"] = response.strip()[:200]
+                    # 解析结构化建议
+                    suggestion = agent._parse_suggestion(response)
+                    suggestion["raw"] = response.strip()[:200]
 
-                        item["suggestion"] = suggestion
-                        # 写入建议池（用于持仓页展示），盘中建议固定 6 小时有效
-                        expires_hours = 6
-                        save_suggestion(
+                    item["suggestion"] = suggestion
+                    # 写入建议池（用于持仓页展示），盘中建议固定 6 小时有效
+                    expires_hours = 6
+                    pool_items.append(
+                        dict(
                             stock_symbol=item["symbol"],
                             stock_name=item["name"] or "",
                             action=suggestion.get("action", "watch"),
@@ -601,6 +623,7 @@ async def scan_intraday(analyze: bool = False, db: Session = Depends(get_db)):
                                 "event_gate": data.get("event_gate"),
                             },
                         )
+                    )
                 except Exception as e:
                     item["suggestion"] = {
                         "action": "watch",
@@ -612,9 +635,14 @@ async def scan_intraday(analyze: bool = False, db: Session = Depends(get_db)):
                     logger.error(f"AI 分析失败 {item['symbol']}: {e}")
 
             await asyncio.gather(*[_analyze_item(item) for item in results])
+            # 本次扫描的建议统一批量写入建议池
+            save_suggestions(pool_items)
 
         except Exception as e:
             logger.error(f"构建 Agent 上下文失败: {e}")
+        finally:
+            if context is not None:
+                await context.aclose()
 
     payload = {
         "stocks": results,
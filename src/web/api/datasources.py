@@ -103,6 +103,12 @@ def get_datasource(source_id: int, db: Session = Depends(get_db)):
     return _to_response(source)
 
 
+def _invalidate_sources_cache() -> None:
+    from src.core.signals.signal_pack import SignalPackBuilder
+
+    SignalPackBuilder.invalidate_source_policy()
+
+
 @router.post("")
 def create_datasource(data: DataSourceCreate, db: Session = Depends(get_db)):
     """创建数据源"""
@@ -119,6 +125,7 @@ def create_datasource(data: DataSourceCreate, db: Session = Depends(get_db)):
     db.add(source)
     db.commit()
     db.refresh(source)
+    _invalidate_sources_cache()
     logger.info(f"创建数据源: {source.name} ({source.provider})")
     return _to_response(source)
 
@@ -137,6 +144,7 @@ def update_datasource(
 
     db.commit()
     db.refresh(source)
+    _invalidate_sources_cache()
     logger.info(f"更新数据源: {source.name}")
     return _to_response(source)
 
@@ -150,20 +158,22 @@ def delete_datasource(source_id: int, db: Session = Depends(get_db)):
 
     db.delete(source)
     db.commit()
+    _invalidate_sources_cache()
     logger.info(f"删除数据源: {source.name}")
     return {"ok": True, "message": f"已删除 {source.name}"}
 
 
 @router.post("/{source_id}/test")
-async def test_datasource(source_id: int, db: Session = Depends(get_db)):
+async def test_datasource(source_id: int):
     """测试数据源连接"""
-    source = db.query(DataSource).filter(DataSource.id == source_id).first()
-    if not source:
-        raise HTTPException(status_code=404, detail="数据源不存在")
-
     from src.core.data_collector import get_collector_manager
 
     manager = get_collector_manager()
+    # 只读取测试所需的列（Row），不实例化 ORM 对象
+    source = manager.get_source_by_id(source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="数据源不存在")
+
     manager.clear_logs()
 
     result = await manager.test_source(source)
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
+from src.core.analysis_history import invalidate_analysis_cache
 from src.web.database import get_db
 from src.web.models import AnalysisHistory
 from src.config import Settings
@@ -122,6 +123,8 @@ def delete_history(history_id: int, db: Session = Depends(get_db)):
 
         raise HTTPException(404, "记录不存在")
 
+    agent_name = record.agent_name
     db.delete(record)
     db.commit()
+    invalidate_analysis_cache(agent_name)
     return {"ok": True}
@@ -175,6 +175,7 @@ async def test_model(model_id: int, db: Session = Depends(get_db)):
     if not service:
         raise HTTPException(400, "关联的服务商不存在")
 
+    client = None
     try:
         client = AIClient(
             base_url=service.base_url,
@@ -189,3 +190,6 @@ async def test_model(model_id: int, db: Session = Depends(get_db)):
         return {"ok": True, "reply": reply.strip()}
     except Exception as e:
         raise HTTPException(400, f"测试失败: {e}")
+    finally:
+        if client is not None:
+            await client.aclose()
@@ -49,6 +49,20 @@ def _has_table(conn, table: str) -> bool:
         return False
 
 
+def _has_unique_index(conn, table: str, columns: tuple[str, ...]) -> bool:
+    """表上是否已有覆盖 columns（按顺序）的唯一索引"""
+    for row in conn.execute(text(f"PRAGMA index_list({table})")).fetchall():
+        name, unique = row[1], row[2]
+        if not unique:
+            continue
+        cols = tuple(
+            r[2] for r in conn.execute(text(f"PRAGMA index_info('{name}')")).fetchall()
+        )
+        if cols == columns:
+            return True
+    return False
+
+
 def _migrate(engine):
     """增量 schema 迁移（SQLite ALTER TABLE ADD COLUMN）"""
     migrations = [
@@ -164,6 +178,45 @@ CREATE TABLE IF NOT EXISTS suggestion_feedback (
             )
             conn.commit()
 
+        # 建议池：每只股票最新建议查询（create_all 不会为已有表补建索引）
+        if _has_table(conn, "stock_suggestions"):
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_stock_suggestions_symbol_id_desc "
+                    "ON stock_suggestions(stock_symbol, id DESC);"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_suggestion_symbol_agent_created "
+                    "ON stock_suggestions(stock_symbol, agent_name, created_at DESC, id DESC);"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_suggestion_created_at "
+                    "ON stock_suggestions(created_at);"
+                )
+            )
+            conn.commit()
+
+        # 分析历史：(agent_name, stock_symbol, analysis_date) 唯一索引
+        # 既是 save_analysis upsert 的冲突目标，也供 get_latest_analysis 按日期倒序取最近一条
+        if _has_table(conn, "analysis_history") and not _has_unique_index(
+            conn, "analysis_history", ("agent_name", "stock_symbol", "analysis_date")
+        ):
+            try:
+                conn.execute(
+                    text(
+                        "CREATE UNIQUE INDEX IF NOT EXISTS ix_analysis_agent_symbol_date "
+                        "ON analysis_history(agent_name, stock_symbol, analysis_date);"
+                    )
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"创建 analysis_history 唯一索引失败（可能存在重复记录）: {e}")
+
 
 def _migrate_old_providers(engine):
     """如果存在旧的 ai_providers 表，迁移数据到 ai_services + ai_models"""
@@ -1,3 +1,5 @@
+from datetime import timezone
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -12,10 +14,31 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 
 from src.web.database import Base
 
 
+class UTCDateTime(TypeDecorator):
+    """UTC 时间列：写入时统一转为无时区 UTC 存储，读取时附加 UTC 时区
+
+    SQLite 不保存时区信息，读出的值由此统一为带时区的 UTC 时间。
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class AIService(Base):
     """AI 服务商（base_url + api_key）"""
 
@@ -263,6 +286,8 @@ class AnalysisHistory(Base):
     """分析历史记录（盘后分析、盘前分析等）"""
 
     __tablename__ = "analysis_history"
+    # 唯一约束同时作为 (agent_name, stock_symbol, analysis_date) 复合索引，
+    # 覆盖 get_latest_analysis 的等值 + 日期范围查询及倒序取首条
     __table_args__ = (
         UniqueConstraint(
             "agent_name", "stock_symbol", "analysis_date", name="uq_agent_stock_date"
@@ -312,12 +337,26 @@ class StockSuggestion(Base):
     # 元数据（输入快照/触发原因等）
     meta = Column(JSON, default={})
 
-    # 时间信息
-    created_at = Column(DateTime, server_default=func.now())
-    expires_at = Column(DateTime, nullable=True)  # 建议过期时间
+    # 时间信息（读出即为带时区的 UTC 时间）
+    created_at = Column(UTCDateTime, server_default=func.now())
+    expires_at = Column(UTCDateTime, nullable=True)  # 建议过期时间
 
     # 索引：按股票+时间快速查询
-    __table_args__ = (Index("ix_suggestion_symbol_time", "stock_symbol", "created_at"),)
+    __table_args__ = (
+        Index("ix_suggestion_symbol_time", "stock_symbol", "created_at"),
+        # 每只股票最新建议（窗口函数按 id 倒序取第一条）
+        Index("ix_stock_suggestions_symbol_id_desc", "stock_symbol", id.desc()),
+        # 过期清理按创建时间范围删除
+        Index("ix_suggestion_created_at", "created_at"),
+        # 去重查询：同股票同 Agent 最新一条（索引有序扫描，免排序）
+        Index(
+            "ix_suggestion_symbol_agent_created",
+            "stock_symbol",
+            "agent_name",
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
 
 
 class SuggestionFeedback(Base):
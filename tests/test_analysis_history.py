@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core import analysis_history as ah
+from src.web.database import Base
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(ah, "SessionLocal", factory)
+    monkeypatch.setattr(ah, "_cache", type(ah._cache)())
+    return factory
+
+
+def test_get_analysis_cached_and_invalidated_on_save(session_factory) -> None:
+    day = date(2026, 1, 20)
+    assert ah.get_analysis("daily_report", "*", day) is None
+
+    assert ah.save_analysis("daily_report", "*", "first", analysis_date=day)
+    assert ah.get_analysis("daily_report", "*", day).content == "first"
+
+    assert ah.save_analysis("daily_report", "*", "second", analysis_date=day)
+    assert ah.get_analysis("daily_report", "*", day).content == "second"
+    assert len(ah.get_analysis_history("daily_report")) == 1
+
+
+def test_save_analysis_upsert_keeps_single_row(session_factory) -> None:
+    day = date(2026, 1, 21)
+    assert ah.save_analysis("premarket_outlook", "600519", "a", title="t1", analysis_date=day)
+    assert ah.save_analysis(
+        "premarket_outlook", "600519", "b", title="t2", raw_data={"k": 1}, analysis_date=day
+    )
+
+    db = session_factory()
+    try:
+        rows = db.query(ah.AnalysisHistory).all()
+    finally:
+        db.close()
+    assert len(rows) == 1
+    assert (rows[0].title, rows[0].content, rows[0].raw_data) == ("t2", "b", {"k": 1})
+
+
+def test_delete_history_invalidates_cache(session_factory) -> None:
+    from src.web.api.history import delete_history
+
+    day = date(2026, 1, 22)
+    assert ah.save_analysis("daily_report", "*", "report", analysis_date=day)
+    record = ah.get_latest_analysis("daily_report", "*")
+    assert record is not None
+    assert ah.get_analysis("daily_report", "*", day) is not None
+
+    db = session_factory()
+    try:
+        assert delete_history(record.id, db=db) == {"ok": True}
+    finally:
+        db.close()
+
+    assert ah.get_latest_analysis("daily_report", "*") is None
+    assert ah.get_analysis("daily_report", "*", day) is None
@@ -0,0 +1,52 @@
+import asyncio
+
+from src.agents import chart_analyst as chart_mod
+from src.agents.base import AgentContext
+from src.config import AppConfig, Settings, StockConfig
+from src.models.market import MarketCode
+
+
+class _FakeCollector:
+    instances: list["_FakeCollector"] = []
+
+    def __init__(self):
+        self.closed = 0
+        _FakeCollector.instances.append(self)
+
+    async def capture_batch(self, stocks, period):
+        await asyncio.sleep(0.01)
+        return [s["symbol"] for s in stocks]
+
+    def cleanup_old_screenshots(self, max_age_hours):
+        pass
+
+    async def close(self):
+        self.closed += 1
+
+
+class _NoPacks:
+    async def build_for_symbols(self, **kwargs):
+        return {}
+
+
+def test_concurrent_collect_uses_own_collector(monkeypatch):
+    monkeypatch.setattr(chart_mod, "ScreenshotCollector", _FakeCollector)
+    monkeypatch.setattr(chart_mod, "SignalPackBuilder", _NoPacks)
+    _FakeCollector.instances = []
+
+    agent = chart_mod.ChartAnalystAgent()
+
+    def _context(symbol):
+        stock = StockConfig(symbol=symbol, name=symbol, market=MarketCode.CN)
+        config = AppConfig(settings=Settings(), watchlist=[stock])
+        return AgentContext(ai_client=None, notifier=None, config=config)
+
+    async def main():
+        return await asyncio.gather(
+            agent.collect(_context("000001")), agent.collect(_context("000002"))
+        )
+
+    results = asyncio.run(main())
+
+    assert [r["screenshots"] for r in results] == [["000001"], ["000002"]]
+    assert [c.closed for c in _FakeCollector.instances] == [1, 1]
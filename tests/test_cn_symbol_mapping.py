@@ -17,6 +17,13 @@ class TestCnSymbolMapping(unittest.TestCase):
         self.assertEqual(get_cn_exchange("510300"), "SH")
         self.assertEqual(get_cn_exchange("900901"), "SH")
         self.assertEqual(get_cn_exchange("920001"), "BJ")
+        self.assertEqual(get_cn_exchange("830799"), "BJ")
+        self.assertEqual(get_cn_exchange("871970"), "BJ")
+        self.assertEqual(get_cn_exchange("888888"), "BJ")
+        self.assertEqual(get_cn_exchange("920"), "BJ")
+        self.assertEqual(get_cn_exchange(" 600519 "), "SH")
+        self.assertEqual(get_cn_exchange("000001"), "SZ")
+        self.assertEqual(get_cn_exchange(""), "SZ")
 
     def test_cn_prefix_core(self):
         self.assertEqual(get_cn_prefix("000738"), "sz")
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from src.collectors.news_collector import _fast_parse_dt
+
+
+def test_fast_parse_dt_full_datetime() -> None:
+    assert _fast_parse_dt("2026-01-20 17:19:17") == datetime(2026, 1, 20, 17, 19, 17)
+
+
+def test_fast_parse_dt_date_only_fallback() -> None:
+    assert _fast_parse_dt("2026-01-20") == datetime(2026, 1, 20)
+
+
+def test_fast_parse_dt_invalid() -> None:
+    assert _fast_parse_dt("") is None
+    assert _fast_parse_dt("not a date at all!!") is None
+    assert _fast_parse_dt(None) is None  # type: ignore[arg-type]
+
+
+def test_news_cache_lru_evicts_oldest(monkeypatch) -> None:
+    from collections import OrderedDict
+
+    from src.collectors import news_collector as nc
+
+    monkeypatch.setattr(nc, "_news_cache", OrderedDict())
+    monkeypatch.setattr(nc, "_CACHE_MAX", 2)
+    nc._set_cached("a", [1])
+    nc._set_cached("b", [2])
+    assert nc._get_cached("a") == [1]  # touch a -> b becomes LRU
+    nc._set_cached("c", [3])
+    assert nc._get_cached("b") is None
+    assert nc._get_cached("a") == [1]
+    assert nc._get_cached("c") == [3]
@@ -0,0 +1,72 @@
+import asyncio
+
+from src.core.notifier import (
+    NotifierManager,
+    build_apprise_url,
+    truncate_utf8,
+    truncate_utf16,
+)
+
+
+def test_bark_url_strips_scheme_and_trailing_slash() -> None:
+    assert build_apprise_url("bark", {"device_key": "k"}) == "bark://k/"
+    assert (
+        build_apprise_url("bark", {"device_key": "k", "server_url": "https://api.day.app/"})
+        == "bark://api.day.app/k/"
+    )
+    assert (
+        build_apprise_url("bark", {"device_key": "k", "server_url": "HTTP://bark.local:8080/push"})
+        == "bark://bark.local:8080/push/k/"
+    )
+    assert (
+        build_apprise_url("bark", {"device_key": "k", "server_url": "bark.local"})
+        == "bark://bark.local/k/"
+    )
+
+
+def test_truncate_utf8_keeps_whole_characters() -> None:
+    assert truncate_utf8("abc", 10) == "abc"
+    assert truncate_utf8("中文内容", 7) == "中文"  # 3 bytes per char, no half char
+    assert len(truncate_utf8("中" * 2000, 4096).encode("utf-8")) <= 4096
+
+
+def test_truncate_utf16_counts_code_units() -> None:
+    assert truncate_utf16("中文", 10) == "中文"
+    assert truncate_utf16("a😀b", 2) == "a"  # emoji 占 2 个码元，不拆开代理对
+
+
+def _capture_sends(notifier: NotifierManager) -> dict[str, str]:
+    sent: dict[str, str] = {}
+
+    async def _fake_send(ch_type, config, title, content):
+        sent[ch_type] = content
+
+    notifier._send_custom = _fake_send
+    return sent
+
+
+def test_telegram_limit_counts_characters_not_bytes() -> None:
+    notifier = NotifierManager()
+    notifier.add_channel("telegram", {"bot_token": "t", "chat_id": "1", "proxy": "http://p"})
+    notifier.add_channel("wecom", {"webhook_key": "k"})
+    sent = _capture_sends(notifier)
+    body = "行情" * 1000
+
+    result = asyncio.run(notifier.notify_with_result("日报", body))
+
+    assert result["success"] is True
+    assert sent["telegram"] == body
+    assert sent["wecom"].endswith("…(已截断)")
+    assert len(f"## 日报\n\n{sent['wecom']}".encode("utf-8")) <= 4096
+
+
+def test_telegram_truncation_includes_title_prefix() -> None:
+    notifier = NotifierManager()
+    notifier.add_channel("telegram", {"bot_token": "t", "chat_id": "1", "proxy": "http://p"})
+    sent = _capture_sends(notifier)
+
+    asyncio.run(notifier.notify_with_result("日报", "x" * 5000))
+
+    text = f"*日报*\n\n{sent['telegram']}"
+    assert len(text) == 4096
+    assert text.endswith("…(已截断)")
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+
+from src.agents.base import AgentContext
+from src.config import AppConfig, Settings, StockConfig
+from src.core import scheduler as scheduler_mod
+from src.core.scheduler import AgentScheduler
+from src.models.market import MarketCode
+
+
+class _SlowAgent:
+    name = "slow"
+    display_name = "Slow"
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.seen: list[list[str]] = []
+
+    async def run_single(self, context, symbol):
+        context.config.watchlist = [
+            s for s in context.config.watchlist if s.symbol == symbol
+        ]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.seen.append([s.symbol for s in context.watchlist])
+        self.running -= 1
+        if symbol == "000003":
+            raise RuntimeError("boom")
+        return None
+
+
+def test_single_mode_runs_concurrently_with_isolated_context(monkeypatch):
+    runs: list[dict] = []
+    monkeypatch.setattr(scheduler_mod, "MARKETS", {})
+    monkeypatch.setattr(scheduler_mod, "record_agent_run", lambda **kw: runs.append(kw))
+
+    watchlist = [
+        StockConfig(symbol=f"00000{i}", name="x", market=MarketCode.CN)
+        for i in range(1, 6)
+    ]
+    config = AppConfig(settings=Settings(), watchlist=watchlist)
+    agent = _SlowAgent()
+
+    sched = AgentScheduler()
+    sched.agents[agent.name] = agent
+    sched.execution_modes[agent.name] = "single"
+    sched.execution_max_workers[agent.name] = 2
+    sched.set_context_builder(
+        lambda _name: AgentContext(ai_client=None, notifier=None, config=config)
+    )
+
+    asyncio.run(sched._run_agent(agent.name))
+
+    assert agent.peak == 2
+    assert sorted(agent.seen) == [[s.symbol] for s in watchlist]
+    assert config.watchlist == watchlist
+    assert runs[0]["status"] == "failed"
+    assert "000003: boom" in runs[0]["error"]
+    assert "executed 4" in runs[0]["result"]
+
+
+def test_single_mode_skips_context_when_all_markets_closed(monkeypatch):
+    runs: list[dict] = []
+
+    class _Closed:
+        name = "A股"
+
+        def is_trading_time(self):
+            return False
+
+    monkeypatch.setattr(scheduler_mod, "MARKETS", {MarketCode.CN: _Closed()})
+    monkeypatch.setattr(scheduler_mod, "record_agent_run", lambda **kw: runs.append(kw))
+
+    def _builder(_name):
+        raise AssertionError("context should not be built")
+
+    agent = _SlowAgent()
+    sched = AgentScheduler()
+    sched.agents[agent.name] = agent
+    sched.execution_modes[agent.name] = "single"
+    sched.set_context_builder(_builder)
+
+    asyncio.run(sched._run_agent(agent.name))
+
+    assert runs[0]["status"] == "success"
+    assert "all markets closed" in runs[0]["result"]
+    assert agent.seen == []
+
+
+def test_records_are_batched_and_flushed_on_shutdown(monkeypatch):
+    batches: list[list[dict]] = []
+    monkeypatch.setattr(scheduler_mod, "record_agent_runs", batches.append)
+
+    sched = AgentScheduler()
+
+    async def main():
+        sched._start_record_writer()
+        for i in range(3):
+            sched._record(agent_name="a", status="success", duration_ms=i)
+        await asyncio.sleep(0.05)
+        sched._record(agent_name="a", status="failed")
+        sched._flush_records()
+
+    asyncio.run(main())
+
+    assert [len(b) for b in batches] == [3, 1]
+    assert batches[1][0]["status"] == "failed"
+
+
+def test_context_clients_closed_once_after_single_run(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "MARKETS", {})
+    monkeypatch.setattr(scheduler_mod, "record_agent_run", lambda **kw: None)
+
+    class _Client:
+        closed = 0
+
+        async def aclose(self):
+            self.closed += 1
+
+    client = _Client()
+    notifier = _Client()
+    watchlist = [
+        StockConfig(symbol=f"00000{i}", name="x", market=MarketCode.CN)
+        for i in range(1, 4)
+    ]
+    config = AppConfig(settings=Settings(), watchlist=watchlist)
+    agent = _SlowAgent()
+
+    sched = AgentScheduler()
+    sched.agents[agent.name] = agent
+    sched.execution_modes[agent.name] = "single"
+    sched.set_context_builder(
+        lambda _name: AgentContext(ai_client=client, notifier=notifier, config=config)
+    )
+
+    asyncio.run(sched._run_agent(agent.name))
+
+    assert len(agent.seen) == 3
+    assert client.closed == 1
+    assert notifier.closed == 1
+
+
+def test_reload_from_another_thread_flushes_and_restarts_writer(monkeypatch):
+    written: list[dict] = []
+    monkeypatch.setattr(
+        scheduler_mod, "record_agent_runs", lambda batch: written.extend(batch)
+    )
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def _on_loop(fn):
+        async def _call():
+            return fn()
+
+        return asyncio.run_coroutine_threadsafe(_call(), loop).result(timeout=1)
+
+    try:
+        old = AgentScheduler()
+        _on_loop(old.start)
+        _on_loop(lambda: [old._record(agent_name="a", status="success") for _ in range(5)])
+
+        # 模拟 reload_scheduler 在线程池中执行：关闭旧调度器，在原事件循环上启动新调度器
+        old.shutdown()
+        new = AgentScheduler()
+        new.start(loop=old.loop)
+        time.sleep(0.05)
+        assert new._writer_task is not None and not new._writer_task.done()
+        assert old._writer_task is None
+
+        _on_loop(lambda: new._record(agent_name="b", status="success"))
+        time.sleep(0.05)
+        new.shutdown()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1)
+        loop.close()
+
+    assert sorted(r["agent_name"] for r in written) == ["a"] * 5 + ["b"]
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+
+from src.collectors import screenshot_collector as sc
+
+
+def test_cleanup_old_screenshots_removes_only_expired_png(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(sc, "SCREENSHOT_DIR", tmp_path)
+    old = tmp_path / "old.png"
+    fresh = tmp_path / "fresh.png"
+    other = tmp_path / "old.txt"
+    for p in (old, fresh, other):
+        p.write_bytes(b"x")
+    past = time.time() - 48 * 3600
+    os.utime(old, (past, past))
+    os.utime(other, (past, past))
+
+    sc.ScreenshotCollector().cleanup_old_screenshots(24)
+
+    assert not old.exists()
+    assert fresh.exists()
+    assert other.exists()
+
+
+def test_cleanup_old_screenshots_missing_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(sc, "SCREENSHOT_DIR", tmp_path / "missing")
+    sc.ScreenshotCollector().cleanup_old_screenshots(24)
+
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self):
+        self.pages: list[_FakePage] = []
+        self.closed = False
+
+    async def new_page(self):
+        await asyncio.sleep(0.01)  # 页面创建期间让出事件循环
+        if self.closed:
+            raise RuntimeError("Target closed")
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def storage_state(self):
+        return {}
+
+    async def add_init_script(self, script):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts: list[_FakeContext] = []
+
+    async def new_context(self, **kwargs):
+        ctx = _FakeContext()
+        self.contexts.append(ctx)
+        return ctx
+
+
+def test_recycled_context_waits_for_pages_still_being_created() -> None:
+    collector = sc.ScreenshotCollector(
+        {"max_pages_per_context": 1, "persistent_profile": False}
+    )
+    collector._browser = _FakeBrowser()
+
+    async def main():
+        pages = await asyncio.gather(*(collector._new_page() for _ in range(3)))
+        first = collector._browser.contexts[0]
+        assert not first.closed  # 页面仍在使用
+        for page in pages:
+            await collector._release_page(page)
+        return first
+
+    first = asyncio.run(main())
+
+    assert len(collector._browser.contexts) == 3
+    assert first.closed
+    assert not collector._browser.contexts[-1].closed  # 当前 context 保留复用
+
+
+def test_concurrent_collectors_get_distinct_profile_slots(monkeypatch) -> None:
+    monkeypatch.setattr(sc, "_profile_slots", set())
+    slots = [sc._acquire_profile_slot() for _ in range(sc._MAX_PROFILE_SLOTS)]
+
+    assert sorted(slots) == list(range(sc._MAX_PROFILE_SLOTS))
+    assert len({sc._profile_dir(s) for s in slots}) == len(slots)
+    assert sc._acquire_profile_slot() is None  # 槽位用尽：不再尝试持久化启动
+
+    collector = sc.ScreenshotCollector()
+    collector._profile_slot = slots[3]
+    asyncio.run(collector.close())
+    assert sc._acquire_profile_slot() == slots[3]
@@ -0,0 +1,81 @@
+import asyncio
+
+import src.core.signals.signal_pack as signal_pack
+from src.core.signals.signal_pack import SignalPackBuilder, _TTLCache
+from src.models.market import MarketCode
+
+
+class _Portfolio:
+    def get_positions_for_stock(self, symbol):
+        return []
+
+    def get_aggregated_position(self, symbol):
+        return None
+
+
+def test_shared_cache_reused_across_builders(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_quotes(self, symbols):
+        return []
+
+    def fake_kline(self, symbol):
+        calls.append(symbol)
+        return {"symbol": symbol} if symbol != "000002" else {"error": "无K线数据"}
+
+    def default_policy(source_type, *, default_providers):
+        return [(p, {}) for p in default_providers], False
+
+    monkeypatch.setattr(
+        SignalPackBuilder, "_source_policy", staticmethod(default_policy)
+    )
+    monkeypatch.setattr(signal_pack.AkshareCollector, "get_stock_data", fake_quotes)
+    monkeypatch.setattr(signal_pack.KlineCollector, "get_kline_summary", fake_kline)
+
+    cache = _TTLCache({"kline": 60.0})
+    symbols = [("000001", MarketCode.CN, "a"), ("000002", MarketCode.CN, "b")]
+
+    async def build():
+        return await SignalPackBuilder(cache=cache).build_for_symbols(
+            symbols=symbols, include_news=False, news_hours=1, portfolio=_Portfolio()
+        )
+
+    first = asyncio.run(build())
+    second = asyncio.run(build())
+
+    # 成功结果跨实例复用，错误结果不共享
+    assert sorted(calls) == ["000001", "000002", "000002"]
+    assert second["000001"].technical == first["000001"].technical
+    assert second["000001"].sources["kline"] == "tencent"
+    assert "kline" in second["000002"].missing
+
+
+def test_top_items_by_symbol_keeps_most_important():
+    entries = [
+        (["A"], {"title": f"n{i}", "importance": i % 3, "time": f"2026-01-01 10:0{i}"})
+        for i in range(8)
+    ] + [(["A", "B"], {"title": "shared", "importance": 3, "time": "2026-01-01 09:00"})]
+
+    buckets = signal_pack._top_items_by_symbol(entries, frozenset({"A", "B"}), limit=3)
+
+    assert [e["title"] for e in buckets["A"]] == ["shared", "n5", "n2"]
+    assert [e["title"] for e in buckets["B"]] == ["shared"]
+
+
+def test_coalesced_shares_inflight_fetch():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def main():
+        return await asyncio.gather(
+            *(signal_pack._coalesced(("kline", "x"), fetch()) for _ in range(3))
+        )
+
+    assert asyncio.run(main()) == [1, 1, 1]
+    assert calls == 1
+    assert signal_pack._inflight == {}
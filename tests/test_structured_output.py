@@ -1,4 +1,10 @@
-from src.core.signals.structured_output import try_parse_action_json
+from src.core.signals.structured_output import (
+    TAG_END,
+    TAG_START,
+    strip_tagged_json,
+    try_extract_tagged_json,
+    try_parse_action_json,
+)
 
 
 def test_try_parse_action_json_plain_json_prefix() -> None:
@@ -21,3 +27,20 @@ def test_try_parse_action_json_action_alias_build_to_add() -> None:
     obj = try_parse_action_json(text)
     assert obj is not None
     assert obj.get("action") == "add"
+
+
+def test_try_parse_action_json_fence_variants() -> None:
+    assert try_parse_action_json('```{"action":"hold"}```') == {"action": "hold"}
+    text = '```JSON \r\n{"action":"sell"}\r\n```  '
+    assert try_parse_action_json(text) == {"action": "sell"}
+    assert try_parse_action_json('```json\n{"action":"buy"}\nnot closed') is None
+
+
+def test_tagged_json_extract_and_strip() -> None:
+    text = f'正文{TAG_START}\n{{"action":"hold"}}\n{TAG_END}'
+    assert try_extract_tagged_json(text) == {"action": "hold"}
+    assert strip_tagged_json(text) == "正文"
+
+    unterminated = text + TAG_START
+    assert try_extract_tagged_json(unterminated) is None
+    assert strip_tagged_json(unterminated) == unterminated
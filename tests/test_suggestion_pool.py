@@ -0,0 +1,282 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core import suggestion_pool as sp
+from src.web.database import Base
+from src.web.models import StockSuggestion
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(sp, "SessionLocal", factory)
+    monkeypatch.setattr(sp, "_LAST_SUGGESTION", {})
+    monkeypatch.setattr(sp, "_pending", [])
+    monkeypatch.setattr(sp, "_latest_cache", {})
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, *args: statements.append(stmt),
+    )
+    commits: list[int] = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    factory.statements = statements
+    factory.commits = commits
+    yield factory
+    sp.flush_pending_suggestions()
+
+
+def _save(**kw):
+    args = dict(
+        stock_symbol="600519",
+        stock_name="贵州茅台",
+        action="hold",
+        action_label="持有",
+        agent_name="intraday_monitor",
+        signal="震荡",
+    )
+    args.update(kw)
+    return sp.save_suggestion(**args)
+
+
+def test_save_suggestion_dedupes_from_cache(session_factory) -> None:
+    assert _save()
+    session_factory.statements.clear()
+
+    assert _save(signal=" 震荡 ")
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in session_factory.statements)
+
+    assert sp.flush_pending_suggestions() == 1
+    db = session_factory()
+    try:
+        assert db.query(StockSuggestion).count() == 1
+    finally:
+        db.close()
+
+
+def test_save_suggestion_keeps_more_severe_action(session_factory) -> None:
+    assert _save(action="sell", action_label="清仓", expires_hours=1)
+    sp.flush_pending_suggestions()
+    sp._LAST_SUGGESTION.clear()  # 冷缓存回源数据库
+
+    assert _save(action="watch", action_label="观望", expires_hours=6)
+
+    db = session_factory()
+    try:
+        rows = db.query(StockSuggestion).all()
+        assert [r.action for r in rows] == ["sell"]
+        assert rows[0].expires_at - rows[0].created_at > timedelta(hours=5)
+    finally:
+        db.close()
+
+
+def test_pending_rows_flush_in_one_batch(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(sp, "_FLUSH_BATCH_SIZE", 3)
+    for symbol in ("000001", "000002"):
+        assert _save(stock_symbol=symbol, expires_hours=1)
+    # 缓冲中的行被去重时直接合并有效期
+    assert _save(stock_symbol="000001", expires_hours=6)
+    assert len(sp._pending) == 2
+    assert not any(s.startswith(("INSERT", "UPDATE")) for s in session_factory.statements)
+
+    assert _save(stock_symbol="000003")  # 达到批量阈值，触发写入
+    assert sp._pending == []
+    assert sum(s.startswith("INSERT") for s in session_factory.statements) == 3
+    assert len(session_factory.commits) == 1
+    assert sp._LAST_SUGGESTION[("000001", "intraday_monitor")].id is not None
+
+    latest = sp.get_latest_suggestions()
+    assert sorted(latest) == ["000001", "000002", "000003"]
+    db = session_factory()
+    try:
+        row = db.query(StockSuggestion).filter_by(stock_symbol="000001").one()
+        assert row.expires_at - row.created_at > timedelta(hours=5)
+    finally:
+        db.close()
+
+
+def test_get_latest_suggestions_picks_newest_per_symbol(session_factory) -> None:
+    db = session_factory()
+    try:
+        for symbol, action, hours in [
+            ("000001", "hold", 6),
+            ("000001", "sell", 6),
+            ("000002", "buy", 6),
+            ("000002", "watch", -1),  # 最新一条已过期
+        ]:
+            db.add(
+                StockSuggestion(
+                    stock_symbol=symbol,
+                    action=action,
+                    action_label=action,
+                    agent_name="daily_report",
+                    expires_at=sp.utc_now() + timedelta(hours=hours),
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    latest = sp.get_latest_suggestions()
+    assert {k: v["action"] for k, v in latest.items()} == {"000001": "sell"}
+
+    latest = sp.get_latest_suggestions(["000002"], include_expired=True)
+    assert latest["000002"]["action"] == "watch"
+    assert latest["000002"]["is_expired"] is True
+    assert latest["000002"]["created_at"].endswith("+00:00")
+
+
+def test_save_suggestions_prefetches_latest_in_one_query(session_factory) -> None:
+    assert _save(stock_symbol="000001", agent_name="daily_report")
+    sp.flush_pending_suggestions()
+    sp._LAST_SUGGESTION.clear()
+    session_factory.statements.clear()
+
+    items = [
+        dict(
+            stock_symbol=symbol,
+            stock_name="",
+            action="hold",
+            action_label="持有",
+            agent_name="daily_report",
+            signal="震荡",
+        )
+        for symbol in ("000001", "000002", "000003")
+    ]
+    assert sp.save_suggestions(items) == 3
+
+    selects = [s for s in session_factory.statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 1
+    db = session_factory()
+    try:
+        # 000001 去重命中，只新增两条
+        assert db.query(StockSuggestion).count() == 3
+    finally:
+        db.close()
+
+
+def test_cleanup_deletes_old_rows_in_batches(session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(sp, "_CLEANUP_BATCH_SIZE", 2)
+    old = sp.utc_now() - timedelta(days=10)
+    db = session_factory()
+    try:
+        for i in range(5):
+            db.add(
+                StockSuggestion(
+                    stock_symbol=f"00000{i}",
+                    action="hold",
+                    action_label="持有",
+                    agent_name="daily_report",
+                    created_at=old if i < 3 else sp.utc_now(),
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    assert sp.cleanup_expired_suggestions(days=7) == 3
+    db = session_factory()
+    try:
+        assert db.query(StockSuggestion).count() == 2
+    finally:
+        db.close()
+
+
+def test_extend_never_shortens_stored_expiry(session_factory) -> None:
+    assert _save(stock_name="", expires_hours=1)
+    sp.flush_pending_suggestions()
+    latest = sp._LAST_SUGGESTION[("600519", "intraday_monitor")]
+
+    db = session_factory()
+    try:
+        # 另一写入方已把有效期延长到 10 小时
+        far = sp.utc_now() + timedelta(hours=10)
+        db.query(StockSuggestion).update({"expires_at": far})
+        db.commit()
+
+        assert sp._extend_latest(db, latest, sp.utc_now() + timedelta(hours=2), "茅台")
+        db.commit()
+        row = db.query(StockSuggestion).one()
+        assert row.expires_at - sp.utc_now() > timedelta(hours=9)
+        assert row.stock_name == "茅台"
+    finally:
+        db.close()
+
+
+def test_latest_suggestions_cached_until_symbol_is_written(session_factory) -> None:
+    assert _save(stock_symbol="000001", action="hold", action_label="持有")
+    assert _save(stock_symbol="000002", action="hold", action_label="持有")
+    assert sp.get_latest_suggestions(["000001"])["000001"]["action"] == "hold"
+    assert sp.get_latest_suggestions(["000002"])["000002"]["action"] == "hold"
+
+    session_factory.statements.clear()
+    sp.get_latest_suggestions(["000001"])
+    assert session_factory.statements == []
+
+    # 写入 000001 只失效包含它的缓存项
+    assert _save(stock_symbol="000001", action="sell", action_label="清仓")
+    assert sp.get_latest_suggestions(["000001"])["000001"]["action"] == "sell"
+    session_factory.statements.clear()
+    sp.get_latest_suggestions(["000002"])
+    assert session_factory.statements == []
+
+
+def test_save_after_cleanup_inserts_new_row(session_factory) -> None:
+    assert _save()
+    sp.flush_pending_suggestions()
+    assert sp.cleanup_expired_suggestions(days=0) == 1
+
+    assert _save()
+    assert sp.flush_pending_suggestions() == 1
+    assert list(sp.get_latest_suggestions()) == ["600519"]
+
+
+def test_save_suggestions_rollback_keeps_snapshot_consistent(
+    session_factory, monkeypatch
+) -> None:
+    assert _save(expires_hours=1)
+    sp.flush_pending_suggestions()
+    latest = sp._LAST_SUGGESTION[("600519", "intraday_monitor")]
+    before = latest.expires_at
+
+    def _boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(sp, "_prefetch_latest", lambda db, keys: set())
+    monkeypatch.setattr(sp, "_load_latest", _boom)
+    items = [
+        # 命中缓存并执行延期 UPDATE
+        dict(
+            stock_symbol="600519",
+            stock_name="贵州茅台",
+            action="hold",
+            action_label="持有",
+            agent_name="intraday_monitor",
+            signal="震荡",
+            expires_hours=6,
+        ),
+        # 回源查询失败触发回滚，上一条延期随之丢弃
+        dict(
+            stock_symbol="000001",
+            stock_name="",
+            action="buy",
+            action_label="建仓",
+            agent_name="intraday_monitor",
+        ),
+    ]
+    assert sp.save_suggestions(items) == 1
+    assert latest.expires_at == before
+
+    db = session_factory()
+    try:
+        row = db.query(StockSuggestion).filter_by(stock_symbol="600519").one()
+        assert row.expires_at - row.created_at < timedelta(hours=2)
+        assert db.query(StockSuggestion).count() == 2
+    finally:
+        db.close()